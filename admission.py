@@ -0,0 +1,172 @@
+"""
+Admission control for the Neta server
+Per-tenant token buckets and queue-wait statistics for the bounded run queue
+"""
+
+from collections import deque
+from typing import Any, Dict, Mapping, Optional, Tuple
+import hashlib
+import math
+import os
+import threading
+import time
+
+from ttl_cache import TTLCache
+
+# Runs per second each tenant may start; 0 turns rate limiting off
+RATE_LIMIT = float(os.getenv("NETA_RATE_LIMIT", "0"))
+# Runs a tenant may start in a burst before the rate applies
+RATE_BURST = float(os.getenv("NETA_RATE_BURST", "10"))
+# Tenants tracked at once; the least recently seen are forgotten first
+RATE_MAX_TENANTS = int(os.getenv("NETA_RATE_MAX_TENANTS", "10000"))
+
+class TokenBucket:
+    """Holds up to ``burst`` tokens, refilled at ``rate`` tokens per second"""
+
+    __slots__ = ("rate", "burst", "tokens", "updated", "_lock")
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def take(self, cost: float = 1.0) -> float:
+        """Take ``cost`` tokens; returns 0 when admitted, else the seconds until they are available.
+
+        A cost above ``burst`` can never be admitted and returns ``math.inf``.
+        """
+        if cost > self.burst:
+            return math.inf
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= cost:
+                self.tokens -= cost
+                return 0.0
+            return (cost - self.tokens) / self.rate
+
+    def give(self, cost: float):
+        """Return tokens taken for work that was not started after all"""
+        with self._lock:
+            self.tokens = min(self.burst, self.tokens + cost)
+
+class RateLimiter:
+    """Token bucket per tenant (API key, business or client address)"""
+
+    def __init__(self, rate: float = RATE_LIMIT, burst: float = RATE_BURST, max_tenants: int = RATE_MAX_TENANTS):
+        self.rate = rate
+        self.burst = burst
+        # A bucket left idle for burst / rate seconds is full again, so forgetting it changes nothing
+        self._buckets = TTLCache(namespace="rate-limits", max_entries=max_tenants,
+                                 ttl=max(burst / rate, 1.0) if rate > 0 else 1.0)
+        self._lock = threading.Lock()
+        self.admitted = 0
+        self.limited = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.rate > 0
+
+    def _bucket(self, tenant: str) -> TokenBucket:
+        with self._lock:
+            bucket = self._buckets.get(tenant)
+            if bucket is None:
+                bucket = TokenBucket(self.rate, self.burst)
+            # Re-set on every use so only idle tenants expire
+            self._buckets.set(tenant, bucket)
+        return bucket
+
+    def check(self, tenant: str, cost: float = 1.0) -> float:
+        """0 when ``tenant`` may start ``cost`` runs now, else the seconds to wait (``math.inf`` above the burst)"""
+        if not self.enabled:
+            return 0.0
+        wait = self._bucket(tenant).take(cost)
+        if wait:
+            self.limited += 1
+        else:
+            self.admitted += 1
+        return wait
+
+    def check_all(self, costs: Mapping[str, float]) -> Tuple[Optional[str], float]:
+        """Charge several tenants at once: ``(None, 0)`` when all are admitted, else the first
+        tenant over its limit and its wait. Nothing is charged unless every tenant is admitted."""
+        charged = []
+        for tenant, cost in costs.items():
+            wait = self.check(tenant, cost)
+            if wait:
+                for admitted, admitted_cost in charged:
+                    self._bucket(admitted).give(admitted_cost)
+                return tenant, wait
+            charged.append((tenant, cost))
+        return None, 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "rate": self.rate,
+            "burst": self.burst,
+            "admitted": self.admitted,
+            "limited": self.limited,
+            "tenants": self._buckets.stats()
+        }
+
+def tenant_key(headers: Mapping[str, str], input_data: Optional[Mapping[str, Any]], client: str) -> str:
+    """Who a request is charged to: its API key, else its business, else the client address"""
+    api_key = headers.get('X-Api-Key')
+    if not api_key:
+        authorization = headers.get('Authorization') or ''
+        if authorization.lower().startswith('bearer '):
+            api_key = authorization[7:].strip()
+    if api_key:
+        return f"key:{api_key}"
+    business_name = (input_data or {}).get('business_name') if isinstance(input_data, Mapping) else None
+    if business_name:
+        return f"business:{' '.join(str(business_name).lower().split())}"
+    return f"client:{client}"
+
+def tenant_label(tenant: str) -> str:
+    """Log-safe form of a tenant: API keys are replaced by a short hash"""
+    kind, _, value = tenant.partition(":")
+    if kind != "key":
+        return tenant
+    return f"key:{hashlib.sha256(value.encode('utf-8')).hexdigest()[:12]}"
+
+def retry_after_header(seconds: float) -> str:
+    """Whole seconds for a Retry-After header, at least 1"""
+    return str(max(1, math.ceil(seconds)))
+
+class WaitStats:
+    """Count, mean and recent percentiles of a duration, e.g. time runs spend queued"""
+
+    def __init__(self, recent: int = 1024):
+        self._recent = deque(maxlen=recent)
+        self._lock = threading.Lock()
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float):
+        with self._lock:
+            self._recent.append(seconds)
+            self.count += 1
+            self.total += seconds
+            self.max = max(self.max, seconds)
+
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            recent = sorted(self._recent)
+        def percentile(share: float) -> float:
+            return recent[min(int(len(recent) * share), len(recent) - 1)] if recent else 0.0
+        return {
+            "count": self.count,
+            "mean_ms": round(self.mean() * 1000, 2),
+            "p50_ms": round(percentile(0.50) * 1000, 2),
+            "p95_ms": round(percentile(0.95) * 1000, 2),
+            "max_ms": round(self.max * 1000, 2)
+        }
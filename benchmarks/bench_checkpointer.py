@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Checkpointer benchmark for the Neta workflow
+Checkpoint writes per second and resident memory by thread count for each checkpointer
+
+Each measurement runs in a fresh interpreter so resident memory is not shared
+between runs. Every thread runs a five-step graph that appends progress
+messages the way the workflow nodes do.
+
+Usage:
+    python benchmarks/bench_checkpointer.py --threads 100 1000 5000
+"""
+
+from pathlib import Path
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+CHILD = """
+import resource, sys, time
+sys.path.insert(0, {root!r})
+from typing_extensions import Annotated, TypedDict
+from typing import Any, Dict, List
+from langgraph.graph import StateGraph, START, END
+from checkpointers import load_checkpointer
+from messages import assistant_message
+from reducers import append_messages
+
+class State(TypedDict):
+    messages: Annotated[List[Any], append_messages]
+    current_step: str
+
+STEPS = ["search_start", "accounts_found", "analysis_start", "creation_start", "content_ready"]
+builder = StateGraph(State)
+previous = START
+for step in STEPS:
+    builder.add_node(step, lambda state, step=step: {{
+        "messages": [assistant_message(f"Working on {{step}}... ✅", type="progress", step=step)],
+        "current_step": step
+    }})
+    builder.add_edge(previous, step)
+    previous = step
+builder.add_edge(previous, END)
+
+saver = load_checkpointer({spec!r})
+app = builder.compile(checkpointer=saver)
+rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+started = time.perf_counter()
+for thread in range({threads}):
+    app.invoke({{"messages": [{{"role": "user", "content": "Mike's Pizza"}}]}}, {{"configurable": {{"thread_id": f"thread-{{thread}}"}}}})
+if hasattr(saver, "flush"):
+    saver.flush()
+elapsed = time.perf_counter() - started
+rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+checkpoints = len(list(saver.list({{"configurable": {{"thread_id": "thread-0"}}}}))) * {threads}
+print(elapsed, checkpoints, rss_after - rss_before)
+"""
+
+def measure(spec: dict, threads: int) -> tuple:
+    code = CHILD.format(root=str(REPO_ROOT), spec=spec, threads=threads)
+    output = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=True
+    ).stdout.strip().splitlines()[-1]
+    elapsed, checkpoints, rss_kb = output.split()
+    return float(elapsed), int(checkpoints), int(rss_kb)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", type=int, nargs="+", default=[100, 1000, 5000])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        savers = {
+            "MemorySaver": lambda n: {"class_name": "langgraph.checkpoint.memory.MemorySaver"},
+            "Bounded": lambda n: {"class_name": "checkpointers.BoundedMemorySaver", "kwargs": {"spill_path": f"{tmp}/spill-{n}.db"}},
+            "SQLiteSaver": lambda n: {"class_name": "checkpointers.SQLiteSaver", "kwargs": {"path": f"{tmp}/bench-{n}.db"}}
+        }
+
+        print(f"{'saver':>12} | {'threads':>8} | {'checkpoints':>11} | {'writes/s':>9} | {'RSS growth MB':>13}")
+        print("-" * 66)
+        results = []
+        for threads in args.threads:
+            for name, spec in savers.items():
+                elapsed, checkpoints, rss_kb = measure(spec(threads), threads)
+                results.append({"saver": name, "threads": threads, "checkpoints_per_s": round(checkpoints / elapsed), "rss_growth_mb": round(rss_kb / 1024, 1)})
+                print(f"{name:>12} | {threads:>8} | {checkpoints:>11} | {checkpoints / elapsed:>9.0f} | {rss_kb / 1024:>13.1f}")
+
+    print(json.dumps(results))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Import-time benchmark for the Neta workflow module
+Measures cold `import neta_social_assistant` in fresh interpreters so cold-start regressions are visible
+
+Usage:
+    python benchmarks/bench_import_time.py --runs 10 --max-ms 1500
+"""
+
+from pathlib import Path
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+MEASURE = """
+import time
+started = time.perf_counter()
+import {module}
+imported = time.perf_counter()
+{warmup}
+finished = time.perf_counter()
+print((imported - started) * 1000, (finished - imported) * 1000)
+"""
+
+def measure_once(module: str, warmup: bool) -> tuple:
+    code = MEASURE.format(module=module, warmup=f"{module}.warmup()" if warmup else "")
+    output = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=True
+    ).stdout.strip().splitlines()[-1]
+    import_ms, warmup_ms = (float(value) for value in output.split())
+    return import_ms, warmup_ms
+
+def slowest_imports(module: str, top: int) -> list:
+    """Largest cumulative entries from python -X importtime"""
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=True
+    ).stderr
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        entries.append((int(cumulative_us), name.strip()))
+    entries.sort(reverse=True)
+    return [{"module": name, "cumulative_ms": round(us / 1000, 1)} for us, name in entries[:top]]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="neta_social_assistant")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--warmup", action="store_true", help="Also time warmup() after the import")
+    parser.add_argument("--top", type=int, default=10, help="Show the N slowest imports")
+    parser.add_argument("--max-ms", type=float, help="Exit non-zero if the median import exceeds this")
+    args = parser.parse_args()
+
+    samples = [measure_once(args.module, args.warmup) for _ in range(args.runs)]
+    import_ms = [sample[0] for sample in samples]
+    report = {
+        "module": args.module,
+        "runs": args.runs,
+        "import_ms": {
+            "median": round(statistics.median(import_ms), 1),
+            "min": round(min(import_ms), 1),
+            "max": round(max(import_ms), 1)
+        },
+        "slowest_imports": slowest_imports(args.module, args.top)
+    }
+    if args.warmup:
+        report["warmup_ms_median"] = round(statistics.median(sample[1] for sample in samples), 1)
+    print(json.dumps(report, indent=2))
+
+    if args.max_ms is not None and report["import_ms"]["median"] > args.max_ms:
+        print(f"❌ Median import {report['import_ms']['median']}ms exceeds {args.max_ms}ms")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
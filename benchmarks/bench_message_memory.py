@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Message memory benchmark for the Neta workflow
+Measures heap bytes per progress message held in state, plain dicts vs compact interned messages
+
+Usage:
+    python benchmarks/bench_message_memory.py --threads 1000 --messages 25
+"""
+
+from pathlib import Path
+import argparse
+import sys
+import tracemalloc
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from messages import assistant_message
+
+# The kind of progress messages every thread accumulates
+STEPS = [
+    ("progress", "search_start"), ("progress", "facebook_search"), ("progress", "instagram_search"),
+    ("success", "accounts_found"), ("confirmation", "verify"), ("progress", "analysis_start"),
+    ("progress", "pattern_analysis"), ("progress", "theme_analysis"), ("success", "analysis_complete"),
+    ("confirmation", "strategy_approval"), ("progress", "creation_start"), ("progress", "caption_writing")
+]
+
+def dict_message(content: str, kind: str, step: str) -> dict:
+    # As messages come back from a checkpoint: fresh strings and a fresh metadata dict each
+    return {
+        "role": "assistant",
+        "content": content,
+        "timestamp": "2024-01-01T00:00:00Z",
+        "metadata": {"type": "".join(kind), "step": "".join(step)}
+    }
+
+def compact_message(content: str, kind: str, step: str):
+    return assistant_message(content, type="".join(kind), step="".join(step))
+
+def measure(build, threads: int, per_thread: int) -> float:
+    """Bytes retained per message after building every thread's history"""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    histories = [
+        [build(f"Progress update {i}", *STEPS[i % len(STEPS)]) for i in range(per_thread)]
+        for _ in range(threads)
+    ]
+    retained = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del histories
+    return retained / (threads * per_thread)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", type=int, default=1000)
+    parser.add_argument("--messages", type=int, default=25, help="messages per thread")
+    args = parser.parse_args()
+
+    # Warm the metadata pool so both runs only measure per-message cost
+    compact_message("warmup", *STEPS[0])
+
+    dict_bytes = measure(dict_message, args.threads, args.messages)
+    compact_bytes = measure(compact_message, args.threads, args.messages)
+
+    print(f"{'representation':>16} | {'bytes/message':>14}")
+    print("-" * 33)
+    print(f"{'dict':>16} | {dict_bytes:>14.1f}")
+    print(f"{'Message':>16} | {compact_bytes:>14.1f}")
+    print(f"\n{args.threads * args.messages} messages: {1 - compact_bytes / dict_bytes:.0%} less heap per message")
+
+if __name__ == "__main__":
+    main()
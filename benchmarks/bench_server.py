@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Load benchmark for simple_server
+Requests per second and latency by worker count, with simulated upstream latency per run
+
+Each workflow run sleeps for --latency ms on top of simple_neta's own work,
+standing in for the OpenAI/Tavily round trips a real run waits on. A /health
+probe is timed while the server is saturated.
+
+Usage:
+    python benchmarks/bench_server.py --workers 1 2 4 8 --clients 16 --requests 200
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import argparse
+import json
+import statistics
+import sys
+import threading
+import time
+import urllib.request
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import simple_server
+from neta_logging import configure_logging
+from simple_neta import invoke_workflow
+
+def slow_workflow(latency: float):
+    def run(input_data):
+        time.sleep(latency)
+        return invoke_workflow(input_data)
+    return run
+
+def post_run(url: str, body: bytes) -> float:
+    request = urllib.request.Request(url, data=body, headers={"Content-Type": "application/json"})
+    started = time.perf_counter()
+    with urllib.request.urlopen(request) as response:
+        response.read()
+    return time.perf_counter() - started
+
+def get_health(url: str) -> float:
+    started = time.perf_counter()
+    with urllib.request.urlopen(url) as response:
+        response.read()
+    return time.perf_counter() - started
+
+def measure(workers: int, clients: int, requests: int) -> dict:
+    httpd = simple_server.make_server(0, workers=workers, queue_depth=clients, timeout=60)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    base = f"http://127.0.0.1:{httpd.server_address[1]}"
+    body = json.dumps({
+        "assistant_id": "neta-social-assistant",
+        "input": {"business_name": "Mike's Pizza", "current_step": "social_discovery"}
+    }).encode("utf-8")
+
+    try:
+        with ThreadPoolExecutor(max_workers=clients) as pool:
+            started = time.perf_counter()
+            futures = [pool.submit(post_run, f"{base}/runs", body) for _ in range(requests)]
+            time.sleep(0.05)
+            health = get_health(f"{base}/health")
+            latencies = sorted(future.result() for future in futures)
+            elapsed = time.perf_counter() - started
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+
+    return {
+        "workers": workers,
+        "requests_per_s": round(requests / elapsed, 1),
+        "p50_ms": round(statistics.median(latencies) * 1000, 1),
+        "p95_ms": round(latencies[int(len(latencies) * 0.95) - 1] * 1000, 1),
+        "health_ms": round(health * 1000, 1)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=50.0, help="simulated upstream latency per run, ms")
+    args = parser.parse_args()
+
+    simple_server.invoke_workflow = slow_workflow(args.latency / 1000)
+    # Keep per-request logging out of the measurement
+    configure_logging(level="WARNING")
+    results = [measure(workers, args.clients, args.requests) for workers in args.workers]
+
+    print(f"{'workers':>8} | {'req/s':>8} | {'p50 ms':>8} | {'p95 ms':>8} | {'/health ms':>10}")
+    print("-" * 54)
+    for result in results:
+        print(f"{result['workers']:>8} | {result['requests_per_s']:>8} | {result['p50_ms']:>8} | {result['p95_ms']:>8} | {result['health_ms']:>10}")
+
+    print(json.dumps(results))
+
+if __name__ == "__main__":
+    main()
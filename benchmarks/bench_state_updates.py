@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Per-step state update benchmark for the Neta workflow
+Compares the old full-state node returns with the append-only/partial updates as conversations grow
+
+Usage:
+    python benchmarks/bench_state_updates.py --sizes 10 100 500 1000 5000
+"""
+
+from pathlib import Path
+import argparse
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from neta_social_assistant import content_creation_node
+from reducers import apply_update
+
+def make_state(history: int) -> dict:
+    return {
+        "business_name": "Mike's Pizza",
+        "messages": [
+            {
+                "role": "assistant",
+                "content": f"Message {i}",
+                "timestamp": "2024-01-01T00:00:00Z",
+                "metadata": {"type": "progress", "step": "benchmark"}
+            }
+            for i in range(history)
+        ],
+        "current_step": "content_creation",
+        "user_data": {"content_themes": ["visual_content"]},
+        "social_accounts": [{"platform": "Facebook", "name": "Mike's Pizza"}],
+        "next_actions": [],
+        "session_id": "bench"
+    }
+
+def legacy_step(state: dict) -> dict:
+    """What every node used to do: copy the state, the history and user_data"""
+    update = content_creation_node(state, {})
+    return {
+        **state,
+        **update,
+        "messages": state["messages"] + update["messages"],
+        "user_data": {**state["user_data"], **update["user_data"]}
+    }
+
+def time_per_step(fn, state: dict, repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn(state)
+    return (time.perf_counter() - started) / repeat * 1e6
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 500, 1000, 5000])
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    print(f"{'history':>8} | {'legacy node+copy µs':>20} | {'delta node µs':>14} | {'reducer µs':>11} | {'fields written (legacy/delta)':>30}")
+    print("-" * 96)
+    for size in args.sizes:
+        state = make_state(size)
+        update = content_creation_node(state, {})
+
+        legacy_us = time_per_step(legacy_step, state, args.repeat)
+        node_us = time_per_step(lambda s: content_creation_node(s, {}), state, args.repeat)
+        reducer_us = time_per_step(lambda s: apply_update(s, update), state, args.repeat)
+        fields = f"{len(legacy_step(state))}/{len(update)}"
+
+        print(f"{size:>8} | {legacy_us:>20.2f} | {node_us:>14.2f} | {reducer_us:>11.2f} | {fields:>30}")
+
+if __name__ == "__main__":
+    main()
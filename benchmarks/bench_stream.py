@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Streaming latency benchmark for the Neta workflow
+Time to the first progress message vs time to the full response for the discovery turn
+
+Tavily is replaced by a search that sleeps for --latency ms per platform, so
+the numbers reflect the workflow rather than the network. The blocking path
+is what /runs clients see; the streaming path is what /runs/stream clients see.
+
+Usage:
+    python benchmarks/bench_stream.py --latency 800 --runs 5
+"""
+
+from pathlib import Path
+import argparse
+import json
+import statistics
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import neta_social_assistant
+
+class SlowSearch:
+    """Search that waits like a Tavily round trip and finds nothing"""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    def invoke(self, query):
+        time.sleep(self.latency)
+        return []
+
+def first_and_total(business_name: str) -> tuple:
+    started = time.perf_counter()
+    first = None
+    for event, _ in neta_social_assistant.stream_workflow({"business_name": business_name}):
+        if first is None and event == "message":
+            first = time.perf_counter() - started
+    return first, time.perf_counter() - started
+
+def blocking(business_name: str) -> float:
+    started = time.perf_counter()
+    neta_social_assistant.invoke_workflow({"business_name": business_name})
+    return time.perf_counter() - started
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--latency", type=float, default=800.0, help="simulated search latency per platform, ms")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    search = SlowSearch(args.latency / 1000)
+    neta_social_assistant.get_tavily_search = lambda: search
+
+    # Distinct names so the discovery cache never answers
+    blocking_s = [blocking(f"Blocking Bakery {run}") for run in range(args.runs)]
+    streamed = [first_and_total(f"Streaming Bakery {run}") for run in range(args.runs)]
+
+    result = {
+        "blocking_first_message_ms": round(statistics.median(blocking_s) * 1000, 1),
+        "stream_first_message_ms": round(statistics.median(first for first, _ in streamed) * 1000, 1),
+        "stream_total_ms": round(statistics.median(total for _, total in streamed) * 1000, 1)
+    }
+    print(f"{'path':>10} | {'first message ms':>16} | {'total ms':>9}")
+    print("-" * 42)
+    print(f"{'/runs':>10} | {result['blocking_first_message_ms']:>16} | {result['blocking_first_message_ms']:>9}")
+    print(f"{'stream':>10} | {result['stream_first_message_ms']:>16} | {result['stream_total_ms']:>9}")
+    print(json.dumps(result))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Per-turn cost benchmark for the Neta workflow
+Node executions and checkpoint writes per user turn, re-entering at START vs resuming with Command
+
+A conversation is the first message plus one answer per decision point
+(confirm_accounts, strategy_approval, content_approval). Re-entering clients
+send the step back and are routed from START through history and greeting on
+every turn; resumed threads continue from the pending decision. Without
+OPENAI_API_KEY/TAVILY_API_KEY the nodes use their fallbacks, which leaves the
+counts unchanged.
+
+Usage:
+    python benchmarks/bench_turns.py --threads 20
+"""
+
+from pathlib import Path
+import argparse
+import json
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph.types import Command
+
+from neta_social_assistant import builder
+
+ANSWERS = ["confirm_all", "approve_strategy", "approve_all"]
+
+class CountingSaver(MemorySaver):
+    """MemorySaver that counts checkpoint writes"""
+
+    def __init__(self):
+        super().__init__()
+        self.puts = 0
+
+    def put(self, config, checkpoint, metadata, new_versions):
+        self.puts += 1
+        return super().put(config, checkpoint, metadata, new_versions)
+
+def run_turn(app, payload, config) -> tuple:
+    """Run one turn, returning (node executions, final state values)"""
+    tasks = 0
+    for event in app.stream(payload, config, stream_mode="debug"):
+        if event["type"] == "task":
+            tasks += 1
+    return tasks, app.get_state(config).values
+
+def conversation(app, thread: int, resume: bool) -> int:
+    config = {"configurable": {"thread_id": f"thread-{thread}"}}
+    first = {"business_name": "Mike's Pizza", "messages": [{"role": "user", "content": "Mike's Pizza"}]}
+    tasks, state = run_turn(app, first, config)
+    for answer in ANSWERS:
+        message = {"role": "user", "content": answer}
+        if resume:
+            payload = Command(resume={"action": answer, "messages": [message]})
+        else:
+            # Old-style client: send the step back and start over from START
+            payload = {"current_step": state["current_step"], "messages": [message]}
+        turn_tasks, state = run_turn(app, payload, config)
+        tasks += turn_tasks
+    return tasks
+
+def measure(resume: bool, threads: int) -> dict:
+    saver = CountingSaver()
+    app = builder.compile(checkpointer=saver)
+    started = time.perf_counter()
+    tasks = sum(conversation(app, thread, resume) for thread in range(threads))
+    elapsed = time.perf_counter() - started
+    turns = threads * (len(ANSWERS) + 1)
+    return {
+        "mode": "resume" if resume else "re-enter",
+        "nodes_per_turn": round(tasks / turns, 2),
+        "checkpoints_per_turn": round(saver.puts / turns, 2),
+        "ms_per_turn": round(elapsed / turns * 1000, 2)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'mode':>10} | {'nodes/turn':>10} | {'checkpoints/turn':>16} | {'ms/turn':>8}")
+    print("-" * 54)
+    results = []
+    for resume in (False, True):
+        result = measure(resume, args.threads)
+        results.append(result)
+        print(f"{result['mode']:>10} | {result['nodes_per_turn']:>10} | {result['checkpoints_per_turn']:>16} | {result['ms_per_turn']:>8}")
+
+    print(json.dumps(results))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Bulk onboarding for Neta
+Runs social discovery and content analysis for a CSV/JSONL file of businesses so
+their state is prefilled before anyone opens the app
+
+Usage:
+    python bulk_onboarding.py businesses.csv -o onboarded.jsonl --concurrency 8
+
+Each business is discovered on every enabled platform, so size the shared
+discovery pool for the batch (NETA_DISCOVERY_CONCURRENCY = --concurrency).
+"""
+
+from concurrent.futures import ALL_COMPLETED, FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Dict, Iterator, List, Optional
+import argparse
+import csv
+import json
+import os
+import threading
+import time
+
+from messages import message_dicts
+from reducers import apply_update
+from ttl_cache import normalize_business_name
+
+STAGES = ("social_discovery", "content_analysis")
+
+def read_businesses(path: str) -> Iterator[Dict[str, Any]]:
+    """Stream business records from a CSV (with a business_name column) or JSONL file"""
+    with open(path, newline="", encoding="utf-8") as f:
+        if path.endswith((".jsonl", ".ndjson")):
+            rows = (json.loads(line) for line in f if line.strip())
+        else:
+            rows = csv.DictReader(f)
+        for row in rows:
+            business_name = (row.get("business_name") or row.get("name") or "").strip()
+            if not business_name:
+                continue
+            yield {
+                "id": str(row.get("id") or normalize_business_name(business_name)),
+                "business_name": business_name
+            }
+
+def load_checkpoint(path: Optional[str]) -> set:
+    """IDs of businesses already onboarded by a previous run"""
+    if not path or not os.path.exists(path):
+        return set()
+    with open(path, encoding="utf-8") as f:
+        return {line.strip() for line in f if line.strip()}
+
+class BulkStats:
+    """Throughput and per-stage latency for a bulk run"""
+
+    def __init__(self):
+        self.started = time.monotonic()
+        self.succeeded = 0
+        self.failed = 0
+        self.skipped = 0
+        self.stage_seconds: Dict[str, List[float]] = {stage: [] for stage in STAGES}
+        self._lock = threading.Lock()
+
+    def record(self, result: Dict[str, Any]):
+        with self._lock:
+            if "error" in result:
+                self.failed += 1
+            else:
+                self.succeeded += 1
+            for stage, seconds in result.get("timings", {}).items():
+                self.stage_seconds[stage].append(seconds)
+
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            elapsed = time.monotonic() - self.started
+            processed = self.succeeded + self.failed
+            stages = {}
+            for stage, samples in self.stage_seconds.items():
+                ordered = sorted(samples)
+                stages[stage] = {
+                    "count": len(ordered),
+                    "mean_s": round(sum(ordered) / len(ordered), 3) if ordered else None,
+                    "p50_s": round(ordered[len(ordered) // 2], 3) if ordered else None,
+                    "p95_s": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 3) if ordered else None
+                }
+            return {
+                "succeeded": self.succeeded,
+                "failed": self.failed,
+                "skipped": self.skipped,
+                "elapsed_s": round(elapsed, 2),
+                "throughput_per_min": round(processed / elapsed * 60, 1) if elapsed else 0.0,
+                "stages": stages
+            }
+
+def degraded_stages(state: Dict[str, Any]) -> List[str]:
+    """Stages whose output is a fallback standing in for a failed upstream call.
+
+    Discovery is degraded when any platform search for this business failed or
+    missed its deadline; analysis is degraded when the LLM call failed and the
+    canned analysis was used.
+    """
+    degraded = []
+    if (state.get("user_data") or {}).get("discovery_failed"):
+        degraded.append("social_discovery")
+    if any((message.get("metadata") or {}).get("type") == "analysis_fallback" for message in state.get("messages", [])):
+        degraded.append("content_analysis")
+    return degraded
+
+def onboard_business(record: Dict[str, Any]) -> Dict[str, Any]:
+    """Run discovery and analysis for one business, returning its prefilled state.
+
+    A business whose discovery or analysis fell back because an upstream
+    service was down is returned with an ``error`` (and the stages in
+    ``degraded``) so it is retried instead of checkpointed.
+    """
+    from neta_social_assistant import content_analysis_node, social_discovery_node
+
+    config = {"configurable": {"thread_id": record["id"]}}
+    state = {
+        "business_name": record["business_name"],
+        "messages": [],
+        "current_step": "social_discovery",
+        "user_data": {},
+        "milestones": {},
+        "social_accounts": [],
+        "next_actions": [],
+        "session_id": record["id"]
+    }
+    nodes = {"social_discovery": social_discovery_node, "content_analysis": content_analysis_node}
+
+    timings = {}
+    for stage in STAGES:
+        started = time.monotonic()
+        state = apply_update(state, nodes[stage](state, config))
+        timings[stage] = time.monotonic() - started
+
+    state["messages"] = message_dicts(state["messages"])
+    result = {"id": record["id"], "business_name": record["business_name"], "state": state, "timings": timings}
+    degraded = degraded_stages(state)
+    if degraded:
+        result["error"] = f"Fallback result from {', '.join(degraded)}; upstream service unavailable"
+        result["degraded"] = degraded
+    return result
+
+def _onboard_safely(record: Dict[str, Any]) -> Dict[str, Any]:
+    try:
+        return onboard_business(record)
+    except Exception as e:
+        return {"id": record["id"], "business_name": record["business_name"], "error": str(e)}
+
+def run_bulk_onboarding(input_path: str, output_path: str, checkpoint_path: Optional[str] = None,
+                        concurrency: int = 8, limit: Optional[int] = None, progress_every: int = 50) -> Dict[str, Any]:
+    """Onboard every business in ``input_path``, appending results to ``output_path``.
+
+    At most ``concurrency`` businesses are in flight at once and records are read
+    lazily, so arbitrarily large files run in constant memory. Successful IDs are
+    appended to ``checkpoint_path`` (default: ``<output>.checkpoint``) as they
+    finish; re-running with the same checkpoint skips them. Failed businesses,
+    including ones that only got fallback results, are written with an
+    ``error`` field and retried on the next run.
+    """
+    checkpoint_path = checkpoint_path or f"{output_path}.checkpoint"
+    done = load_checkpoint(checkpoint_path)
+    stats = BulkStats()
+
+    def records() -> Iterator[Dict[str, Any]]:
+        submitted = 0
+        for record in read_businesses(input_path):
+            if record["id"] in done:
+                stats.skipped += 1
+                continue
+            if limit is not None and submitted >= limit:
+                return
+            submitted += 1
+            yield record
+
+    with open(output_path, "a", encoding="utf-8") as out, \
+            open(checkpoint_path, "a", encoding="utf-8") as checkpoint, \
+            ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="neta-bulk") as executor:
+
+        def drain(futures: set, return_when: str) -> set:
+            finished, pending = wait(futures, return_when=return_when)
+            for future in finished:
+                result = future.result()
+                stats.record(result)
+                out.write(json.dumps(result) + "\n")
+                out.flush()
+                if "error" not in result:
+                    checkpoint.write(result["id"] + "\n")
+                    checkpoint.flush()
+                processed = stats.succeeded + stats.failed
+                if progress_every and processed % progress_every == 0:
+                    summary = stats.summary()
+                    print(f"📈 {processed} onboarded ({summary['throughput_per_min']}/min, {stats.failed} failed)")
+            return pending
+
+        in_flight = set()
+        for record in records():
+            if len(in_flight) >= concurrency:
+                in_flight = drain(in_flight, FIRST_COMPLETED)
+            in_flight.add(executor.submit(_onboard_safely, record))
+        drain(in_flight, ALL_COMPLETED)
+
+    return stats.summary()
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Prefill Neta discovery and analysis for many businesses")
+    parser.add_argument("input", help="CSV (business_name column) or JSONL file of businesses")
+    parser.add_argument("-o", "--output", default="onboarded.jsonl", help="JSONL file results are appended to")
+    parser.add_argument("--checkpoint", help="Checkpoint file of finished IDs (default: <output>.checkpoint)")
+    parser.add_argument("--concurrency", type=int, default=8, help="Businesses processed at once")
+    parser.add_argument("--limit", type=int, help="Stop after this many new businesses")
+    parser.add_argument("--progress-every", type=int, default=50, help="Print throughput every N businesses")
+    args = parser.parse_args(argv)
+
+    print(f"🚀 Bulk onboarding {args.input} -> {args.output} (concurrency {args.concurrency})")
+    summary = run_bulk_onboarding(
+        args.input,
+        args.output,
+        checkpoint_path=args.checkpoint,
+        concurrency=args.concurrency,
+        limit=args.limit,
+        progress_every=args.progress_every
+    )
+    print(json.dumps(summary, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,674 @@
+"""
+Checkpointers for the Neta workflow
+Durable SQLite or bounded in-memory thread state, selectable from config
+"""
+
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Sequence, Tuple
+import asyncio
+import importlib
+import json
+import os
+import pickle
+import random
+import sqlite3
+import threading
+import time
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    get_checkpoint_id,
+    get_checkpoint_metadata
+)
+from langgraph.checkpoint.memory import MemorySaver
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS checkpoints ("
+    " thread_id TEXT NOT NULL, checkpoint_ns TEXT NOT NULL, checkpoint_id TEXT NOT NULL,"
+    " parent_id TEXT, checkpoint_type TEXT NOT NULL, checkpoint BLOB NOT NULL,"
+    " metadata_type TEXT NOT NULL, metadata BLOB NOT NULL, channel_versions TEXT NOT NULL,"
+    " PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id))",
+    "CREATE TABLE IF NOT EXISTS checkpoint_blobs ("
+    " thread_id TEXT NOT NULL, checkpoint_ns TEXT NOT NULL, channel TEXT NOT NULL, version TEXT NOT NULL,"
+    " value_type TEXT NOT NULL, value BLOB,"
+    " PRIMARY KEY (thread_id, checkpoint_ns, channel, version))",
+    "CREATE TABLE IF NOT EXISTS checkpoint_writes ("
+    " thread_id TEXT NOT NULL, checkpoint_ns TEXT NOT NULL, checkpoint_id TEXT NOT NULL,"
+    " task_id TEXT NOT NULL, idx INTEGER NOT NULL, channel TEXT NOT NULL,"
+    " value_type TEXT NOT NULL, value BLOB, task_path TEXT NOT NULL DEFAULT '',"
+    " PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id, task_id, idx))",
+    "CREATE TABLE IF NOT EXISTS checkpoint_threads ("
+    " thread_id TEXT PRIMARY KEY, updated_at REAL NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS checkpoint_threads_updated ON checkpoint_threads (updated_at)"
+)
+
+def _config(thread_id: str, checkpoint_ns: str, checkpoint_id: Optional[str]) -> Optional[RunnableConfig]:
+    if not checkpoint_id:
+        return None
+    return {"configurable": {"thread_id": thread_id, "checkpoint_ns": checkpoint_ns, "checkpoint_id": checkpoint_id}}
+
+class SQLiteSaver(BaseCheckpointSaver[str]):
+    """Durable checkpointer on a WAL-mode SQLite file.
+
+    Like LangGraph's in-memory saver, a checkpoint row holds only channel
+    versions; channel values live in ``checkpoint_blobs`` keyed by version, so
+    each step stores just the channels it changed rather than a full copy of
+    the state.
+
+    Task writes are buffered and committed in one transaction together with
+    the step's checkpoint (or after ``flush_interval`` seconds, whichever
+    comes first), so a super-step costs one fsync instead of one per write.
+
+    Every ``compact_every`` checkpoints, threads idle for longer than
+    ``thread_ttl`` seconds are deleted and the threads written since the last
+    compaction are trimmed to their ``keep_checkpoints`` latest checkpoints,
+    along with the writes and blobs only those old checkpoints used. Graphs
+    using LangGraph's beta ``DeltaChannel`` should set ``keep_checkpoints=0``.
+    """
+
+    def __init__(self, path: Optional[str] = None, *, thread_ttl: Optional[float] = None,
+                 keep_checkpoints: Optional[int] = None, flush_interval: float = 0.05,
+                 compact_every: int = 100, serde: Any = None):
+        super().__init__(serde=serde)
+        self.path = path or os.getenv("NETA_CHECKPOINT_PATH", "neta_checkpoints.db")
+        self.thread_ttl = float(os.getenv("NETA_CHECKPOINT_TTL", "604800")) if thread_ttl is None else thread_ttl
+        self.keep_checkpoints = int(os.getenv("NETA_CHECKPOINT_KEEP", "20")) if keep_checkpoints is None else keep_checkpoints
+        self.flush_interval = flush_interval
+        self.compact_every = compact_every
+        self._lock = threading.RLock()
+        self._pending_writes: List[tuple] = []
+        self._flush_timer: Optional[threading.Timer] = None
+        self._dirty_threads = set()
+        self._puts = 0
+        self.checkpoints_written = 0
+        self.writes_written = 0
+        self.transactions = 0
+        self.threads_expired = 0
+        self.checkpoints_pruned = 0
+        self._conn = sqlite3.connect(self.path, timeout=5.0, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        for statement in _SCHEMA:
+            self._conn.execute(statement)
+
+    # Writing
+
+    def put(self, config: RunnableConfig, checkpoint: Checkpoint, metadata: CheckpointMetadata,
+            new_versions: ChannelVersions) -> RunnableConfig:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        stored = checkpoint.copy()
+        values = stored.pop("channel_values")
+        blobs = []
+        for channel, version in new_versions.items():
+            value_type, value = self.serde.dumps_typed(values[channel]) if channel in values else ("empty", None)
+            blobs.append((thread_id, checkpoint_ns, channel, str(version), value_type, value))
+        checkpoint_type, checkpoint_blob = self.serde.dumps_typed(stored)
+        metadata_type, metadata_blob = self.serde.dumps_typed(get_checkpoint_metadata(config, metadata))
+        row = (
+            thread_id, checkpoint_ns, checkpoint["id"], config["configurable"].get("checkpoint_id"),
+            checkpoint_type, checkpoint_blob, metadata_type, metadata_blob,
+            json.dumps({channel: str(version) for channel, version in checkpoint["channel_versions"].items()})
+        )
+
+        with self._lock:
+            self._commit(blobs, [row], self._take_pending(), [thread_id])
+            self._dirty_threads.add(thread_id)
+            self._puts += 1
+            if self.compact_every and self._puts % self.compact_every == 0:
+                self.compact()
+        return _config(thread_id, checkpoint_ns, checkpoint["id"])
+
+    def put_writes(self, config: RunnableConfig, writes: Sequence[Tuple[str, Any]], task_id: str,
+                   task_path: str = "") -> None:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        checkpoint_id = config["configurable"]["checkpoint_id"]
+        rows = []
+        for idx, (channel, value) in enumerate(writes):
+            value_type, blob = self.serde.dumps_typed(value)
+            # Special writes (errors, interrupts) replace earlier ones; regular writes are kept once
+            replace = WRITES_IDX_MAP.get(channel, idx) < 0
+            rows.append((replace, (thread_id, checkpoint_ns, checkpoint_id, task_id,
+                                   WRITES_IDX_MAP.get(channel, idx), channel, value_type, blob, task_path)))
+        with self._lock:
+            self._pending_writes.extend(rows)
+            if self._flush_timer is None and self.flush_interval > 0:
+                self._flush_timer = threading.Timer(self.flush_interval, self.flush)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+        if self.flush_interval <= 0:
+            self.flush()
+
+    def _take_pending(self) -> List[tuple]:
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+        writes, self._pending_writes = self._pending_writes, []
+        return writes
+
+    def flush(self):
+        """Commit buffered task writes now"""
+        with self._lock:
+            writes = self._take_pending()
+            if writes:
+                self._commit([], [], writes, [])
+
+    def _commit(self, blobs: List[tuple], checkpoints: List[tuple], writes: List[tuple], threads: List[str]):
+        conn = self._conn
+        conn.execute("BEGIN")
+        try:
+            if blobs:
+                conn.executemany("INSERT OR REPLACE INTO checkpoint_blobs VALUES (?, ?, ?, ?, ?, ?)", blobs)
+            if checkpoints:
+                conn.executemany("INSERT OR REPLACE INTO checkpoints VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", checkpoints)
+            for replace, row in writes:
+                verb = "INSERT OR REPLACE" if replace else "INSERT OR IGNORE"
+                conn.execute(f"{verb} INTO checkpoint_writes VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", row)
+            if threads:
+                now = time.time()
+                conn.executemany("INSERT OR REPLACE INTO checkpoint_threads VALUES (?, ?)", [(t, now) for t in threads])
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        self.transactions += 1
+        self.checkpoints_written += len(checkpoints)
+        self.writes_written += len(writes)
+
+    # Reading
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        checkpoint_id = get_checkpoint_id(config)
+        self.flush()
+        with self._lock:
+            if checkpoint_id:
+                row = self._conn.execute(
+                    "SELECT checkpoint_id, parent_id, checkpoint_type, checkpoint, metadata_type, metadata"
+                    " FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?",
+                    (thread_id, checkpoint_ns, checkpoint_id)
+                ).fetchone()
+            else:
+                row = self._conn.execute(
+                    "SELECT checkpoint_id, parent_id, checkpoint_type, checkpoint, metadata_type, metadata"
+                    " FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ?"
+                    " ORDER BY checkpoint_id DESC LIMIT 1",
+                    (thread_id, checkpoint_ns)
+                ).fetchone()
+            if row is None:
+                return None
+            return self._tuple(thread_id, checkpoint_ns, row)
+
+    def list(self, config: Optional[RunnableConfig], *, filter: Optional[Dict[str, Any]] = None,
+             before: Optional[RunnableConfig] = None, limit: Optional[int] = None) -> Iterator[CheckpointTuple]:
+        self.flush()
+        clauses, params = [], []
+        if config:
+            clauses.append("thread_id = ?")
+            params.append(config["configurable"]["thread_id"])
+            if config["configurable"].get("checkpoint_ns") is not None:
+                clauses.append("checkpoint_ns = ?")
+                params.append(config["configurable"]["checkpoint_ns"])
+            if get_checkpoint_id(config):
+                clauses.append("checkpoint_id = ?")
+                params.append(get_checkpoint_id(config))
+        if before and get_checkpoint_id(before):
+            clauses.append("checkpoint_id < ?")
+            params.append(get_checkpoint_id(before))
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT thread_id, checkpoint_ns, checkpoint_id, parent_id, checkpoint_type, checkpoint,"
+                f" metadata_type, metadata FROM checkpoints{where} ORDER BY checkpoint_id DESC",
+                params
+            ).fetchall()
+        for thread_id, checkpoint_ns, *row in rows:
+            if limit is not None and limit <= 0:
+                return
+            if filter:
+                metadata = self.serde.loads_typed((row[4], row[5]))
+                if not all(metadata.get(key) == value for key, value in filter.items()):
+                    continue
+            with self._lock:
+                found = self._tuple(thread_id, checkpoint_ns, row)
+            if limit is not None:
+                limit -= 1
+            yield found
+
+    def _tuple(self, thread_id: str, checkpoint_ns: str, row: tuple) -> CheckpointTuple:
+        checkpoint_id, parent_id, checkpoint_type, checkpoint_blob, metadata_type, metadata_blob = row
+        checkpoint = self.serde.loads_typed((checkpoint_type, checkpoint_blob))
+        values = {}
+        for channel, version in checkpoint["channel_versions"].items():
+            blob = self._conn.execute(
+                "SELECT value_type, value FROM checkpoint_blobs"
+                " WHERE thread_id = ? AND checkpoint_ns = ? AND channel = ? AND version = ?",
+                (thread_id, checkpoint_ns, channel, str(version))
+            ).fetchone()
+            if blob is not None and blob[0] != "empty":
+                values[channel] = self.serde.loads_typed(blob)
+        writes = self._conn.execute(
+            "SELECT task_id, channel, value_type, value FROM checkpoint_writes"
+            " WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?"
+            " ORDER BY task_path, task_id, idx",
+            (thread_id, checkpoint_ns, checkpoint_id)
+        ).fetchall()
+        return CheckpointTuple(
+            config=_config(thread_id, checkpoint_ns, checkpoint_id),
+            checkpoint={**checkpoint, "channel_values": values},
+            metadata=self.serde.loads_typed((metadata_type, metadata_blob)),
+            parent_config=_config(thread_id, checkpoint_ns, parent_id),
+            pending_writes=[(task_id, channel, self.serde.loads_typed((value_type, value)))
+                            for task_id, channel, value_type, value in writes]
+        )
+
+    def get_next_version(self, current: Optional[str], channel: Any = None) -> str:
+        if current is None:
+            current_v = 0
+        elif isinstance(current, int):
+            current_v = current
+        else:
+            current_v = int(current.split(".")[0])
+        return f"{current_v + 1:032}.{random.random():016}"
+
+    # Compaction
+
+    def delete_thread(self, thread_id: str) -> None:
+        self.flush()
+        with self._lock:
+            self._delete_threads([thread_id])
+
+    def _delete_threads(self, thread_ids: List[str]):
+        conn = self._conn
+        conn.execute("BEGIN")
+        try:
+            for table in ("checkpoints", "checkpoint_blobs", "checkpoint_writes", "checkpoint_threads"):
+                conn.executemany(f"DELETE FROM {table} WHERE thread_id = ?", [(t,) for t in thread_ids])
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def compact(self):
+        """Delete idle threads and trim recently written threads to their latest checkpoints"""
+        self.flush()
+        with self._lock:
+            if self.thread_ttl > 0:
+                expired = [row[0] for row in self._conn.execute(
+                    "SELECT thread_id FROM checkpoint_threads WHERE updated_at < ?",
+                    (time.time() - self.thread_ttl,)
+                )]
+                if expired:
+                    self._delete_threads(expired)
+                    self.threads_expired += len(expired)
+            dirty, self._dirty_threads = self._dirty_threads, set()
+            if self.keep_checkpoints > 0:
+                for thread_id in dirty:
+                    self._trim_thread(thread_id)
+
+    def _trim_thread(self, thread_id: str):
+        conn = self._conn
+        for (checkpoint_ns,) in conn.execute(
+            "SELECT DISTINCT checkpoint_ns FROM checkpoints WHERE thread_id = ?", (thread_id,)
+        ).fetchall():
+            kept = conn.execute(
+                "SELECT checkpoint_id, channel_versions FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ?"
+                " ORDER BY checkpoint_id DESC LIMIT ?",
+                (thread_id, checkpoint_ns, self.keep_checkpoints)
+            ).fetchall()
+            if len(kept) < self.keep_checkpoints:
+                continue
+            oldest_kept = kept[-1][0]
+            referenced = {(channel, version) for _, versions in kept for channel, version in json.loads(versions).items()}
+            conn.execute("BEGIN")
+            try:
+                pruned = conn.execute(
+                    "DELETE FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id < ?",
+                    (thread_id, checkpoint_ns, oldest_kept)
+                ).rowcount
+                conn.execute(
+                    "DELETE FROM checkpoint_writes WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id < ?",
+                    (thread_id, checkpoint_ns, oldest_kept)
+                )
+                stale = [
+                    (thread_id, checkpoint_ns, channel, version)
+                    for channel, version in conn.execute(
+                        "SELECT channel, version FROM checkpoint_blobs WHERE thread_id = ? AND checkpoint_ns = ?",
+                        (thread_id, checkpoint_ns)
+                    ).fetchall()
+                    if (channel, version) not in referenced
+                ]
+                conn.executemany(
+                    "DELETE FROM checkpoint_blobs WHERE thread_id = ? AND checkpoint_ns = ? AND channel = ? AND version = ?",
+                    stale
+                )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            self.checkpoints_pruned += pruned
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            threads = self._conn.execute("SELECT COUNT(*) FROM checkpoint_threads").fetchone()[0]
+            return {
+                "path": self.path,
+                "threads": threads,
+                "checkpoints_written": self.checkpoints_written,
+                "writes_written": self.writes_written,
+                "transactions": self.transactions,
+                "pending_writes": len(self._pending_writes),
+                "threads_expired": self.threads_expired,
+                "checkpoints_pruned": self.checkpoints_pruned
+            }
+
+    def close(self):
+        self.flush()
+        with self._lock:
+            self._conn.close()
+
+    # Async - SQLite calls run on a worker thread so they never block the event loop
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        return await asyncio.to_thread(self.get_tuple, config)
+
+    async def alist(self, config: Optional[RunnableConfig], *, filter: Optional[Dict[str, Any]] = None,
+                    before: Optional[RunnableConfig] = None, limit: Optional[int] = None) -> AsyncIterator[CheckpointTuple]:
+        found = await asyncio.to_thread(lambda: list(self.list(config, filter=filter, before=before, limit=limit)))
+        for item in found:
+            yield item
+
+    async def aput(self, config: RunnableConfig, checkpoint: Checkpoint, metadata: CheckpointMetadata,
+                   new_versions: ChannelVersions) -> RunnableConfig:
+        return await asyncio.to_thread(self.put, config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(self, config: RunnableConfig, writes: Sequence[Tuple[str, Any]], task_id: str,
+                          task_path: str = "") -> None:
+        return await asyncio.to_thread(self.put_writes, config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        return await asyncio.to_thread(self.delete_thread, thread_id)
+
+def _nbytes(value: Any) -> int:
+    """Serialized bytes held in a stored checkpoint, write or blob entry"""
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if isinstance(value, str):
+        return len(value)
+    if isinstance(value, tuple):
+        return sum(_nbytes(item) for item in value)
+    return 0
+
+class BoundedMemorySaver(MemorySaver):
+    """In-memory checkpointer with a hard budget.
+
+    Holds at most ``max_threads`` threads and ``max_bytes`` of serialized
+    checkpoint data. When either budget is exceeded, the least recently used
+    threads are moved to a SQLite spill file and loaded back transparently the
+    next time they are read or written. Only the ``keep_checkpoints`` latest
+    checkpoints of each thread are kept; the writes and blobs that only older
+    checkpoints used are dropped with them.
+
+    ``list(None)`` covers threads currently in memory; pass a thread ID to list
+    a spilled thread.
+    """
+
+    def __init__(self, *, max_threads: Optional[int] = None, max_bytes: Optional[int] = None,
+                 keep_checkpoints: Optional[int] = None, spill_path: Optional[str] = None, serde: Any = None):
+        super().__init__(serde=serde)
+        self.max_threads = int(os.getenv("NETA_MEMORY_MAX_THREADS", "1000")) if max_threads is None else max_threads
+        self.max_bytes = int(float(os.getenv("NETA_MEMORY_MAX_MB", "256")) * 1024 * 1024) if max_bytes is None else max_bytes
+        self.keep_checkpoints = int(os.getenv("NETA_CHECKPOINT_KEEP", "20")) if keep_checkpoints is None else keep_checkpoints
+        self.spill_path = spill_path or os.getenv("NETA_MEMORY_SPILL_PATH", "neta_spill.db")
+        self._lock = threading.RLock()
+        self._threads: "OrderedDict[str, int]" = OrderedDict()  # thread -> bytes, least recently used first
+        self._thread_writes: Dict[str, set] = {}
+        self._thread_blobs: Dict[str, set] = {}
+        self._versions: Dict[tuple, Dict[str, str]] = {}  # (thread, ns, checkpoint) -> channel versions
+        self._spill: Optional[sqlite3.Connection] = None
+        self.memory_bytes = 0
+        self.evictions = 0
+        self.reloads = 0
+        self.checkpoints_pruned = 0
+
+    def _spill_db(self) -> sqlite3.Connection:
+        if self._spill is None:
+            self._spill = sqlite3.connect(self.spill_path, timeout=5.0, check_same_thread=False, isolation_level=None)
+            self._spill.execute("PRAGMA journal_mode=WAL")
+            self._spill.execute("CREATE TABLE IF NOT EXISTS spilled_threads (thread_id TEXT PRIMARY KEY, payload BLOB NOT NULL)")
+        return self._spill
+
+    # Budget
+
+    def _touch(self, thread_id: str):
+        """Load ``thread_id`` back from the spill file if needed and mark it most recently used"""
+        if thread_id in self._threads:
+            self._threads.move_to_end(thread_id)
+            return
+        if self._spill is not None:
+            row = self._spill.execute("SELECT payload FROM spilled_threads WHERE thread_id = ?", (thread_id,)).fetchone()
+            if row is not None:
+                self._restore(thread_id, pickle.loads(row[0]))
+                self._spill.execute("DELETE FROM spilled_threads WHERE thread_id = ?", (thread_id,))
+                self.reloads += 1
+                return
+        self._threads[thread_id] = 0
+
+    def _restore(self, thread_id: str, payload: Dict[str, Any]):
+        for checkpoint_ns, checkpoints in payload["storage"].items():
+            self.storage[thread_id][checkpoint_ns].update(checkpoints)
+        self.writes.update(payload["writes"])
+        self.blobs.update(payload["blobs"])
+        self._versions.update(payload["versions"])
+        self._thread_writes[thread_id] = set(payload["writes"])
+        self._thread_blobs[thread_id] = set(payload["blobs"])
+        self._threads[thread_id] = 0
+        self._resize(thread_id)
+
+    def _resize(self, thread_id: str):
+        size = sum(_nbytes(entry) for checkpoints in self.storage.get(thread_id, {}).values() for entry in checkpoints.values())
+        size += sum(_nbytes(entry) for key in self._thread_writes.get(thread_id, ()) for entry in self.writes.get(key, {}).values())
+        size += sum(_nbytes(self.blobs[key]) for key in self._thread_blobs.get(thread_id, ()) if key in self.blobs)
+        self.memory_bytes += size - self._threads.get(thread_id, 0)
+        self._threads[thread_id] = size
+
+    def _settle(self, thread_id: str):
+        """After a read: forget a thread that has no checkpoints, else re-check the budget"""
+        if not self._threads.get(thread_id):
+            self._drop(thread_id)
+        else:
+            self._enforce_budget(keep=thread_id)
+
+    def _enforce_budget(self, keep: str):
+        while len(self._threads) > 1 and (len(self._threads) > self.max_threads or self.memory_bytes > self.max_bytes):
+            victim = next(iter(self._threads))
+            if victim == keep:
+                self._threads.move_to_end(victim)
+                victim = next(iter(self._threads))
+            self._evict(victim)
+
+    def _evict(self, thread_id: str):
+        payload = {
+            "storage": {ns: dict(checkpoints) for ns, checkpoints in self.storage.get(thread_id, {}).items()},
+            "writes": {key: self.writes[key] for key in self._thread_writes.get(thread_id, ()) if key in self.writes},
+            "blobs": {key: self.blobs[key] for key in self._thread_blobs.get(thread_id, ()) if key in self.blobs},
+            "versions": {key: versions for key, versions in self._versions.items() if key[0] == thread_id}
+        }
+        self._spill_db().execute(
+            "INSERT OR REPLACE INTO spilled_threads VALUES (?, ?)",
+            (thread_id, pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL))
+        )
+        self._drop(thread_id)
+        self.evictions += 1
+
+    def _drop(self, thread_id: str):
+        """Forget ``thread_id`` in memory (not in the spill file)"""
+        self.storage.pop(thread_id, None)
+        for key in self._thread_writes.pop(thread_id, ()):
+            self.writes.pop(key, None)
+        for key in self._thread_blobs.pop(thread_id, ()):
+            self.blobs.pop(key, None)
+        for key in [key for key in self._versions if key[0] == thread_id]:
+            del self._versions[key]
+        self.memory_bytes -= self._threads.pop(thread_id, 0)
+
+    def _trim(self, thread_id: str, checkpoint_ns: str):
+        checkpoints = self.storage[thread_id][checkpoint_ns]
+        if self.keep_checkpoints <= 0 or len(checkpoints) <= self.keep_checkpoints:
+            return
+        ordered = sorted(checkpoints)
+        for checkpoint_id in ordered[:-self.keep_checkpoints]:
+            del checkpoints[checkpoint_id]
+            self.writes.pop((thread_id, checkpoint_ns, checkpoint_id), None)
+            self._thread_writes[thread_id].discard((thread_id, checkpoint_ns, checkpoint_id))
+            self._versions.pop((thread_id, checkpoint_ns, checkpoint_id), None)
+            self.checkpoints_pruned += 1
+        referenced = {
+            (thread_id, checkpoint_ns, channel, version)
+            for checkpoint_id in ordered[-self.keep_checkpoints:]
+            for channel, version in self._versions.get((thread_id, checkpoint_ns, checkpoint_id), {}).items()
+        }
+        blobs = self._thread_blobs[thread_id]
+        for key in [key for key in blobs if key[1] == checkpoint_ns and key not in referenced]:
+            blobs.discard(key)
+            self.blobs.pop(key, None)
+
+    # Checkpointer API
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        thread_id = config["configurable"]["thread_id"]
+        with self._lock:
+            self._touch(thread_id)
+            found = super().get_tuple(config)
+            self._settle(thread_id)
+            return found
+
+    def list(self, config: Optional[RunnableConfig], *, filter: Optional[Dict[str, Any]] = None,
+             before: Optional[RunnableConfig] = None, limit: Optional[int] = None) -> Iterator[CheckpointTuple]:
+        with self._lock:
+            if config:
+                self._touch(config["configurable"]["thread_id"])
+            found = list(super().list(config, filter=filter, before=before, limit=limit))
+            if config:
+                self._settle(config["configurable"]["thread_id"])
+        yield from found
+
+    def put(self, config: RunnableConfig, checkpoint: Checkpoint, metadata: CheckpointMetadata,
+            new_versions: ChannelVersions) -> RunnableConfig:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        with self._lock:
+            self._touch(thread_id)
+            saved = super().put(config, checkpoint, metadata, new_versions)
+            self._versions[(thread_id, checkpoint_ns, checkpoint["id"])] = dict(checkpoint["channel_versions"])
+            self._thread_blobs.setdefault(thread_id, set()).update(
+                (thread_id, checkpoint_ns, channel, version) for channel, version in new_versions.items()
+            )
+            self._thread_writes.setdefault(thread_id, set())
+            self._trim(thread_id, checkpoint_ns)
+            self._resize(thread_id)
+            self._enforce_budget(keep=thread_id)
+        return saved
+
+    def put_writes(self, config: RunnableConfig, writes: Sequence[Tuple[str, Any]], task_id: str,
+                   task_path: str = "") -> None:
+        thread_id = config["configurable"]["thread_id"]
+        key = (thread_id, config["configurable"].get("checkpoint_ns", ""), config["configurable"]["checkpoint_id"])
+        with self._lock:
+            self._touch(thread_id)
+            super().put_writes(config, writes, task_id, task_path)
+            self._thread_writes.setdefault(thread_id, set()).add(key)
+            self._resize(thread_id)
+            self._enforce_budget(keep=thread_id)
+
+    def delete_thread(self, thread_id: str) -> None:
+        with self._lock:
+            self._drop(thread_id)
+            if self._spill is not None:
+                self._spill.execute("DELETE FROM spilled_threads WHERE thread_id = ?", (thread_id,))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            spilled = self._spill.execute("SELECT COUNT(*) FROM spilled_threads").fetchone()[0] if self._spill else 0
+            return {
+                "memory_bytes": self.memory_bytes,
+                "threads_in_memory": len(self._threads),
+                "threads_spilled": spilled,
+                "evictions": self.evictions,
+                "reloads": self.reloads,
+                "checkpoints_pruned": self.checkpoints_pruned
+            }
+
+    # Async - spill file reads and writes run on a worker thread
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        return await asyncio.to_thread(self.get_tuple, config)
+
+    async def alist(self, config: Optional[RunnableConfig], *, filter: Optional[Dict[str, Any]] = None,
+                    before: Optional[RunnableConfig] = None, limit: Optional[int] = None) -> AsyncIterator[CheckpointTuple]:
+        found = await asyncio.to_thread(lambda: list(self.list(config, filter=filter, before=before, limit=limit)))
+        for item in found:
+            yield item
+
+    async def aput(self, config: RunnableConfig, checkpoint: Checkpoint, metadata: CheckpointMetadata,
+                   new_versions: ChannelVersions) -> RunnableConfig:
+        return await asyncio.to_thread(self.put, config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(self, config: RunnableConfig, writes: Sequence[Tuple[str, Any]], task_id: str,
+                          task_path: str = "") -> None:
+        return await asyncio.to_thread(self.put_writes, config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        return await asyncio.to_thread(self.delete_thread, thread_id)
+
+# Workflow types stored in checkpoints, allowed by LangGraph's msgpack deserializer
+STATE_TYPES = [("messages", "Message"), ("reducers", "HistoryTrim")]
+
+def load_checkpointer(spec: Optional[Dict[str, Any]]) -> Optional[BaseCheckpointSaver]:
+    """Build the checkpointer described by a graph config ``checkpointer`` block.
+
+    ``spec`` is ``{"class_name": "module.Class", "kwargs": {...}}`` as in
+    ``langgraph-production.json``; None means no checkpointer.
+    """
+    if not spec:
+        return None
+    module_name, _, class_name = spec["class_name"].rpartition(".")
+    saver_class = getattr(importlib.import_module(module_name), class_name)
+    saver = saver_class(**spec.get("kwargs", {}))
+    # Older LangGraph versions load any type and have no allowlist
+    if hasattr(saver, "with_allowlist"):
+        saver = saver.with_allowlist(STATE_TYPES)
+    return saver
+
+# Short names accepted by NETA_CHECKPOINTER
+CHECKPOINTERS = {
+    "memory": "langgraph.checkpoint.memory.MemorySaver",
+    "bounded": "checkpointers.BoundedMemorySaver",
+    "sqlite": "checkpointers.SQLiteSaver"
+}
+
+def checkpointer_from_config(path: str, graph: str = "neta-social-assistant") -> Optional[BaseCheckpointSaver]:
+    """Checkpointer configured for ``graph`` in a langgraph.json-style file"""
+    with open(path, encoding="utf-8") as f:
+        config = json.load(f)
+    return load_checkpointer(config.get("graphs", {}).get(graph, {}).get("checkpointer"))
+
+def checkpointer_from_env() -> Optional[BaseCheckpointSaver]:
+    """Checkpointer selected by NETA_CHECKPOINTER (memory, bounded, sqlite or a class path) or by
+    the graph config file named in NETA_GRAPH_CONFIG; None when neither is set"""
+    choice = os.getenv("NETA_CHECKPOINTER", "").strip()
+    if choice == "none":
+        return None
+    if choice:
+        return load_checkpointer({"class_name": CHECKPOINTERS.get(choice, choice)})
+    if os.getenv("NETA_GRAPH_CONFIG"):
+        return checkpointer_from_config(os.environ["NETA_GRAPH_CONFIG"])
+    return None
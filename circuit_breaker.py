@@ -0,0 +1,188 @@
+"""
+Circuit breakers for the upstream services used by the Neta workflow
+Fail fast while Tavily or OpenAI is degraded so nodes can go straight to their fallbacks
+"""
+
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, Optional
+import asyncio
+import os
+import threading
+import time
+
+from neta_logging import get_logger
+from ttl_cache import TTLCache
+
+log = get_logger("breaker")
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an upstream service whose breaker is open"""
+
+class CircuitBreaker:
+    """Failure-rate circuit breaker with half-open probing and a negative cache.
+
+    The breaker tracks the outcome of the last ``window`` calls. Once at least
+    ``minimum_calls`` have been seen and the failure rate reaches
+    ``failure_rate_threshold`` it opens and rejects calls for ``open_seconds``.
+    It then lets ``half_open_max_calls`` probes through: a successful probe
+    closes it again, a failed one re-opens it.
+
+    Calls made with a ``key`` that failed within the last ``negative_ttl``
+    seconds are rejected straight away, even while the breaker is closed.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, failure_rate_threshold: float = 0.5, minimum_calls: int = 5,
+                 window: int = 20, open_seconds: float = 30.0, half_open_max_calls: int = 1,
+                 negative_ttl: float = 30.0):
+        self.name = name
+        self.failure_rate_threshold = failure_rate_threshold
+        self.minimum_calls = minimum_calls
+        self.open_seconds = open_seconds
+        self.half_open_max_calls = half_open_max_calls
+        self.negative_cache = TTLCache(namespace=f"{name}-negative", max_entries=1024, ttl=negative_ttl)
+        self._outcomes = deque(maxlen=window)
+        self._state = self.CLOSED
+        self._opened_at = 0.0
+        self._probes_in_flight = 0
+        self._lock = threading.Lock()
+        self.rejected = 0
+        self.times_opened = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            self._refresh()
+            return self._state
+
+    def _refresh(self):
+        if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.open_seconds:
+            self._state = self.HALF_OPEN
+            self._probes_in_flight = 0
+
+    def _open(self):
+        self._state = self.OPEN
+        self._opened_at = time.monotonic()
+        self._probes_in_flight = 0
+        self.times_opened += 1
+        log.warning(f"⚠️ {self.name} circuit opened - using fallbacks", open_seconds=self.open_seconds)
+
+    def before_call(self, key: Optional[str] = None):
+        """Reserve a call slot, raising CircuitOpenError if the call must not go upstream"""
+        if key is not None and self.negative_cache.get(key) is not None:
+            with self._lock:
+                self.rejected += 1
+            raise CircuitOpenError(f"{self.name} recently failed for this request")
+
+        with self._lock:
+            self._refresh()
+            if self._state == self.OPEN:
+                self.rejected += 1
+                raise CircuitOpenError(f"{self.name} circuit is open")
+            if self._state == self.HALF_OPEN:
+                if self._probes_in_flight >= self.half_open_max_calls:
+                    self.rejected += 1
+                    raise CircuitOpenError(f"{self.name} circuit is half-open and already probing")
+                self._probes_in_flight += 1
+
+    def record_success(self):
+        with self._lock:
+            if self._state == self.HALF_OPEN:
+                self._state = self.CLOSED
+                self._outcomes.clear()
+            self._outcomes.append(True)
+
+    def record_failure(self, key: Optional[str] = None):
+        if key is not None:
+            self.negative_cache.set(key, True)
+        with self._lock:
+            if self._state == self.HALF_OPEN:
+                self._open()
+                return
+            self._outcomes.append(False)
+            if self._state == self.CLOSED and len(self._outcomes) >= self.minimum_calls:
+                failures = self._outcomes.count(False)
+                if failures / len(self._outcomes) >= self.failure_rate_threshold:
+                    self._open()
+
+    def call(self, fn: Callable[..., Any], *args: Any, key: Optional[str] = None, **kwargs: Any) -> Any:
+        """Call ``fn`` through the breaker"""
+        self.before_call(key)
+        try:
+            result = fn(*args, **kwargs)
+        except Exception:
+            self.record_failure(key)
+            raise
+        self.record_success()
+        return result
+
+    async def acall(self, fn: Callable[..., Awaitable[Any]], *args: Any, key: Optional[str] = None,
+                    timeout: Optional[float] = None, **kwargs: Any) -> Any:
+        """Await ``fn`` through the breaker.
+
+        A call still running after ``timeout`` seconds is cancelled and counted
+        as a failure (``asyncio.TimeoutError`` is raised). Cancellation from
+        outside, e.g. the caller going away, is not counted.
+        """
+        self.before_call(key)
+        try:
+            result = await asyncio.wait_for(fn(*args, **kwargs), timeout=timeout)
+        except asyncio.TimeoutError:
+            log.warning(f"{self.name} call timed out", timeout_s=timeout)
+            self.record_failure(key)
+            raise
+        except asyncio.CancelledError:
+            self.release_probe()
+            raise
+        except Exception:
+            self.record_failure(key)
+            raise
+        self.record_success()
+        return result
+
+    def release_probe(self):
+        """Give back a half-open probe slot for a call that never completed"""
+        with self._lock:
+            if self._state == self.HALF_OPEN and self._probes_in_flight:
+                self._probes_in_flight -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            self._refresh()
+            return {
+                "name": self.name,
+                "state": self._state,
+                "recent_calls": len(self._outcomes),
+                "recent_failures": self._outcomes.count(False),
+                "rejected": self.rejected,
+                "times_opened": self.times_opened,
+                "negative_cache": self.negative_cache.stats()
+            }
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+def get_breaker(name: str) -> CircuitBreaker:
+    """Shared breaker for an upstream service, configured from the environment"""
+    with _breakers_lock:
+        breaker = _breakers.get(name)
+        if breaker is None:
+            breaker = CircuitBreaker(
+                name,
+                failure_rate_threshold=float(os.getenv("NETA_BREAKER_FAILURE_RATE", "0.5")),
+                minimum_calls=int(os.getenv("NETA_BREAKER_MIN_CALLS", "5")),
+                window=int(os.getenv("NETA_BREAKER_WINDOW", "20")),
+                open_seconds=float(os.getenv("NETA_BREAKER_OPEN_SECONDS", "30")),
+                negative_ttl=float(os.getenv("NETA_NEGATIVE_CACHE_TTL", "30"))
+            )
+            _breakers[name] = breaker
+        return breaker
+
+def breaker_stats() -> Dict[str, Dict[str, Any]]:
+    """Current state of every shared breaker"""
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    return {breaker.name: breaker.stats() for breaker in breakers}
@@ -0,0 +1,50 @@
+"""
+Delta responses for the Neta workflow
+Clients pass a ``since`` cursor and get back only the messages and fields that changed
+"""
+
+from typing import Any, Dict, List, Optional, Union
+
+from messages import message_dicts
+
+Cursor = Union[int, str, None]
+
+def resolve_cursor(messages: List[Any], since: Cursor, offset: int = 0) -> int:
+    """Index of the first message the client has not seen yet.
+
+    ``since`` is the ``cursor`` from a previous response (a message count),
+    as a number or a numeric string. ``offset`` is the number of older
+    messages already trimmed from ``messages``. Anything else resolves to 0
+    so the client gets the whole retained conversation rather than a gap.
+    """
+    if isinstance(since, str) and since.strip().isdigit():
+        since = int(since)
+    if not isinstance(since, int) or isinstance(since, bool):
+        return 0
+    return min(max(since - offset, 0), len(messages))
+
+def delta_response(previous: Dict[str, Any], current: Dict[str, Any], since: Cursor) -> Dict[str, Any]:
+    """Messages after ``since`` plus the fields of ``current`` that differ from ``previous``.
+
+    ``current["messages"]`` is the retained conversation, after
+    ``current["history_offset"]`` trimmed ones. The response carries a
+    ``cursor`` to send as ``since`` on the next run.
+    """
+    messages = current.get("messages") or []
+    offset = current.get("history_offset") or 0
+    start = resolve_cursor(messages, since, offset)
+    response = {
+        key: value for key, value in current.items()
+        if key != "messages" and previous.get(key) != value
+    }
+    response["messages"] = message_dicts(messages[start:])
+    response["cursor"] = offset + len(messages)
+    return response
+
+def run_output(previous: Dict[str, Any], current: Dict[str, Any], since: Optional[Cursor] = None) -> Dict[str, Any]:
+    """Full JSON-ready state, or a delta when the client sent a ``since`` cursor"""
+    if since is not None:
+        return delta_response(previous, current, since)
+    messages = current.get("messages") or []
+    offset = current.get("history_offset") or 0
+    return {**current, "messages": message_dicts(messages), "cursor": offset + len(messages)}
@@ -61,7 +61,7 @@ def deploy_to_langgraph_platform():
         "config": {
             "graph": "neta_social_assistant.py:app",
             "dependencies": [
-                "langgraph>=0.2.0",
+                "langgraph>=0.3",
                 "langchain-openai>=0.1.0", 
                 "langchain-core>=0.3.0"
             ]
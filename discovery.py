@@ -0,0 +1,363 @@
+"""
+Social account discovery engine for the Neta workflow
+Registry of per-platform discoverers that fan out concurrently under one deadline
+"""
+
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+import asyncio
+import os
+import time
+
+from circuit_breaker import CircuitOpenError, get_breaker
+from neta_logging import get_logger
+from singleflight import SingleFlightAborted, get_flight
+from ttl_cache import TTLCache, make_key, normalize_business_name
+
+log = get_logger("discovery")
+
+SearchFn = Callable[[str], List[Dict[str, Any]]]
+AsyncSearchFn = Callable[[str], Awaitable[List[Dict[str, Any]]]]
+
+# Discovery settings - tune the latency/recall trade-off per deployment
+CONCURRENT_DISCOVERY = os.getenv("NETA_CONCURRENT_DISCOVERY", "true").lower() not in ("0", "false", "no")
+# Discoveries expected to run at once; each one searches every enabled platform
+DISCOVERY_CONCURRENCY = int(os.getenv("NETA_DISCOVERY_CONCURRENCY", "4"))
+DISCOVERY_DEADLINE = float(os.getenv("NETA_DISCOVERY_DEADLINE", "15"))
+RESULTS_PER_PLATFORM = int(os.getenv("NETA_DISCOVERY_RESULTS_PER_PLATFORM", "2"))
+ENABLED_PLATFORMS = [
+    key.strip().lower()
+    for key in os.getenv("NETA_DISCOVERY_PLATFORMS", "").split(",")
+    if key.strip()
+]
+
+# Discovery results cache - keyed by normalized business name, platform and query.
+# Set NETA_DISCOVERY_CACHE_PATH to a SQLite file to share hits across restarts and workers
+discovery_cache = TTLCache(
+    namespace="discovery",
+    max_entries=int(os.getenv("NETA_DISCOVERY_CACHE_SIZE", "1024")),
+    ttl=float(os.getenv("NETA_DISCOVERY_CACHE_TTL", "21600")),
+    path=os.getenv("NETA_DISCOVERY_CACHE_PATH") or None
+)
+
+tavily_breaker = get_breaker("tavily")
+
+# Identical searches already in flight (double submits, several staff onboarding
+# the same business) wait for the running one instead of hitting Tavily again
+discovery_flight = get_flight("discovery")
+
+@dataclass(frozen=True)
+class PlatformDiscoverer:
+    """How to find, recognise and present accounts on one social platform"""
+
+    key: str
+    name: str
+    query_template: str
+    domains: Tuple[str, ...]
+    emoji: str
+    progress_message: str
+    handle_names: bool = False
+    fallback_url: Optional[str] = None
+    timeout: Optional[float] = None
+
+    def query(self, business_name: str) -> str:
+        return self.query_template.format(business_name=business_name)
+
+    def default_name(self, business_name: str) -> str:
+        if self.handle_names:
+            return f"@{business_name.lower().replace(' ', '')}"
+        return business_name
+
+    def parse(self, business_name: str, results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Turn raw search results into account records for this platform"""
+        accounts = []
+        for result in results[:RESULTS_PER_PLATFORM]:
+            url = result.get('url', '')
+            if any(domain in url for domain in self.domains):
+                accounts.append({
+                    "platform": self.name,
+                    "name": result.get('title', self.default_name(business_name)),
+                    "url": url,
+                    "snippet": result.get('content', '')[:200],
+                    "verified": False
+                })
+        return accounts
+
+    def fallback_account(self, business_name: str) -> Optional[Dict[str, Any]]:
+        """Manual-search link offered when nothing could be discovered"""
+        if self.fallback_url is None:
+            return None
+        return {
+            "platform": self.name,
+            "name": self.default_name(business_name),
+            "url": self.fallback_url.format(query=business_name.replace(' ', '%20')),
+            "snippet": f"Search manually on {self.name}",
+            "verified": False
+        }
+
+PLATFORM_REGISTRY: Dict[str, PlatformDiscoverer] = {}
+
+def register_platform(discoverer: PlatformDiscoverer) -> PlatformDiscoverer:
+    """Add (or replace) a platform discoverer; registration order is result order"""
+    PLATFORM_REGISTRY[discoverer.key] = discoverer
+    return discoverer
+
+def _platform_timeout(key: str) -> Optional[float]:
+    value = os.getenv(f"NETA_{key.upper()}_TIMEOUT")
+    return float(value) if value else None
+
+register_platform(PlatformDiscoverer(
+    key="facebook",
+    name="Facebook",
+    query_template="{business_name} Facebook page site:facebook.com",
+    domains=("facebook.com",),
+    emoji="🔵",
+    progress_message="Checking Facebook pages... 📘",
+    fallback_url="https://facebook.com/search/top?q={query}",
+    timeout=_platform_timeout("facebook")
+))
+register_platform(PlatformDiscoverer(
+    key="instagram",
+    name="Instagram",
+    query_template="{business_name} Instagram site:instagram.com",
+    domains=("instagram.com",),
+    emoji="📸",
+    progress_message="Searching Instagram accounts... 📸",
+    handle_names=True,
+    fallback_url="https://instagram.com/explore/search/keyword/?q={query}",
+    timeout=_platform_timeout("instagram")
+))
+register_platform(PlatformDiscoverer(
+    key="tiktok",
+    name="TikTok",
+    query_template="{business_name} TikTok site:tiktok.com",
+    domains=("tiktok.com",),
+    emoji="🎵",
+    progress_message="Looking for TikTok videos... 🎵",
+    handle_names=True,
+    timeout=_platform_timeout("tiktok")
+))
+register_platform(PlatformDiscoverer(
+    key="x",
+    name="X",
+    query_template="{business_name} X Twitter profile site:x.com OR site:twitter.com",
+    domains=("x.com", "twitter.com"),
+    emoji="🐦",
+    progress_message="Checking X (Twitter) profiles... 🐦",
+    handle_names=True,
+    timeout=_platform_timeout("x")
+))
+register_platform(PlatformDiscoverer(
+    key="linkedin",
+    name="LinkedIn",
+    query_template="{business_name} LinkedIn company page site:linkedin.com/company",
+    domains=("linkedin.com",),
+    emoji="💼",
+    progress_message="Searching LinkedIn company pages... 💼",
+    timeout=_platform_timeout("linkedin")
+))
+register_platform(PlatformDiscoverer(
+    key="google_business",
+    name="Google Business",
+    query_template="{business_name} Google Business Profile reviews hours",
+    domains=("google.com/maps", "maps.google.com", "business.google.com", "g.page"),
+    emoji="📍",
+    progress_message="Checking Google Business listings... 📍",
+    timeout=_platform_timeout("google_business")
+))
+
+def enabled_platforms() -> List[PlatformDiscoverer]:
+    """Registered platforms, narrowed by NETA_DISCOVERY_PLATFORMS when set"""
+    if not ENABLED_PLATFORMS:
+        return list(PLATFORM_REGISTRY.values())
+    return [PLATFORM_REGISTRY[key] for key in ENABLED_PLATFORMS if key in PLATFORM_REGISTRY]
+
+# One worker per platform search of every concurrent discovery, so a few
+# requests cannot leave the rest queued behind them; override with NETA_DISCOVERY_MAX_WORKERS
+DISCOVERY_MAX_WORKERS = int(os.getenv("NETA_DISCOVERY_MAX_WORKERS") or DISCOVERY_CONCURRENCY * max(len(enabled_platforms()), 1))
+
+_discovery_executor = ThreadPoolExecutor(
+    max_workers=DISCOVERY_MAX_WORKERS,
+    thread_name_prefix="neta-discovery"
+)
+
+def _cache_key(business_name: str, platform: PlatformDiscoverer) -> str:
+    # The query is keyed by its template so spelling variants of a name share entries
+    normalized_name = normalize_business_name(business_name)
+    normalized_query = " ".join(platform.query(normalized_name).lower().split())
+    return make_key(normalized_name, platform.key, normalized_query)
+
+def _search_platform(search: SearchFn, business_name: str, platform: PlatformDiscoverer, query: str,
+                     expires_at: Optional[float] = None) -> Optional[List[Dict[str, Any]]]:
+    """Run a single search; None when it failed or ``expires_at`` (monotonic) passed before it started"""
+    key = _cache_key(business_name, platform)
+    if expires_at is not None and time.monotonic() >= expires_at:
+        # Waited in the pool queue past its deadline - nobody is waiting for the result any more
+        log.warning(f"{platform.name} search expired in the discovery queue")
+        return None
+    try:
+        results, shared = discovery_flight.do(key, lambda: tavily_breaker.call(search, query, key=key))
+    except CircuitOpenError:
+        return None
+    except Exception as e:
+        log.warning(f"{platform.name} search failed", error=str(e))
+        return None
+    if not shared:
+        discovery_cache.set(key, results)
+    return results
+
+def _split_cached(business_name: str, platforms: List[PlatformDiscoverer]) -> tuple:
+    """Serve what we can from the cache; return (results, pending) keyed by platform"""
+    results = {}
+    pending = {}
+    for platform in platforms:
+        cached = discovery_cache.get(_cache_key(business_name, platform))
+        if cached is not None:
+            results[platform.key] = cached
+        else:
+            pending[platform.key] = (platform, platform.query(business_name))
+    return results, pending
+
+def _budget(platform: PlatformDiscoverer, deadline: float) -> float:
+    return deadline if platform.timeout is None else min(deadline, platform.timeout)
+
+def _ordered(results: Dict[str, Optional[List[Dict[str, Any]]]], platforms: List[PlatformDiscoverer],
+             failed: Optional[List[str]]) -> Dict[str, List[Dict[str, Any]]]:
+    """Results in platform order; platforms without a result get none and are added to ``failed``"""
+    ordered = {}
+    for platform in platforms:
+        ordered[platform.key] = results.get(platform.key)
+        if ordered[platform.key] is None:
+            ordered[platform.key] = []
+            if failed is not None:
+                failed.append(platform.key)
+    return ordered
+
+def search_platforms(business_name: str, search: Optional[SearchFn], platforms: List[PlatformDiscoverer],
+                     deadline: Optional[float] = None, failed: Optional[List[str]] = None) -> Dict[str, List[Dict[str, Any]]]:
+    """Search every platform and return raw results keyed by platform, in the order given.
+
+    Cached results are served without calling ``search``. In concurrent mode the
+    remaining platforms are submitted together and awaited against one shared
+    deadline (a platform's own timeout can only shorten it); anything still
+    running or queued when its time is up contributes no results, and queued
+    searches are dropped without calling ``search``. Platforms that could not
+    be searched (no search, open circuit, error, deadline) are appended to ``failed``.
+    """
+    deadline = DISCOVERY_DEADLINE if deadline is None else deadline
+    results, pending = _split_cached(business_name, platforms)
+
+    # Skip the fan-out entirely while Tavily is known to be down
+    if search is None or tavily_breaker.state == tavily_breaker.OPEN:
+        return _ordered(results, platforms, failed)
+
+    if not CONCURRENT_DISCOVERY:
+        for key, (platform, query) in pending.items():
+            results[key] = _search_platform(search, business_name, platform, query)
+        return _ordered(results, platforms, failed)
+
+    started = time.monotonic()
+    futures = {
+        key: (platform, _discovery_executor.submit(_search_platform, search, business_name, platform, query,
+                                                   started + _budget(platform, deadline)))
+        for key, (platform, query) in pending.items()
+    }
+
+    for key, (platform, future) in futures.items():
+        try:
+            results[key] = future.result(timeout=max(_budget(platform, deadline) - (time.monotonic() - started), 0))
+        except FutureTimeoutError:
+            if not future.cancel():
+                # Still waiting on Tavily - a hung search counts against the breaker like an async timeout
+                tavily_breaker.record_failure(_cache_key(business_name, platform))
+            log.warning(f"{platform.name} search missed the discovery deadline")
+            results[key] = None
+    return _ordered(results, platforms, failed)
+
+async def _asearch_platform(asearch: AsyncSearchFn, business_name: str, platform: PlatformDiscoverer, query: str, budget: float) -> Optional[List[Dict[str, Any]]]:
+    """Async counterpart of _search_platform, bounded by ``budget`` seconds"""
+    key = _cache_key(business_name, platform)
+
+    async def shared_search() -> List[Dict[str, Any]]:
+        # Cached by the shared call itself, so it still lands when the caller that started it has given up.
+        # A search outliving the platform's full budget counts against the breaker; a caller giving up sooner does not
+        results = await tavily_breaker.acall(asearch, query, key=key,
+                                             timeout=max(budget, _budget(platform, DISCOVERY_DEADLINE)))
+        if discovery_cache.persistent:
+            # SQLite write - keep it off the event loop like the reads
+            await asyncio.get_running_loop().run_in_executor(_discovery_executor, discovery_cache.set, key, results)
+        else:
+            discovery_cache.set(key, results)
+        return results
+
+    try:
+        # The deadline bounds this caller's wait only; callers with more time left keep the search running
+        results, _ = await asyncio.wait_for(discovery_flight.ado(key, shared_search), timeout=budget)
+    except (CircuitOpenError, SingleFlightAborted):
+        return None
+    except asyncio.TimeoutError:
+        log.warning(f"{platform.name} search missed the discovery deadline")
+        return None
+    except Exception as e:
+        log.warning(f"{platform.name} search failed", error=str(e))
+        return None
+    return results
+
+async def asearch_platforms(business_name: str, asearch: Optional[AsyncSearchFn], platforms: List[PlatformDiscoverer],
+                            deadline: Optional[float] = None, failed: Optional[List[str]] = None) -> Dict[str, List[Dict[str, Any]]]:
+    """Async counterpart of search_platforms; never blocks the event loop on Tavily"""
+    deadline = DISCOVERY_DEADLINE if deadline is None else deadline
+    if discovery_cache.persistent:
+        results, pending = await asyncio.to_thread(_split_cached, business_name, platforms)
+    else:
+        results, pending = _split_cached(business_name, platforms)
+
+    if asearch is None or tavily_breaker.state == tavily_breaker.OPEN:
+        return _ordered(results, platforms, failed)
+
+    if not CONCURRENT_DISCOVERY:
+        for key, (platform, query) in pending.items():
+            results[key] = await _asearch_platform(asearch, business_name, platform, query, _budget(platform, deadline))
+        return _ordered(results, platforms, failed)
+
+    keys = list(pending)
+    searches = await asyncio.gather(*(
+        _asearch_platform(asearch, business_name, platform, query, _budget(platform, deadline))
+        for platform, query in pending.values()
+    ))
+    results.update(zip(keys, searches))
+    return _ordered(results, platforms, failed)
+
+def _collect_accounts(business_name: str, platforms: List[PlatformDiscoverer], search_results: Dict[str, List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    discovered_accounts = []
+    for platform in platforms:
+        discovered_accounts.extend(platform.parse(business_name, search_results[platform.key]))
+
+    # Fallback if no accounts found
+    if not discovered_accounts:
+        for platform in platforms:
+            account = platform.fallback_account(business_name)
+            if account is not None:
+                discovered_accounts.append(account)
+
+    return discovered_accounts
+
+def discover_accounts(business_name: str, search: Optional[SearchFn], platforms: Optional[List[PlatformDiscoverer]] = None,
+                      deadline: Optional[float] = None, failed: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    """Discover accounts across platforms, falling back to manual-search links; unsearched platforms go to ``failed``"""
+    platforms = enabled_platforms() if platforms is None else platforms
+    return _collect_accounts(business_name, platforms, search_platforms(business_name, search, platforms, deadline, failed))
+
+async def adiscover_accounts(business_name: str, asearch: Optional[AsyncSearchFn], platforms: Optional[List[PlatformDiscoverer]] = None,
+                             deadline: Optional[float] = None, failed: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    """Async counterpart of discover_accounts"""
+    platforms = enabled_platforms() if platforms is None else platforms
+    return _collect_accounts(business_name, platforms, await asearch_platforms(business_name, asearch, platforms, deadline, failed))
+
+def platform_for(account: Dict[str, Any]) -> Optional[PlatformDiscoverer]:
+    """Look up the discoverer that produced an account record"""
+    for platform in PLATFORM_REGISTRY.values():
+        if platform.name == account.get("platform"):
+            return platform
+    return None
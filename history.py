@@ -0,0 +1,113 @@
+"""
+Rolling conversation history for the Neta workflow
+Keeps the last N messages verbatim and folds older ones into a running summary in the background
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+import os
+import threading
+
+from neta_logging import get_logger
+from reducers import HistoryTrim
+from ttl_cache import TTLCache
+
+log = get_logger("history")
+
+# Messages kept verbatim in state; 0 keeps the whole history
+HISTORY_WINDOW = int(os.getenv("NETA_HISTORY_WINDOW", "100"))
+# Upper bound on the running summary, in characters
+SUMMARY_MAX_CHARS = int(os.getenv("NETA_HISTORY_SUMMARY_CHARS", "2000"))
+
+def _message_line(message: Any) -> str:
+    return f"{message.get('role', 'user')}: {' '.join(str(message.get('content', '')).split())}"
+
+def extractive_summary(summary: str, dropped: List[Any]) -> str:
+    """Summary without an LLM: the previous summary plus one clipped line per dropped message"""
+    lines = [summary] if summary else []
+    lines.extend(_message_line(message)[:160] for message in dropped)
+    return "\n".join(lines)[-SUMMARY_MAX_CHARS:]
+
+class HistorySummarizer:
+    """Folds messages trimmed from a thread into that thread's running summary.
+
+    Summaries are produced on a small background pool, so the run that trims
+    the history never waits for the LLM. Each thread has at most one
+    summarization in flight; batches trimmed meanwhile are queued and folded
+    in order. Finished summaries are picked up by the thread's next run.
+    """
+
+    def __init__(self, summarize: Callable[[str, List[Any]], str], max_workers: int = 2, max_threads: int = 10000):
+        self.summarize = summarize
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="neta-history")
+        self._lock = threading.Lock()
+        self._pending: Dict[str, List[Any]] = {}
+        self._base: Dict[str, str] = {}
+        self._running = set()
+        self._summaries = TTLCache(namespace="history-summary", max_entries=max_threads, ttl=86400.0)
+        self.summarized = 0
+        self.failures = 0
+
+    def submit(self, thread_id: str, summary: str, dropped: List[Any]):
+        """Queue ``dropped`` to be folded into ``thread_id``'s summary (currently ``summary``)"""
+        with self._lock:
+            self._pending.setdefault(thread_id, []).extend(dropped)
+            self._base.setdefault(thread_id, summary)
+            if thread_id in self._running:
+                return
+            self._running.add(thread_id)
+        self._executor.submit(self._drain, thread_id)
+
+    def _drain(self, thread_id: str):
+        while True:
+            with self._lock:
+                dropped = self._pending.pop(thread_id, None)
+                base = self._base.pop(thread_id, "")
+                if not dropped:
+                    self._running.discard(thread_id)
+                    return
+            summary = self._summaries.get(thread_id, base)
+            try:
+                summary = self.summarize(summary, dropped)
+                self.summarized += 1
+            except Exception as e:
+                log.warning("⚠️ History summarization failed, keeping an extractive summary", thread_id=thread_id, error=str(e))
+                summary = extractive_summary(summary, dropped)
+                self.failures += 1
+            self._summaries.set(thread_id, summary[-SUMMARY_MAX_CHARS:])
+
+    def latest(self, thread_id: str) -> Optional[str]:
+        """Most recent finished summary for ``thread_id``, if any"""
+        return self._summaries.get(thread_id)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            in_flight = len(self._running)
+        return {
+            "summarized": self.summarized,
+            "failures": self.failures,
+            "in_flight": in_flight,
+            "summaries": self._summaries.stats()
+        }
+
+def history_update(state: Dict[str, Any], thread_id: str, summarizer: HistorySummarizer,
+                   window: int = HISTORY_WINDOW) -> Dict[str, Any]:
+    """Partial update trimming ``state`` to the last ``window`` messages.
+
+    Trimmed messages go to ``summarizer``; a summary it finished since the last
+    run is written to ``history_summary``. ``history_offset`` is set to the
+    count of every message ever trimmed, so message cursors stay absolute.
+    """
+    update = {}
+    summary = state.get("history_summary", "")
+    latest = summarizer.latest(thread_id)
+    if latest is not None and latest != summary:
+        update["history_summary"] = summary = latest
+
+    messages = state.get("messages") or []
+    if window > 0 and len(messages) > window:
+        dropped = len(messages) - window
+        summarizer.submit(thread_id, summary, messages[:dropped])
+        update["messages"] = [HistoryTrim(dropped)]
+        update["history_offset"] = (state.get("history_offset") or 0) + dropped
+    return update
@@ -0,0 +1,71 @@
+"""
+LLM response cache for the Neta workflow
+Repeat analyses for the same business are served without another OpenAI call
+"""
+
+from typing import Any, Dict, Optional
+import hashlib
+import os
+
+from ttl_cache import TTLCache, make_key
+
+def normalize_prompt(prompt: str) -> str:
+    """Collapse whitespace and case so trivially different prompts share a key"""
+    return " ".join(prompt.split()).casefold()
+
+def _digest(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+class LLMResponseCache:
+    """Caches completions by model, temperature and prompt.
+
+    Lookups try the exact prompt first and then its normalized form. The
+    backend is anything with TTLCache's ``get``/``set``/``stats`` interface;
+    by default an in-memory LRU, optionally backed by SQLite.
+    """
+
+    def __init__(self, backend: TTLCache):
+        self.backend = backend
+        self.exact_hits = 0
+        self.normalized_hits = 0
+
+    @property
+    def persistent(self) -> bool:
+        return getattr(self.backend, "persistent", False)
+
+    def _keys(self, model: str, temperature: float, prompt: str) -> tuple:
+        return (
+            make_key(model, temperature, "exact", _digest(prompt)),
+            make_key(model, temperature, "normalized", _digest(normalize_prompt(prompt)))
+        )
+
+    def get(self, model: str, temperature: float, prompt: str) -> Optional[str]:
+        """Cached completion for ``prompt``, or None"""
+        exact_key, normalized_key = self._keys(model, temperature, prompt)
+        response = self.backend.get(exact_key)
+        if response is not None:
+            self.exact_hits += 1
+            return response
+        response = self.backend.get(normalized_key)
+        if response is not None:
+            self.normalized_hits += 1
+        return response
+
+    def set(self, model: str, temperature: float, prompt: str, response: str):
+        for key in self._keys(model, temperature, prompt):
+            self.backend.set(key, response)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self.backend.stats(),
+            "exact_hits": self.exact_hits,
+            "normalized_hits": self.normalized_hits
+        }
+
+# Shared analysis cache - set NETA_LLM_CACHE_PATH to a SQLite file to persist it
+analysis_cache = LLMResponseCache(TTLCache(
+    namespace="llm",
+    max_entries=int(os.getenv("NETA_LLM_CACHE_SIZE", "512")),
+    ttl=float(os.getenv("NETA_LLM_CACHE_TTL", "86400")),
+    path=os.getenv("NETA_LLM_CACHE_PATH") or None
+))
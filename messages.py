@@ -0,0 +1,101 @@
+"""
+Compact chat messages for the Neta workflow
+Long-lived threads keep many near-identical progress messages; these share their strings and metadata
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Union
+import sys
+
+TIMESTAMP = "2024-01-01T00:00:00Z"
+
+# Upper bound on distinct metadata values shared between messages
+MAX_INTERNED_METADATA = 4096
+
+class Metadata(dict):
+    """Read-only metadata dict, shared by every message with the same fields"""
+
+    __slots__ = ()
+
+    def _readonly(self, *args: Any, **kwargs: Any):
+        raise TypeError("message metadata is shared and cannot be modified")
+
+    __setitem__ = __delitem__ = __ior__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+    def __copy__(self) -> "Metadata":
+        return self
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> "Metadata":
+        return self
+
+    def __reduce__(self):
+        return intern_metadata, (dict(self),)
+
+_metadata_pool: Dict[tuple, Metadata] = {}
+
+def intern_metadata(metadata: Optional[Mapping[str, Any]]) -> Optional[Metadata]:
+    """Shared read-only copy of ``metadata``"""
+    if metadata is None:
+        return None
+    items = tuple((sys.intern(key), sys.intern(value) if isinstance(value, str) else value)
+                  for key, value in metadata.items())
+    try:
+        shared = _metadata_pool.get(items)
+    except TypeError:
+        # Unhashable values (lists, dicts) are kept per message
+        return metadata if isinstance(metadata, Metadata) else Metadata(items)
+    if shared is None:
+        shared = Metadata(items)
+        if len(_metadata_pool) < MAX_INTERNED_METADATA:
+            shared = _metadata_pool.setdefault(items, shared)
+    return shared
+
+@dataclass(frozen=True, slots=True)
+class Message:
+    """A chat message held in graph state.
+
+    Role, timestamp and metadata are interned, so the thousands of progress
+    messages in long-lived threads share them instead of each carrying its own
+    dicts. Messages read like the plain dicts they replace (``msg["content"]``,
+    ``msg.get("metadata")``) and ``to_dict`` gives the exact JSON shape the API
+    has always returned. Checkpoint serializers round-trip it as a dataclass;
+    ``__post_init__`` re-interns the fields when it is loaded back.
+    """
+
+    role: str
+    content: str
+    timestamp: str = TIMESTAMP
+    metadata: Optional[Mapping[str, Any]] = None
+
+    def __post_init__(self):
+        object.__setattr__(self, "role", sys.intern(self.role))
+        object.__setattr__(self, "timestamp", sys.intern(self.timestamp))
+        if self.metadata is not None and not isinstance(self.metadata, Metadata):
+            object.__setattr__(self, "metadata", intern_metadata(self.metadata))
+
+    def __getitem__(self, key: str) -> Any:
+        value = self.get(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key not in self.__slots__:
+            return default
+        value = getattr(self, key)
+        return default if value is None else value
+
+    def to_dict(self) -> Dict[str, Any]:
+        message = {"role": self.role, "content": self.content, "timestamp": self.timestamp}
+        if self.metadata is not None:
+            message["metadata"] = dict(self.metadata)
+        return message
+
+def assistant_message(content: str, **metadata: Any) -> Message:
+    """Assistant message with the given metadata fields (none for a plain reply)"""
+    return Message("assistant", content, TIMESTAMP, metadata or None)
+
+def message_dicts(messages: Iterable[Union[Message, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """Plain JSON-ready dicts for ``messages``, e.g. before writing state out"""
+    return [message.to_dict() if isinstance(message, Message) else message for message in messages]
@@ -0,0 +1,22 @@
+"""
+Conversation milestones for the Neta workflow
+A small set of flags in state so nodes check progress in O(1) instead of scanning history
+"""
+
+from typing import Any, Dict, Mapping
+
+GREETED = "greeted"
+DISCOVERY_DONE = "discovery_done"
+ANALYSIS_DONE = "analysis_done"
+CREATION_DONE = "creation_done"
+COMPLETED = "completed"
+
+ALL_MILESTONES = (GREETED, DISCOVERY_DONE, ANALYSIS_DONE, CREATION_DONE, COMPLETED)
+
+def has_milestone(state: Mapping[str, Any], milestone: str) -> bool:
+    """Whether the conversation has reached ``milestone``"""
+    return bool((state.get("milestones") or {}).get(milestone))
+
+def reached(*milestones: str) -> Dict[str, bool]:
+    """Partial ``milestones`` update marking each of ``milestones`` as reached"""
+    return {milestone: True for milestone in milestones}
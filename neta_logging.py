@@ -0,0 +1,209 @@
+"""
+Structured logging for the Neta workflow and server
+Log calls only enqueue a record; formatting and writing happen on a background thread
+"""
+
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, Optional
+import atexit
+import json
+import logging
+import os
+import queue
+import random
+import reprlib
+import sys
+import threading
+
+# Minimum level written: DEBUG, INFO, WARNING, ERROR
+LOG_LEVEL = os.getenv("NETA_LOG_LEVEL", "INFO").upper()
+# "text" (human readable) or "json" (one object per line)
+LOG_FORMAT = os.getenv("NETA_LOG_FORMAT", "text")
+# Per-route share of INFO/DEBUG records kept, e.g. "/runs=0.1,/health=0"
+LOG_SAMPLE = os.getenv("NETA_LOG_SAMPLE", "")
+# Longest logged field value, in characters
+LOG_MAX_CHARS = int(os.getenv("NETA_LOG_MAX_CHARS", "500"))
+# Records waiting to be written before new ones are dropped
+LOG_QUEUE_SIZE = int(os.getenv("NETA_LOG_QUEUE_SIZE", "10000"))
+
+_clip_repr = reprlib.Repr()
+_clip_repr.maxlevel = 3
+_clip_repr.maxdict = 10
+_clip_repr.maxlist = 10
+_clip_repr.maxstring = 80
+_clip_repr.maxother = LOG_MAX_CHARS
+
+def clip(value: Any, limit: int = LOG_MAX_CHARS) -> Any:
+    """Log-safe copy of ``value``: scalars as-is, long strings cut, containers as a bounded repr.
+
+    The cost is bounded by ``limit`` rather than by the size of ``value``, so
+    whole request payloads can be passed without formatting them in full.
+    """
+    if value is None or isinstance(value, (bool, int, float)):
+        return value
+    if isinstance(value, str):
+        return value if len(value) <= limit else f"{value[:limit]}... ({len(value)} chars)"
+    text = _clip_repr.repr(value)
+    return text if len(text) <= limit else f"{text[:limit]}..."
+
+def parse_sample_rates(spec: str) -> Dict[str, float]:
+    """``"/runs=0.1,/health=0"`` -> ``{"/runs": 0.1, "/health": 0.0}``"""
+    rates = {}
+    for part in spec.split(","):
+        route, _, rate = part.partition("=")
+        if route.strip() and rate.strip():
+            rates[route.strip()] = min(max(float(rate), 0.0), 1.0)
+    return rates
+
+class RouteSampler(logging.Filter):
+    """Keeps a share of the INFO and DEBUG records tagged with a ``route`` field; warnings always pass"""
+
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__()
+        self.rates = rates
+        self.dropped = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING or not self.rates:
+            return True
+        rate = self.rates.get(getattr(record, "fields", {}).get("route"))
+        if rate is None or rate >= 1.0 or random.random() < rate:
+            return True
+        self.dropped += 1
+        return False
+
+class ClippingQueueHandler(QueueHandler):
+    """Queue handler that clips fields in the caller and leaves formatting to the listener.
+
+    The stock ``QueueHandler.prepare`` formats the whole record in the calling
+    thread; here the caller only renders the message and clips the fields.
+    When the queue is full the record is dropped instead of blocking.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.msg = record.getMessage()
+        record.args = None
+        record.fields = {key: clip(value) for key, value in getattr(record, "fields", {}).items()}
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+class TextFormatter(logging.Formatter):
+    """``time level logger message key=value ...``"""
+
+    def __init__(self):
+        super().__init__("%(asctime)s %(levelname)s %(name)s %(message)s")
+
+    def format(self, record: logging.LogRecord) -> str:
+        line = super().format(record)
+        fields = getattr(record, "fields", None)
+        if fields:
+            line += " " + " ".join(f"{key}={value}" for key, value in fields.items())
+        return line
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            **getattr(record, "fields", {})
+        }
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+class NetaLogger:
+    """Logger taking an event message plus keyword fields: ``log.info("Run finished", route="/runs", ms=12)``"""
+
+    def __init__(self, logger: logging.Logger):
+        self.logger = logger
+
+    def _log(self, level: int, message: str, fields: Dict[str, Any], exc_info: bool = False):
+        if self.logger.isEnabledFor(level):
+            self.logger.log(level, message, exc_info=exc_info, extra={"fields": fields})
+
+    def debug(self, message: str, **fields: Any):
+        self._log(logging.DEBUG, message, fields)
+
+    def info(self, message: str, **fields: Any):
+        self._log(logging.INFO, message, fields)
+
+    def warning(self, message: str, **fields: Any):
+        self._log(logging.WARNING, message, fields)
+
+    def error(self, message: str, **fields: Any):
+        self._log(logging.ERROR, message, fields)
+
+    def exception(self, message: str, **fields: Any):
+        """Error with the current exception's traceback"""
+        self._log(logging.ERROR, message, fields, exc_info=True)
+
+_lock = threading.RLock()
+_listener: Optional[QueueListener] = None
+_handler: Optional[ClippingQueueHandler] = None
+_sampler: Optional[RouteSampler] = None
+
+def configure_logging(level: str = LOG_LEVEL, log_format: str = LOG_FORMAT, sample: str = LOG_SAMPLE,
+                      stream=None) -> logging.Logger:
+    """(Re)configure the ``neta`` logger tree; called on first use with the NETA_LOG_* settings"""
+    global _listener, _handler, _sampler
+    with _lock:
+        root = logging.getLogger("neta")
+        if _listener is not None:
+            _listener.stop()
+            root.removeHandler(_handler)
+
+        output = logging.StreamHandler(stream or sys.stdout)
+        output.setFormatter(JsonFormatter() if log_format == "json" else TextFormatter())
+        log_queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+        _handler = ClippingQueueHandler(log_queue)
+        _sampler = RouteSampler(parse_sample_rates(sample))
+        _handler.addFilter(_sampler)
+        _listener = QueueListener(log_queue, output)
+        _listener.start()
+
+        root.addHandler(_handler)
+        root.setLevel(level)
+        root.propagate = False
+        return root
+
+def flush_logging():
+    """Write out every queued record, e.g. before exit"""
+    with _lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener.start()
+
+def log_stats() -> Dict[str, int]:
+    return {
+        "dropped_queue_full": _handler.dropped if _handler else 0,
+        "dropped_sampled": _sampler.dropped if _sampler else 0
+    }
+
+def get_logger(name: str) -> NetaLogger:
+    """Structured logger ``neta.<name>``"""
+    if _listener is None:
+        with _lock:
+            if _listener is None:
+                configure_logging()
+    return NetaLogger(logging.getLogger(f"neta.{name}"))
+
+@atexit.register
+def _stop_listener():
+    if _listener is not None:
+        _listener.stop()
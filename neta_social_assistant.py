@@ -3,77 +3,150 @@ Neta Social Assistant - LangGraph Cloud Workflow
 AI Marketing Freelancer for social media automation and guidance
 """
 
-from typing import Dict, Any, List, Optional, Literal
-from typing_extensions import TypedDict
-from langgraph.graph import StateGraph, START, END
-from langchain_openai import ChatOpenAI
-from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
-from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.runnables import RunnableConfig
+from typing import Dict, Any, Iterator, List, Optional, Tuple, Union
+from typing_extensions import Annotated, TypedDict
+from langgraph.config import get_stream_writer  # custom stream events need langgraph>=0.3
+from langgraph.graph import StateGraph, START
+from langgraph.types import Command, interrupt
+from langchain_core.runnables import RunnableConfig, RunnableLambda
+import asyncio
 import json
 import uuid
 import os
+import threading
 
-# Import Tavily with proper error handling
-try:
-    from langchain_community.tools.tavily_search import TavilySearchResults
-    TAVILY_AVAILABLE = True
-except ImportError:
-    print("⚠️ Tavily not available - using fallback search")
-    TAVILY_AVAILABLE = False
+from checkpointers import checkpointer_from_env
+from circuit_breaker import get_breaker
+from deltas import run_output
+from discovery import adiscover_accounts, discover_accounts, enabled_platforms, platform_for
+from llm_cache import analysis_cache, normalize_prompt
+from messages import Message, assistant_message, message_dicts
+from milestones import ANALYSIS_DONE, COMPLETED, CREATION_DONE, DISCOVERY_DONE, GREETED, has_milestone, reached
+from history import HistorySummarizer, history_update
+from neta_logging import get_logger
+from reducers import append_messages, merge_dicts
+from singleflight import get_flight
+from transitions import edges, next_node, rerun_requested, route_targets, step_after
+from ttl_cache import make_key
 
-# State Schema
+log = get_logger("workflow")
+
+# State Schema - nodes return partial updates: new messages are appended,
+# user_data and milestones keys are merged, every other field is replaced when present
 class NetaState(TypedDict):
     business_name: str
-    messages: List[Dict[str, Any]]
+    messages: Annotated[List[Union[Message, Dict[str, Any]]], append_messages]  # nodes add Message, clients send dicts
     current_step: str
-    user_data: Dict[str, Any]
+    user_data: Annotated[Dict[str, Any], merge_dicts]
+    milestones: Annotated[Dict[str, bool], merge_dicts]
+    history_summary: str  # Running summary of messages trimmed from the window
+    history_offset: int  # How many messages have been trimmed; set by the history node only
     social_accounts: List[Dict[str, Any]]
     next_actions: List[Dict[str, Any]]
     session_id: str
 
-# Initialize the LLM
-llm = ChatOpenAI(
-    model="gpt-4o-mini",
-    temperature=0.7,
-    max_tokens=1000
-)
+# LLM and Tavily clients are created lazily on first use (or by warmup()) so
+# importing this module stays cheap and does not pull in langchain_community
+LLM_MODEL = "gpt-4o-mini"
+LLM_TEMPERATURE = 0.7
+
+_clients_lock = threading.Lock()
+_llm = None
+_tavily_search = None
+_tavily_loaded = False
+
+def get_llm():
+    """Shared ChatOpenAI client, created on first use"""
+    global _llm
+    if _llm is None:
+        with _clients_lock:
+            if _llm is None:
+                from langchain_openai import ChatOpenAI
+                _llm = ChatOpenAI(
+                    model=LLM_MODEL,
+                    temperature=LLM_TEMPERATURE,
+                    max_tokens=1000
+                )
+    return _llm
 
-# Initialize Tavily search tool for social media discovery
-if TAVILY_AVAILABLE:
+def get_tavily_search():
+    """Shared Tavily search tool for social media discovery, or None if unavailable"""
+    global _tavily_search, _tavily_loaded
+    if not _tavily_loaded:
+        with _clients_lock:
+            if not _tavily_loaded:
+                # Import Tavily with proper error handling
+                try:
+                    from langchain_community.tools.tavily_search import TavilySearchResults
+                    _tavily_search = TavilySearchResults(
+                        max_results=5,
+                        search_depth="advanced",
+                        include_answer=True,
+                        include_raw_content=True
+                    )
+                    log.info("✅ Tavily search initialized successfully")
+                except ImportError:
+                    log.warning("⚠️ Tavily not available - using fallback search")
+                except Exception as e:
+                    log.warning("⚠️ Tavily initialization failed", error=str(e))
+                _tavily_loaded = True
+    return _tavily_search
+
+def warmup() -> Dict[str, bool]:
+    """Create the LLM and Tavily clients up front, e.g. right after the server binds"""
+    status = {"llm": False, "tavily": False}
     try:
-        tavily_search = TavilySearchResults(
-            max_results=5,
-            search_depth="advanced",
-            include_answer=True,
-            include_raw_content=True
-        )
-        print("✅ Tavily search initialized successfully")
+        status["llm"] = get_llm() is not None
     except Exception as e:
-        print(f"⚠️ Tavily initialization failed: {e}")
-        tavily_search = None
-else:
-    tavily_search = None
+        log.warning("⚠️ LLM initialization failed", error=str(e))
+    status["tavily"] = get_tavily_search() is not None
+    return status
+
+# While OpenAI is failing, analysis goes straight to its canned fallback
+openai_breaker = get_breaker("openai")
+
+# Identical analyses already in flight share one LLM call
+analysis_flight = get_flight("analysis")
+
+def _summarize_history(summary: str, dropped: List[Any]) -> str:
+    """Fold trimmed messages into the running summary (runs on the summarizer's pool)"""
+    transcript = "\n".join(f"{msg.get('role', 'user')}: {msg.get('content', '')}" for msg in dropped)
+    prompt = f"""Update the summary of a conversation between Neta, an AI marketing assistant, and a business owner.
+    Keep the business details, decisions and preferences; drop progress chatter. Answer in under 150 words.
+
+    Current summary:
+    {summary or "(none)"}
+
+    New messages:
+    {transcript}
+    """
+    return _response_text(openai_breaker.call(get_llm().invoke, prompt)).strip()
+
+# Messages trimmed from the window are summarized in the background
+history_summarizer = HistorySummarizer(_summarize_history)
+
+def history_node(state: NetaState, config: RunnableConfig) -> Dict[str, Any]:
+    """Keep the last NETA_HISTORY_WINDOW messages and pick up finished summaries"""
+    # session_id follows the conversation across stateless runs; checkpointed runs set it to the thread id
+    thread_id = state.get("session_id") or ((config or {}).get("configurable") or {}).get("thread_id") or ""
+    return history_update(state, str(thread_id), history_summarizer)
 
-def greeting_node(state: NetaState, config: RunnableConfig) -> NetaState:
+async def ahistory_node(state: NetaState, config: RunnableConfig) -> Dict[str, Any]:
+    """Async history window - summarization already runs off the event loop"""
+    return history_node(state, config)
+
+def greeting_node(state: NetaState, config: RunnableConfig) -> Dict[str, Any]:
     """Initial greeting and business name collection"""
     
-    # Check if we've already sent the greeting message
-    messages = state.get("messages", [])
-    has_greeted = any(msg.get("content", "").startswith("Hi! I'm Neta") for msg in messages)
-    
     if not state.get("business_name"):
-        if not has_greeted:
+        # Check if we've already sent the greeting message
+        if not has_milestone(state, GREETED):
             # First time - send greeting
-            greeting_msg = {
-                "role": "assistant",
-                "content": "Hi! I'm Neta, your AI Marketing Freelancer. I'll help you create amazing social media content based on your existing social presence. What's your business name?",
-                "timestamp": "2024-01-01T00:00:00Z"
-            }
+            greeting_msg = assistant_message("Hi! I'm Neta, your AI Marketing Freelancer. I'll help you create amazing social media content based on your existing social presence. What's your business name?")
             
             return {
-                **state,
-                "messages": messages + [greeting_msg],
+                "messages": [greeting_msg],
+                "milestones": reached(GREETED),
                 "current_step": "greeting",  # Stay in greeting state
                 "next_actions": [
                     {
@@ -84,150 +157,58 @@ def greeting_node(state: NetaState, config: RunnableConfig) -> NetaState:
                 ]
             }
         else:
-            # Already greeted, waiting for input - just return current state
-            return state
+            # Already greeted, waiting for input - nothing changes
+            return {}
     
-    # Business name provided, move to next step
+    # Business name provided, move to next step (a returning client's step is kept for the router)
+    if state.get("current_step", "greeting") != "greeting":
+        return {}
     return {
-        **state,
         "current_step": "social_discovery"
     }
 
-def social_discovery_node(state: NetaState, config: RunnableConfig) -> NetaState:
-    """Search and analyze existing social media accounts using Tavily with progressive messaging"""
-    
-    business_name = state.get("business_name", "")
-    messages = state.get("messages", [])
-    user_data = state.get("user_data", {})
-    
-    # Check if already processed to avoid duplicate execution
-    if user_data.get("social_search_completed"):
-        return state
+def _discovery_progress(business_name: str, platforms: List[Any]) -> List[Message]:
+    """Progress messages shown while discovery runs"""
     
     # Progressive message sequence for better UX
     progress_messages = []
     
     # Step 1: Start message
-    progress_messages.append({
-        "role": "assistant",
-        "content": f"Perfect! Let me search for {business_name}'s social media accounts... 🔍",
-        "timestamp": "2024-01-01T00:00:00Z",
-        "metadata": {"type": "progress", "step": "search_start"}
-    })
-    
-    # Step 2: Facebook search indicator
-    progress_messages.append({
-        "role": "assistant", 
-        "content": "Checking Facebook pages... 📘",
-        "timestamp": "2024-01-01T00:00:00Z",
-        "metadata": {"type": "progress", "step": "facebook_search"}
-    })
-    
-    discovered_accounts = []
-    
-    # Execute Facebook search
-    if tavily_search is not None:
-        try:
-            fb_query = f"{business_name} Facebook page site:facebook.com"
-            fb_results = tavily_search.invoke(fb_query)
-            
-            # Parse Facebook results
-            for result in fb_results[:2]:
-                if 'facebook.com' in result.get('url', ''):
-                    discovered_accounts.append({
-                        "platform": "Facebook",
-                        "name": result.get('title', business_name),
-                        "url": result.get('url', ''),
-                        "snippet": result.get('content', '')[:200],
-                        "verified": False
-                    })
-                    
-        except Exception as e:
-            print(f"Facebook search failed: {e}")
-    
-    # Step 3: Instagram search indicator
-    progress_messages.append({
-        "role": "assistant",
-        "content": "Searching Instagram accounts... 📸", 
-        "timestamp": "2024-01-01T00:00:00Z",
-        "metadata": {"type": "progress", "step": "instagram_search"}
-    })
-    
-    # Execute Instagram search
-    if tavily_search is not None:
-        try:
-            ig_query = f"{business_name} Instagram site:instagram.com"
-            ig_results = tavily_search.invoke(ig_query)
-            
-            # Parse Instagram results  
-            for result in ig_results[:2]:
-                if 'instagram.com' in result.get('url', ''):
-                    discovered_accounts.append({
-                        "platform": "Instagram",
-                        "name": result.get('title', f"@{business_name.lower().replace(' ', '')}"),
-                        "url": result.get('url', ''),
-                        "snippet": result.get('content', '')[:200],
-                        "verified": False
-                    })
-                    
-        except Exception as e:
-            print(f"Instagram search failed: {e}")
-    
-    # Fallback if no accounts found
-    if not discovered_accounts:
-        discovered_accounts = [
-            {
-                "platform": "Facebook",
-                "name": f"{business_name}",
-                "url": f"https://facebook.com/search/top?q={business_name.replace(' ', '%20')}",
-                "snippet": "Search manually on Facebook",
-                "verified": False
-            },
-            {
-                "platform": "Instagram", 
-                "name": f"@{business_name.lower().replace(' ', '')}",
-                "url": f"https://instagram.com/explore/search/keyword/?q={business_name.replace(' ', '%20')}",
-                "snippet": "Search manually on Instagram",
-                "verified": False
-            }
-        ]
+    progress_messages.append(assistant_message(f"Perfect! Let me search for {business_name}'s social media accounts... 🔍", type="progress", step="search_start"))
+    
+    # Step 2: One search indicator per platform
+    for platform in platforms:
+        progress_messages.append(assistant_message(platform.progress_message, type="progress", step=f"{platform.key}_search"))
+    
+    return progress_messages
+
+def _discovery_result(state: NetaState, progress_messages: List[Message], discovered_accounts: List[Dict[str, Any]],
+                      failed_platforms: List[str]) -> Dict[str, Any]:
+    """Present the discovered accounts and ask the user to confirm them.
+
+    ``failed_platforms`` (platforms Tavily could not be asked about) is kept in
+    ``user_data["discovery_failed"]`` so callers can tell a miss from an outage.
+    """
     
     # Step 4: Success message and individual account details
     if discovered_accounts:
-        progress_messages.append({
-            "role": "assistant",
-            "content": "Great! I found your social accounts: ✅",
-            "timestamp": "2024-01-01T00:00:00Z",
-            "metadata": {"type": "success", "step": "accounts_found"}
-        })
+        progress_messages.append(assistant_message("Great! I found your social accounts: ✅", type="success", step="accounts_found"))
         
         # Individual account messages (mobile-optimized)
         for account in discovered_accounts:
-            emoji = "🔵" if account['platform'] == 'Facebook' else "📸"
-            progress_messages.append({
-                "role": "assistant",
-                "content": f"{emoji} {account['platform']}: {account['name']}",
-                "timestamp": "2024-01-01T00:00:00Z",
-                "metadata": {"type": "account_detail", "platform": account['platform'].lower()}
-            })
+            platform = platform_for(account)
+            emoji = platform.emoji if platform else "🌐"
+            progress_messages.append(assistant_message(f"{emoji} {account['platform']}: {account['name']}", type="account_detail", platform=platform.key if platform else account['platform'].lower()))
     
     # Step 5: Confirmation request
-    progress_messages.append({
-        "role": "assistant",
-        "content": "Are these your accounts? 🤔",
-        "timestamp": "2024-01-01T00:00:00Z", 
-        "metadata": {"type": "confirmation", "step": "verify"}
-    })
+    progress_messages.append(assistant_message("Are these your accounts? 🤔", type="confirmation", step="verify"))
     
     return {
-        **state,
-        "messages": messages + progress_messages,
-        "current_step": "confirm_accounts",
+        "messages": progress_messages,
+        "current_step": step_after("social_discovery"),
         "social_accounts": discovered_accounts,
-        "user_data": {
-            **user_data,
-            "social_search_completed": True
-        },
+        "user_data": {"discovery_failed": failed_platforms},
+        "milestones": reached(DISCOVERY_DONE),
         "next_actions": [
             {
                 "id": "confirm_all",
@@ -247,49 +228,53 @@ def social_discovery_node(state: NetaState, config: RunnableConfig) -> NetaState
         ]
     }
 
-def content_analysis_node(state: NetaState, config: RunnableConfig) -> NetaState:
-    """Analyze existing content using LLM with discovered social accounts and progressive messaging"""
+async def agreeting_node(state: NetaState, config: RunnableConfig) -> Dict[str, Any]:
+    """Async greeting - no I/O, shares the sync implementation"""
+    return greeting_node(state, config)
+
+def social_discovery_node(state: NetaState, config: RunnableConfig) -> Dict[str, Any]:
+    """Search and analyze existing social media accounts using Tavily with progressive messaging"""
+    
+    # Check if already processed to avoid duplicate execution
+    if has_milestone(state, DISCOVERY_DONE):
+        return {}
     
     business_name = state.get("business_name", "")
-    social_accounts = state.get("social_accounts", [])
-    messages = state.get("messages", [])
-    user_data = state.get("user_data", {})
+    platforms = enabled_platforms()
+    progress_messages = _discovery_progress(business_name, platforms)
+    _emit_messages(progress_messages)
     
-    # Check if already processed to avoid duplicate execution
-    if user_data.get("content_analysis_completed"):
-        return state
+    # Step 3: Search every platform at once under the shared discovery deadline
+    tavily_search = get_tavily_search()
+    search = tavily_search.invoke if tavily_search is not None else None
+    failed_platforms = []
+    discovered_accounts = discover_accounts(business_name, search, platforms, failed=failed_platforms)
     
-    progress_messages = []
+    return _discovery_result(state, progress_messages, discovered_accounts, failed_platforms)
+
+async def asocial_discovery_node(state: NetaState, config: RunnableConfig) -> Dict[str, Any]:
+    """Async social discovery - awaits Tavily without blocking the event loop"""
     
-    # Step 1: Analysis start
-    progress_messages.append({
-        "role": "assistant",
-        "content": f"Excellent! Now let me analyze {business_name}'s social media content... 📊",
-        "timestamp": "2024-01-01T00:00:00Z",
-        "metadata": {"type": "progress", "step": "analysis_start"}
-    })
+    if has_milestone(state, DISCOVERY_DONE):
+        return {}
     
-    if social_accounts:
-        # Step 2: Account analysis
-        progress_messages.append({
-            "role": "assistant", 
-            "content": "Analyzing your posting patterns and engagement... 🔍",
-            "timestamp": "2024-01-01T00:00:00Z",
-            "metadata": {"type": "progress", "step": "pattern_analysis"}
-        })
-        
-        # Step 3: Content themes identification  
-        progress_messages.append({
-            "role": "assistant",
-            "content": "Identifying your best-performing content themes... 🎯", 
-            "timestamp": "2024-01-01T00:00:00Z",
-            "metadata": {"type": "progress", "step": "theme_analysis"}
-        })
-        
-        # Build analysis prompt with actual URLs
-        urls_text = "\n".join([f"- {acc['platform']}: {acc['name']}" for acc in social_accounts])
-        
-        analysis_prompt = f"""
+    business_name = state.get("business_name", "")
+    platforms = enabled_platforms()
+    progress_messages = _discovery_progress(business_name, platforms)
+    _emit_messages(progress_messages)
+    
+    tavily_search = get_tavily_search()
+    asearch = tavily_search.ainvoke if tavily_search is not None else None
+    failed_platforms = []
+    discovered_accounts = await adiscover_accounts(business_name, asearch, platforms, failed=failed_platforms)
+    
+    return _discovery_result(state, progress_messages, discovered_accounts, failed_platforms)
+
+def _analysis_prompt(business_name: str, social_accounts: List[Dict[str, Any]]) -> str:
+    """Build analysis prompt with actual URLs"""
+    urls_text = "\n".join([f"- {acc['platform']}: {acc['name']}" for acc in social_accounts])
+    
+    return f"""
         Analyze the social media presence for {business_name} based on these accounts:
         {urls_text}
         
@@ -301,73 +286,125 @@ def content_analysis_node(state: NetaState, config: RunnableConfig) -> NetaState
         
         Keep the response friendly, actionable, and under 200 words.
         """
+
+def _response_text(response: Any) -> str:
+    return response.content if hasattr(response, 'content') else str(response)
+
+def _stream_writer():
+    """Custom stream writer for the current graph run, or None outside a run"""
+    try:
+        return get_stream_writer()
+    except RuntimeError:
+        return None
+
+def _emit_messages(messages: List[Message]):
+    """Push messages to streaming clients as soon as they exist, ahead of the node's update"""
+    writer = _stream_writer()
+    if writer is not None:
+        for message in messages:
+            writer({"type": "message", "message": message.to_dict()})
+
+def _analysis_delta(token: str) -> Dict[str, Any]:
+    """Incremental message update for one analysis token"""
+    return {
+        "type": "message_delta",
+        "role": "assistant",
+        "delta": token,
+        "metadata": {"type": "analysis_results", "step": "analysis_stream"}
+    }
+
+def _stream_analysis(analysis_prompt: str, config: RunnableConfig) -> str:
+    """Run the analysis LLM call, emitting each token as it arrives"""
+    writer = _stream_writer()
+    tokens = []
+    for chunk in get_llm().stream(analysis_prompt, config=config):
+        token = _response_text(chunk)
+        if token:
+            tokens.append(token)
+            if writer is not None:
+                writer(_analysis_delta(token))
+    return "".join(tokens)
+
+def _analysis_flight_key(analysis_prompt: str) -> str:
+    return make_key(LLM_MODEL, LLM_TEMPERATURE, normalize_prompt(analysis_prompt))
+
+def _emit_cached_analysis(analysis_content: str):
+    """Stream a cached or shared analysis as a single delta so streaming clients still see it"""
+    writer = _stream_writer()
+    if writer is not None:
+        writer(_analysis_delta(analysis_content))
+
+async def _astream_analysis(analysis_prompt: str, config: RunnableConfig) -> str:
+    """Async counterpart of _stream_analysis"""
+    writer = _stream_writer()
+    tokens = []
+    async for chunk in get_llm().astream(analysis_prompt, config=config):
+        token = _response_text(chunk)
+        if token:
+            tokens.append(token)
+            if writer is not None:
+                writer(_analysis_delta(token))
+    return "".join(tokens)
+
+def _analysis_progress(business_name: str, social_accounts: List[Dict[str, Any]]) -> List[Message]:
+    """Progress messages shown while the analysis runs"""
+    
+    # Step 1: Analysis start
+    progress_messages = [assistant_message(f"Excellent! Now let me analyze {business_name}'s social media content... 📊", type="progress", step="analysis_start")]
+    
+    if social_accounts:
+        # Step 2: Account analysis
+        progress_messages.append(assistant_message("Analyzing your posting patterns and engagement... 🔍", type="progress", step="pattern_analysis"))
         
-        try:
-            # Use LLM to analyze
-            response = llm.invoke(analysis_prompt)
-            analysis_content = response.content if hasattr(response, 'content') else str(response)
-            
+        # Step 3: Content themes identification  
+        progress_messages.append(assistant_message("Identifying your best-performing content themes... 🎯", type="progress", step="theme_analysis"))
+    
+    return progress_messages
+
+def _analysis_result(state: NetaState, analysis_content: Optional[str]) -> Dict[str, Any]:
+    """Turn the LLM analysis (None if it failed) into progress messages and next actions"""
+    
+    business_name = state.get("business_name", "")
+    social_accounts = state.get("social_accounts", [])
+    user_data = state.get("user_data", {})
+    
+    progress_messages = _analysis_progress(business_name, social_accounts)
+    
+    if social_accounts:
+        if analysis_content is not None:
             # Step 4: Analysis complete
-            progress_messages.append({
-                "role": "assistant",
-                "content": "Analysis complete! Here's what I found: ✅",
-                "timestamp": "2024-01-01T00:00:00Z",
-                "metadata": {"type": "success", "step": "analysis_complete"}
-            })
+            progress_messages.append(assistant_message("Analysis complete! Here's what I found: ✅", type="success", step="analysis_complete"))
             
             # Step 5: Results
-            progress_messages.append({
-                "role": "assistant", 
-                "content": analysis_content,
-                "timestamp": "2024-01-01T00:00:00Z",
-                "metadata": {"type": "analysis_results"}
-            })
+            progress_messages.append(assistant_message(analysis_content, type="analysis_results"))
             
-        except Exception as e:
-            print(f"LLM analysis failed: {e}")
+        else:
             # Fallback analysis
-            progress_messages.append({
-                "role": "assistant",
-                "content": "Based on your social accounts, I recommend focusing on visual content, behind-the-scenes posts, and customer engagement to build a strong social presence.",
-                "timestamp": "2024-01-01T00:00:00Z",
-                "metadata": {"type": "analysis_fallback"}
-            })
+            progress_messages.append(assistant_message("Based on your social accounts, I recommend focusing on visual content, behind-the-scenes posts, and customer engagement to build a strong social presence.", type="analysis_fallback"))
             
     else:
         # No social accounts - provide starter strategy
         progress_messages.extend([
-            {
-                "role": "assistant",
-                "content": "Creating a starter social media strategy for your business... 🚀",
-                "timestamp": "2024-01-01T00:00:00Z",
-                "metadata": {"type": "progress", "step": "starter_strategy"}
-            },
-            {
-                "role": "assistant", 
-                "content": f"I'll help you build a social media presence from scratch for {business_name}. Here are content themes that work well for businesses like yours:",
-                "timestamp": "2024-01-01T00:00:00Z",
-                "metadata": {"type": "starter_analysis"}
-            }
+            assistant_message("Creating a starter social media strategy for your business... 🚀", type="progress", step="starter_strategy"),
+            assistant_message(f"I'll help you build a social media presence from scratch for {business_name}. Here are content themes that work well for businesses like yours:", type="starter_analysis")
         ])
     
+    analysis_data = {
+        "content_themes": ["visual_content", "behind_the_scenes", "customer_engagement"],
+        "analysis_insights": "Focus on visual storytelling and authentic engagement"
+    }
+    # Regeneration is a one-shot request
+    if user_data.get("regenerate_analysis"):
+        analysis_data["regenerate_analysis"] = False
+    
     # Step 6: Strategy approval request
-    progress_messages.append({
-        "role": "assistant",
-        "content": "Should I create a content strategy based on these insights? 🎨",
-        "timestamp": "2024-01-01T00:00:00Z", 
-        "metadata": {"type": "confirmation", "step": "strategy_approval"}
-    })
+    progress_messages.append(assistant_message("Should I create a content strategy based on these insights? 🎨", type="confirmation", step="strategy_approval"))
     
     return {
-        **state,
-        "messages": messages + progress_messages,
-        "current_step": "strategy_approval",
-        "user_data": {
-            **user_data,
-            "content_analysis_completed": True,
-            "content_themes": ["visual_content", "behind_the_scenes", "customer_engagement"],
-            "analysis_insights": "Focus on visual storytelling and authentic engagement"
-        },
+        "messages": progress_messages,
+        "current_step": step_after("content_analysis"),
+        "user_data": analysis_data,
+        "milestones": reached(ANALYSIS_DONE),
         "next_actions": [
             {
                 "id": "approve_strategy",
@@ -387,58 +424,105 @@ def content_analysis_node(state: NetaState, config: RunnableConfig) -> NetaState
         ]
     }
 
-def content_creation_node(state: NetaState, config: RunnableConfig) -> NetaState:
+def content_analysis_node(state: NetaState, config: RunnableConfig) -> Dict[str, Any]:
+    """Analyze existing content using LLM with discovered social accounts and progressive messaging"""
+    
+    # Check if already processed to avoid duplicate execution
+    if has_milestone(state, ANALYSIS_DONE) and not rerun_requested("content_analysis", state):
+        return {}
+    
+    social_accounts = state.get("social_accounts", [])
+    analysis_content = None
+    _emit_messages(_analysis_progress(state.get("business_name", ""), social_accounts))
+    
+    if social_accounts:
+        analysis_prompt = _analysis_prompt(state.get("business_name", ""), social_accounts)
+        
+        # Serve repeat analyses from the cache unless the user asked to regenerate
+        if not state.get("user_data", {}).get("regenerate_analysis"):
+            analysis_content = analysis_cache.get(LLM_MODEL, LLM_TEMPERATURE, analysis_prompt)
+        
+        if analysis_content is not None:
+            _emit_cached_analysis(analysis_content)
+        else:
+            try:
+                # Use LLM to analyze, streaming tokens to the client as they arrive
+                analysis_content, shared = analysis_flight.do(
+                    _analysis_flight_key(analysis_prompt),
+                    lambda: openai_breaker.call(_stream_analysis, analysis_prompt, config, key=analysis_prompt)
+                )
+                if shared:
+                    _emit_cached_analysis(analysis_content)
+                else:
+                    analysis_cache.set(LLM_MODEL, LLM_TEMPERATURE, analysis_prompt, analysis_content)
+            except Exception as e:
+                log.warning("LLM analysis failed", error=str(e))
+    
+    return _analysis_result(state, analysis_content)
+
+async def _call_now(fn, *args):
+    return fn(*args)
+
+async def acontent_analysis_node(state: NetaState, config: RunnableConfig) -> Dict[str, Any]:
+    """Async content analysis - awaits OpenAI without blocking the event loop"""
+    
+    if has_milestone(state, ANALYSIS_DONE) and not rerun_requested("content_analysis", state):
+        return {}
+    
+    social_accounts = state.get("social_accounts", [])
+    analysis_content = None
+    _emit_messages(_analysis_progress(state.get("business_name", ""), social_accounts))
+    
+    if social_accounts:
+        analysis_prompt = _analysis_prompt(state.get("business_name", ""), social_accounts)
+        # Keep SQLite cache I/O off the event loop
+        run_cache = asyncio.to_thread if analysis_cache.persistent else _call_now
+        
+        if not state.get("user_data", {}).get("regenerate_analysis"):
+            analysis_content = await run_cache(analysis_cache.get, LLM_MODEL, LLM_TEMPERATURE, analysis_prompt)
+        
+        if analysis_content is not None:
+            _emit_cached_analysis(analysis_content)
+        else:
+            try:
+                analysis_content, shared = await analysis_flight.ado(
+                    _analysis_flight_key(analysis_prompt),
+                    lambda: openai_breaker.acall(_astream_analysis, analysis_prompt, config, key=analysis_prompt)
+                )
+                if shared:
+                    _emit_cached_analysis(analysis_content)
+                else:
+                    await run_cache(analysis_cache.set, LLM_MODEL, LLM_TEMPERATURE, analysis_prompt, analysis_content)
+            except Exception as e:
+                log.warning("LLM analysis failed", error=str(e))
+    
+    return _analysis_result(state, analysis_content)
+
+def content_creation_node(state: NetaState, config: RunnableConfig) -> Dict[str, Any]:
     """Generate content based on strategy with progressive messaging"""
     
     business_name = state.get("business_name", "")
-    messages = state.get("messages", [])
-    user_data = state.get("user_data", {})
     
     # Check if already processed to avoid duplicate execution
-    if user_data.get("content_creation_completed"):
-        return state
+    if has_milestone(state, CREATION_DONE):
+        return {}
     
     progress_messages = []
     
     # Step 1: Creation start
-    progress_messages.append({
-        "role": "assistant",
-        "content": f"Perfect! I'll create content that matches {business_name}'s style... 🎨",
-        "timestamp": "2024-01-01T00:00:00Z",
-        "metadata": {"type": "progress", "step": "creation_start"}
-    })
+    progress_messages.append(assistant_message(f"Perfect! I'll create content that matches {business_name}'s style... 🎨", type="progress", step="creation_start"))
     
     # Step 2: Analysis phase
-    progress_messages.append({
-        "role": "assistant",
-        "content": "Analyzing your best-performing posts... 📊",
-        "timestamp": "2024-01-01T00:00:00Z",
-        "metadata": {"type": "progress", "step": "post_analysis"}
-    })
+    progress_messages.append(assistant_message("Analyzing your best-performing posts... 📊", type="progress", step="post_analysis"))
     
     # Step 3: Hashtag research
-    progress_messages.append({
-        "role": "assistant",
-        "content": "Researching trending hashtags in your area... 🔍",
-        "timestamp": "2024-01-01T00:00:00Z", 
-        "metadata": {"type": "progress", "step": "hashtag_research"}
-    })
+    progress_messages.append(assistant_message("Researching trending hashtags in your area... 🔍", type="progress", step="hashtag_research"))
     
     # Step 4: Visual creation
-    progress_messages.append({
-        "role": "assistant",
-        "content": "Creating images that match your visual style... 🎨",
-        "timestamp": "2024-01-01T00:00:00Z",
-        "metadata": {"type": "progress", "step": "visual_creation"}
-    })
+    progress_messages.append(assistant_message("Creating images that match your visual style... 🎨", type="progress", step="visual_creation"))
     
     # Step 5: Caption writing
-    progress_messages.append({
-        "role": "assistant", 
-        "content": "Writing captions in your tone of voice... ✍️",
-        "timestamp": "2024-01-01T00:00:00Z",
-        "metadata": {"type": "progress", "step": "caption_writing"}
-    })
+    progress_messages.append(assistant_message("Writing captions in your tone of voice... ✍️", type="progress", step="caption_writing"))
     
     # Generate business-appropriate content
     generated_content = [
@@ -461,38 +545,21 @@ def content_creation_node(state: NetaState, config: RunnableConfig) -> NetaState
     ]
     
     # Step 6: Success message
-    progress_messages.append({
-        "role": "assistant",
-        "content": "Content creation complete! ✅",
-        "timestamp": "2024-01-01T00:00:00Z",
-        "metadata": {"type": "success", "step": "creation_complete"}
-    })
+    progress_messages.append(assistant_message("Content creation complete! ✅", type="success", step="creation_complete"))
     
     # Step 7: Presentation
-    progress_messages.append({
-        "role": "assistant",
-        "content": f"Here are 2 posts I've created for {business_name}:\n\n📱 Post 1: Product showcase (high engagement type)\n📸 Post 2: Behind-the-scenes (builds trust)\n\nEach follows successful patterns from similar businesses.",
-        "timestamp": "2024-01-01T00:00:00Z",
-        "metadata": {"type": "content_presentation"}
-    })
+    progress_messages.append(assistant_message(f"Here are 2 posts I've created for {business_name}:\n\n📱 Post 1: Product showcase (high engagement type)\n📸 Post 2: Behind-the-scenes (builds trust)\n\nEach follows successful patterns from similar businesses.", type="content_presentation"))
     
     # Step 8: Approval request
-    progress_messages.append({
-        "role": "assistant",
-        "content": "Ready to review and approve? 🚀",
-        "timestamp": "2024-01-01T00:00:00Z",
-        "metadata": {"type": "confirmation", "step": "content_approval"}
-    })
+    progress_messages.append(assistant_message("Ready to review and approve? 🚀", type="confirmation", step="content_approval"))
     
     return {
-        **state,
-        "messages": messages + progress_messages,
-        "current_step": "content_approval",
+        "messages": progress_messages,
+        "current_step": step_after("content_creation"),
         "user_data": {
-            **user_data,
-            "content_creation_completed": True,
             "generated_content": generated_content
         },
+        "milestones": reached(CREATION_DONE),
         "next_actions": [
             {
                 "id": "approve_all",
@@ -512,69 +579,43 @@ def content_creation_node(state: NetaState, config: RunnableConfig) -> NetaState
         ]
     }
 
-def completion_node(state: NetaState, config: RunnableConfig) -> NetaState:
+async def acontent_creation_node(state: NetaState, config: RunnableConfig) -> Dict[str, Any]:
+    """Async content creation - no I/O, shares the sync implementation"""
+    return content_creation_node(state, config)
+
+def completion_node(state: NetaState, config: RunnableConfig) -> Dict[str, Any]:
     """Final confirmation and scheduling with mobile-optimized messages"""
     
     business_name = state.get("business_name", "")
-    messages = state.get("messages", [])
-    user_data = state.get("user_data", {})
     
     # Check if already processed to avoid duplicate execution
-    if user_data.get("completion_processed"):
-        return state
+    if has_milestone(state, COMPLETED):
+        return {}
     
     progress_messages = []
     
     # Step 1: Success confirmation (mobile-friendly)
-    progress_messages.append({
-        "role": "assistant",
-        "content": f"Perfect! {business_name}'s content is ready! 🚀",
-        "timestamp": "2024-01-01T00:00:00Z",
-        "metadata": {"type": "success", "step": "content_ready"}
-    })
+    progress_messages.append(assistant_message(f"Perfect! {business_name}'s content is ready! 🚀", type="success", step="content_ready"))
     
     # Step 2: Scheduling details (concise for mobile)
-    progress_messages.append({
-        "role": "assistant",
-        "content": "📅 Scheduling:\n📱 Post 1: Facebook at 2:00 PM\n📸 Post 2: Instagram at 2:05 PM",
-        "timestamp": "2024-01-01T00:00:00Z",
-        "metadata": {"type": "schedule_info"}
-    })
+    progress_messages.append(assistant_message("📅 Scheduling:\n📱 Post 1: Facebook at 2:00 PM\n📸 Post 2: Instagram at 2:05 PM", type="schedule_info"))
     
     # Step 3: Performance monitoring promise
-    progress_messages.append({
-        "role": "assistant",
-        "content": "I'll monitor performance and optimize based on engagement! 📊",
-        "timestamp": "2024-01-01T00:00:00Z",
-        "metadata": {"type": "monitoring_promise"}
-    })
+    progress_messages.append(assistant_message("I'll monitor performance and optimize based on engagement! 📊", type="monitoring_promise"))
     
     # Step 4: Final success message (mobile-optimized)
-    progress_messages.append({
-        "role": "assistant",
-        "content": f"All set! {business_name} is ready to shine on social media! ✨",
-        "timestamp": "2024-01-01T00:00:00Z",
-        "metadata": {"type": "final_success"}
-    })
+    progress_messages.append(assistant_message(f"All set! {business_name} is ready to shine on social media! ✨", type="final_success"))
     
     # Step 5: Next steps call-to-action
-    progress_messages.append({
-        "role": "assistant",
-        "content": "Ready to get started with your full social media strategy? 🎯",
-        "timestamp": "2024-01-01T00:00:00Z",
-        "metadata": {"type": "cta"}
-    })
+    progress_messages.append(assistant_message("Ready to get started with your full social media strategy? 🎯", type="cta"))
     
     return {
-        **state,
-        "messages": messages + progress_messages,
-        "current_step": "completed",
+        "messages": progress_messages,
+        "current_step": step_after("completion"),
         "user_data": {
-            **user_data,
-            "completion_processed": True,
-            "workflow_completed": True,
             "completion_time": "2024-01-01T00:00:00Z"
         },
+        "milestones": reached(COMPLETED),
         "next_actions": [
             {
                 "id": "start_trial",
@@ -594,121 +635,204 @@ def completion_node(state: NetaState, config: RunnableConfig) -> NetaState:
         ]
     }
 
-def route_next_step(state: NetaState) -> Literal["greeting", "social_discovery", "content_analysis", "content_creation", "completion", END]:
-    """Router function to determine next step"""
-    
-    current_step = state.get("current_step", "greeting")
-    business_name = state.get("business_name", "")
-    user_data = state.get("user_data", {})
-    
-    # Greeting phase - auto-progress when business name provided
-    if current_step == "greeting":
-        if business_name:
-            return "social_discovery"  # ✅ Auto-progress to discovery
-        return END  # Wait for user input
-    
-    # Social discovery phase - run automatically first time, then wait
-    elif current_step == "social_discovery":
-        if not user_data.get("social_search_completed"):
-            return "social_discovery"  # ✅ Execute the discovery node
-        else:
-            return END  # Discovery done, wait for user confirmation
-    
-    # After user confirms accounts (transition from social discovery)
-    elif current_step == "confirm_accounts":
-        return "content_analysis"
+async def acompletion_node(state: NetaState, config: RunnableConfig) -> Dict[str, Any]:
+    """Async completion - no I/O, shares the sync implementation"""
+    return completion_node(state, config)
+
+def _await_decision(state: NetaState, config: RunnableConfig, step: str) -> Dict[str, Any]:
+    """Pause the run until the user answers the ``step`` question, then move on to the next step.
+
+    The thread is resumed with ``Command(resume=...)`` carrying the chosen
+    next_actions id, or ``{"action": id, "messages": [...]}`` to also add the
+    user's messages. Without a checkpointer the run simply ends here and the
+    client re-enters with ``current_step`` set to ``step``.
+    """
+    decision = interrupt({"step": step, "next_actions": state.get("next_actions", [])})
+    if not isinstance(decision, dict):
+        decision = {"action": decision}
+    
+    decisions = {**state.get("user_data", {}).get("decisions", {}), step: decision.get("action")}
+    update = {
+        "current_step": step_after(step),
+        "user_data": {"decisions": decisions},
+        "messages": list(decision.get("messages", []))
+    }
     
-    # Content analysis phase - run automatically first time
-    elif current_step == "content_analysis":
-        if not user_data.get("content_analysis_completed"):
-            return "content_analysis"  # ✅ Execute the analysis node
-        else:
-            return END  # Analysis done, wait for strategy approval
-        
-    # After strategy approval
-    elif current_step == "strategy_approval":
-        return "content_creation"
-    
-    # Content creation phase - run automatically first time
-    elif current_step == "content_creation":
-        if not user_data.get("content_creation_completed"):
-            return "content_creation"  # ✅ Execute the creation node
-        else:
-            return END  # Creation done, wait for content approval
-        
-    # After content approval
-    elif current_step == "content_approval":
-        return "completion"
-        
-    # Final state
-    elif current_step == "completed":
-        return END
-        
-    # Default fallback
-    else:
-        return END
+    # Resumed turns skip the history node, so apply the window here
+    history = history_node(state, config)
+    if history:
+        update["messages"] = history.pop("messages", []) + update["messages"]
+        update.update(history)
+    return update
+
+def confirm_accounts_node(state: NetaState, config: RunnableConfig) -> Dict[str, Any]:
+    """Wait for the user to confirm the discovered accounts"""
+    return _await_decision(state, config, "confirm_accounts")
+
+def strategy_approval_node(state: NetaState, config: RunnableConfig) -> Dict[str, Any]:
+    """Wait for the user to approve the content strategy"""
+    return _await_decision(state, config, "strategy_approval")
+
+def content_approval_node(state: NetaState, config: RunnableConfig) -> Dict[str, Any]:
+    """Wait for the user to approve the generated content"""
+    return _await_decision(state, config, "content_approval")
+
+def route_next_step(state: NetaState) -> str:
+    """Where a run that starts at START picks up - new threads, and clients re-entering
+    with ``current_step`` instead of resuming a checkpointed thread (see transitions.py)"""
+    return next_node(state)
 
 # Build the workflow graph
 builder = StateGraph(NetaState)
 
-# Add nodes
-builder.add_node("greeting", greeting_node)
-builder.add_node("social_discovery", social_discovery_node)
-builder.add_node("content_analysis", content_analysis_node)
-builder.add_node("content_creation", content_creation_node)
-builder.add_node("completion", completion_node)
-
-# Add edges
-builder.add_edge(START, "greeting")
-builder.add_conditional_edges(
-    "greeting",
-    route_next_step,
-    {
-        "social_discovery": "social_discovery",
-        END: END
-    }
-)
-builder.add_conditional_edges(
-    "social_discovery", 
-    route_next_step,
-    {
-        "social_discovery": "social_discovery",  # Allow re-running discovery
-        "content_analysis": "content_analysis",
-        END: END
-    }
-)
-builder.add_conditional_edges(
-    "content_analysis",
-    route_next_step,
-    {
-        "content_analysis": "content_analysis",  # Allow re-running analysis
-        "content_creation": "content_creation",
-        END: END
-    }
-)
-builder.add_conditional_edges(
-    "content_creation",
-    route_next_step,
-    {
-        "content_creation": "content_creation",  # Allow re-running creation
-        "completion": "completion",
-        END: END
-    }
-)
-builder.add_conditional_edges(
-    "completion",
-    route_next_step,
-    {
-        END: END
-    }
-)
+# Add nodes - each has a sync and an async implementation, so app.invoke keeps
+# working while app.ainvoke / app.astream never block the event loop on I/O
+builder.add_node("history", RunnableLambda(history_node, afunc=ahistory_node))
+builder.add_node("greeting", RunnableLambda(greeting_node, afunc=agreeting_node))
+builder.add_node("social_discovery", RunnableLambda(social_discovery_node, afunc=asocial_discovery_node))
+builder.add_node("content_analysis", RunnableLambda(content_analysis_node, afunc=acontent_analysis_node))
+builder.add_node("content_creation", RunnableLambda(content_creation_node, afunc=acontent_creation_node))
+builder.add_node("completion", RunnableLambda(completion_node, afunc=acompletion_node))
+
+# Decision points - no I/O, the run pauses in them until the user answers
+builder.add_node("confirm_accounts", confirm_accounts_node)
+builder.add_node("strategy_approval", strategy_approval_node)
+builder.add_node("content_approval", content_approval_node)
+
+# Add edges - new threads and re-entering clients start at START and are routed
+# to their step; checkpointed threads resume straight from the pending decision
+builder.add_edge(START, "history")
+builder.add_edge("history", "greeting")
+builder.add_conditional_edges("greeting", route_next_step, route_targets())
+for source, target in edges():
+    builder.add_edge(source, target)
 
-# Compile the graph - this creates the app that LangGraph Cloud will use
-app = builder.compile()
+# Compile the graph - this creates the app that LangGraph Cloud will use.
+# LangGraph Cloud supplies its own checkpointer; local runs can pick one with
+# NETA_CHECKPOINTER or NETA_GRAPH_CONFIG (see checkpointers.py)
+app = builder.compile(checkpointer=checkpointer_from_env())
 
 # For LangGraph Cloud, the app itself is the entry point
 # The input will be passed directly to the compiled graph
 
+# Local entry points - map the graph result to the API response
+
+# State a client may send for a checkpointed thread; history_offset is kept by
+# the thread itself, so an echoed value cannot rewind or inflate it
+CLIENT_FIELDS = tuple(key for key in NetaState.__annotations__ if key not in ("history_offset", "session_id"))
+
+def _unseen_messages(input_data: Dict[str, Any], stored: Dict[str, Any]) -> List[Any]:
+    """Messages in a full client-held history that the checkpointed thread does not have yet"""
+    messages = input_data.get("messages") or []
+    stored_count = (stored.get("history_offset") or 0) + len(stored.get("messages") or [])
+    unseen = (input_data.get("history_offset") or 0) + len(messages) - stored_count
+    return messages[-unseen:] if unseen > 0 else []
+
+def _run_input(input_data: Dict[str, Any], thread_id: Optional[str]) -> tuple:
+    """Graph input, run config and the state the client already has for one user turn.
+
+    With a checkpointer and a ``thread_id``, a thread paused at a decision
+    point is resumed with the turn's ``action`` (a next_actions id) and
+    messages; otherwise ``input_data`` is the full client-held state. A
+    stateless run whose ``session_id`` names a checkpointed thread continues
+    that thread with only the messages it has not stored yet.
+    """
+    full_state = False
+    if app.checkpointer is not None and not thread_id and input_data.get("session_id"):
+        if app.get_state({"configurable": {"thread_id": input_data["session_id"]}}).values:
+            thread_id, full_state = input_data["session_id"], True
+    
+    if app.checkpointer is not None and thread_id:
+        config = {"configurable": {"thread_id": thread_id}}
+        snapshot = app.get_state(config)
+        messages = _unseen_messages(input_data, snapshot.values) if full_state else input_data.get("messages", [])
+        if any(task.interrupts for task in snapshot.tasks):
+            # Paused at a decision point - continue from there with the user's answer
+            decision = {"action": input_data.get("action"), "messages": messages}
+            return Command(resume=decision), config, snapshot.values
+        payload = {key: value for key, value in input_data.items() if key in CLIENT_FIELDS}
+        payload["messages"] = messages
+        payload["session_id"] = thread_id
+        return payload, config, snapshot.values
+    
+    initial_state = NetaState(
+        business_name=input_data.get("business_name", ""),
+        messages=input_data.get("messages", []),
+        current_step=input_data.get("current_step", "greeting"),
+        user_data=input_data.get("user_data", {}),
+        milestones=input_data.get("milestones", {}),
+        history_summary=input_data.get("history_summary", ""),
+        history_offset=input_data.get("history_offset", 0),
+        social_accounts=input_data.get("social_accounts", []),
+        next_actions=input_data.get("next_actions", []),
+        session_id=input_data.get("session_id") or str(uuid.uuid4())
+    )
+    # A one-off thread: client-held state must not be appended to a checkpoint under its session_id
+    return initial_state, {"configurable": {"thread_id": str(uuid.uuid4())}}, input_data
+
+def _workflow_output(previous: Dict[str, Any], result: Dict[str, Any], since: Optional[Union[int, str]]) -> Dict[str, Any]:
+    output = {
+        "messages": result["messages"],
+        "current_step": result["current_step"],
+        "user_data": result.get("user_data", {}),
+        "milestones": result.get("milestones", {}),
+        "social_accounts": result.get("social_accounts", []),
+        "next_actions": result.get("next_actions", []),
+        "history_summary": result.get("history_summary", ""),
+        "history_offset": result.get("history_offset", 0),
+        # Send back as session_id on the next stateless run to keep the history summary
+        "session_id": result.get("session_id", "")
+    }
+    return run_output(previous, output, since)
+
+def invoke_workflow(input_data: Dict[str, Any], since: Optional[Union[int, str]] = None,
+                    thread_id: Optional[str] = None) -> Dict[str, Any]:
+    """Run one user turn; with a ``since`` cursor only new messages and changed fields are returned"""
+    
+    payload, config, previous = _run_input(input_data, thread_id)
+    
+    # Run the workflow
+    result = app.invoke(payload, config)
+    return _workflow_output(previous, result, since)
+
+def stream_workflow(input_data: Dict[str, Any], since: Optional[Union[int, str]] = None,
+                    thread_id: Optional[str] = None) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """Run one user turn, yielding ``(event, data)`` pairs as the graph produces them.
+
+    Events are ``message`` (one chat message), ``message_delta`` (an analysis
+    token), ``state`` (fields a node changed), ``interrupt`` (the run paused
+    for a decision) and finally ``end`` with the same output as
+    ``invoke_workflow``. Messages pushed while a node runs are not repeated
+    when its update arrives.
+    """
+    
+    payload, config, previous = _run_input(input_data, thread_id)
+    pushed = []
+    result = None
+    for mode, chunk in app.stream(payload, config, stream_mode=["custom", "updates", "values"]):
+        if mode == "values":
+            result = chunk
+        elif mode == "custom":
+            if chunk.get("type") == "message":
+                pushed.append(chunk["message"])
+                yield "message", chunk["message"]
+            else:
+                yield chunk.get("type", "custom"), chunk
+        else:
+            for node, update in chunk.items():
+                if node == "__interrupt__":
+                    yield "interrupt", {"value": [item.value for item in update]}
+                    continue
+                for message in message_dicts(m for m in (update or {}).get("messages", []) if isinstance(m, (Message, dict))):
+                    if message in pushed:
+                        pushed.remove(message)
+                    else:
+                        yield "message", message
+                fields = {key: value for key, value in (update or {}).items() if key != "messages"}
+                if fields:
+                    yield "state", {"node": node, **fields}
+    yield "end", _workflow_output(previous, result, since)
+
 if __name__ == "__main__":
     # Test the workflow locally
     test_input = {
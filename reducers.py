@@ -0,0 +1,56 @@
+"""
+State reducers for the Neta workflow
+Nodes return only what changed; these merge each partial update into the graph state
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+@dataclass(frozen=True)
+class HistoryTrim:
+    """Leading marker in a messages update: drop the ``count`` oldest messages first"""
+    count: int
+
+def append_messages(left: Optional[List[Dict[str, Any]]], right: Optional[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """Append a node's new messages to the conversation history.
+
+    ``left`` is never extended in place: LangGraph hands the same list to the
+    checkpointer (serialized in the background) and to ``values`` streams, so
+    each merge builds one new list. Its cost follows the messages kept in
+    state, which ``history.HISTORY_WINDOW`` bounds.
+    """
+    if right and isinstance(right[0], HistoryTrim):
+        # The slice is already a fresh list, so extend it instead of copying it again
+        merged = (left or [])[right[0].count:]
+        merged.extend(right[1:])
+        return merged
+    if not right:
+        return left if left is not None else []
+    if not left:
+        return list(right)
+    return left + right
+
+def merge_dicts(left: Optional[Dict[str, Any]], right: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Merge a node's changed keys (user_data, milestones) over the existing ones"""
+    if not right:
+        return left if left is not None else {}
+    if not left:
+        return dict(right)
+    return {**left, **right}
+
+# Channels that merge updates instead of replacing them
+REDUCERS = {
+    "messages": append_messages,
+    "user_data": merge_dicts,
+    "milestones": merge_dicts
+}
+
+def apply_update(state: Dict[str, Any], update: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Apply a node's partial update outside the graph (bulk jobs, benchmarks)"""
+    if not update:
+        return state
+    merged = dict(state)
+    for key, value in update.items():
+        reducer = REDUCERS.get(key)
+        merged[key] = reducer(state.get(key), value) if reducer else value
+    return merged
@@ -6,7 +6,12 @@ Just the core conversation logic
 
 import json
 from datetime import datetime
-from typing import Dict, Any, List
+from typing import Dict, Any, Iterator, List, Tuple
+
+from neta_logging import get_logger
+from transitions import next_node, step_after
+
+log = get_logger("simple")
 
 def invoke_workflow(input_data: Dict[str, Any]) -> Dict[str, Any]:
     """
@@ -20,19 +25,26 @@ def invoke_workflow(input_data: Dict[str, Any]) -> Dict[str, Any]:
     current_step = input_data.get("current_step", "greeting")
     user_data = input_data.get("user_data", {})
     
-    print(f"🤖 Neta processing: {business_name} at step {current_step}")
+    log.debug("🤖 Neta processing", business_name=business_name, step=current_step)
     
-    # Conversation logic based on current step
-    if current_step == "greeting" or not business_name:
+    # Same transition table as the LangGraph workflow (transitions.py)
+    if not business_name:
         return greeting_response()
-    elif current_step == "social_discovery":
-        return social_discovery_response(business_name)
-    elif current_step == "content_analysis":
-        return content_analysis_response(business_name)
-    elif current_step == "content_creation":
-        return content_creation_response(business_name)
-    else:
+    respond = RESPONSES.get(next_node({**input_data, "current_step": current_step}))
+    if respond is None:
+        # Nothing left to run at this step
         return completion_response(business_name)
+    return respond(business_name)
+
+def stream_workflow(input_data: Dict[str, Any]) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Same events as the LangGraph workflow's stream_workflow
+    The simple engine has no slow steps, so the messages are sent right before the end event
+    """
+    result = invoke_workflow(input_data)
+    for message in result["messages"]:
+        yield "message", message
+    yield "end", result
 
 def greeting_response():
     """Initial greeting"""
@@ -44,7 +56,7 @@ def greeting_response():
                 "timestamp": datetime.now().isoformat()
             }
         ],
-        "current_step": "collect_business_name",
+        "current_step": "greeting",
         "user_data": {},
         "social_accounts": [],
         "next_actions": [
@@ -81,7 +93,7 @@ def social_discovery_response(business_name: str):
                 "timestamp": datetime.now().isoformat()
             }
         ],
-        "current_step": "content_analysis",
+        "current_step": step_after("social_discovery"),
         "user_data": {},
         "social_accounts": discovered_accounts,
         "next_actions": [
@@ -103,7 +115,7 @@ def content_analysis_response(business_name: str):
                 "timestamp": datetime.now().isoformat()
             }
         ],
-        "current_step": "content_creation",
+        "current_step": step_after("content_analysis"),
         "user_data": {
             "content_themes": ["product_photography", "behind_the_scenes", "customer_spotlights"],
             "engagement_patterns": {"photos": "2x", "behind_scenes": "trending"}
@@ -128,7 +140,7 @@ def content_creation_response(business_name: str):
                 "timestamp": datetime.now().isoformat()
             }
         ],
-        "current_step": "completion",
+        "current_step": step_after("content_creation"),
         "user_data": {
             "generated_content": [
                 {
@@ -158,12 +170,20 @@ def completion_response(business_name: str):
                 "timestamp": datetime.now().isoformat()
             }
         ],
-        "current_step": "completed",
+        "current_step": step_after("completion"),
         "user_data": {},
         "social_accounts": [],
         "next_actions": []
     }
 
+# Response for each node the transition table can route to
+RESPONSES = {
+    "social_discovery": social_discovery_response,
+    "content_analysis": content_analysis_response,
+    "content_creation": content_creation_response,
+    "completion": completion_response
+}
+
 if __name__ == "__main__":
     # Test the workflow
     test_input = {
@@ -5,110 +5,581 @@ No PostgreSQL or Redis required - uses in-memory storage
 Completely FREE and self-contained
 """
 
-from http.server import HTTPServer, BaseHTTPRequestHandler
+from collections import Counter, deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, TimeoutError as RunTimeout, wait
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Any, Dict, List, Optional
+import gzip
 import json
+import math
+import os
+import sys
+import threading
 import urllib.parse
-from simple_neta import invoke_workflow
+from admission import RateLimiter, WaitStats, retry_after_header, tenant_key, tenant_label
+from circuit_breaker import breaker_stats
+from deltas import delta_response
+from discovery import discovery_cache
+from llm_cache import analysis_cache
+from neta_logging import get_logger, log_stats
+from simple_neta import invoke_workflow, stream_workflow as stream_simple
+from singleflight import singleflight_stats
+import queue
+import time
 import traceback
+import zlib
+
+log = get_logger("server")
+
+# Faster JSON encoding when orjson is installed (pip install orjson)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Workflow runs executing at once
+WORKERS = int(os.getenv("NETA_SERVER_WORKERS", "8"))
+# Runs allowed to wait for a worker before new ones get 429
+QUEUE_DEPTH = int(os.getenv("NETA_SERVER_QUEUE", "32"))
+# Seconds a client waits for its run before getting 504
+REQUEST_TIMEOUT = float(os.getenv("NETA_SERVER_TIMEOUT", "60"))
+# Workflow behind the endpoints: "simple" (simple_neta) or "graph" (the LangGraph app)
+ENGINE = os.getenv("NETA_ENGINE", "simple")
+
+# Most runs accepted in one /runs/batch request
+BATCH_MAX_ITEMS = int(os.getenv("NETA_BATCH_MAX_ITEMS", "100"))
+# Runs of one batch executing at once, so a batch cannot take every worker
+BATCH_CONCURRENCY = int(os.getenv("NETA_BATCH_CONCURRENCY", "4"))
+# Responses smaller than this are sent uncompressed
+COMPRESS_MIN_BYTES = int(os.getenv("NETA_COMPRESS_MIN_BYTES", "1024"))
+# Seconds a keep-alive connection may sit idle (or stall mid-request) before it is closed
+KEEPALIVE_TIMEOUT = float(os.getenv("NETA_KEEPALIVE_TIMEOUT", "15"))
+
+CORS_HEADERS = {
+    'Access-Control-Allow-Origin': '*',
+    'Access-Control-Allow-Methods': 'POST, OPTIONS',
+    'Access-Control-Allow-Headers': 'Content-Type, Authorization, X-Api-Key'
+}
+
+RUN_PATHS = ('/runs', '/threads/test/runs')
+STREAM_PATHS = ('/runs/stream', '/threads/test/runs/stream')
+BATCH_PATH = '/runs/batch'
+
+def encode_json(body) -> bytes:
+    """Encode ``body`` to UTF-8 JSON bytes in one pass"""
+    if orjson is not None:
+        return orjson.dumps(body)
+    return json.dumps(body).encode('utf-8')
+
+def decode_json(data: bytes):
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data.decode('utf-8'))
+
+def choose_encoding(accept_encoding: str):
+    """``gzip`` or ``deflate`` if the client accepts it (gzip preferred), else None"""
+    accepted = set()
+    for part in (accept_encoding or '').split(','):
+        coding, _, params = part.partition(';')
+        quality = params.replace(' ', '')
+        try:
+            if quality.startswith('q=') and float(quality[2:]) == 0:
+                continue
+        except ValueError:
+            continue
+        accepted.add(coding.strip().lower())
+    for coding in ('gzip', 'deflate'):
+        if coding in accepted or '*' in accepted:
+            return coding
+    return None
+
+def compress(payload: bytes, coding: str) -> bytes:
+    if coding == 'gzip':
+        return gzip.compress(payload, compresslevel=6)
+    return zlib.compress(payload, 6)
+
+def _simple_delta(input_data, result, since):
+    """Only what the client has not seen yet - simple_neta returns just the new messages"""
+    conversation = input_data.get('messages', []) + result.get('messages', [])
+    return delta_response(input_data, {**result, 'messages': conversation}, since)
+
+def run_workflow(input_data, since=None, thread_id=None):
+    """Run one turn on the configured engine"""
+    if ENGINE == "graph":
+        from neta_social_assistant import invoke_workflow as invoke_graph
+        return invoke_graph(input_data, since, thread_id)
+    result = invoke_workflow(input_data)
+    if since is not None:
+        result = _simple_delta(input_data, result, since)
+    return result
+
+def stream_workflow(input_data, since=None, thread_id=None):
+    """Run one turn on the configured engine, yielding ``(event, data)`` as it progresses"""
+    if ENGINE == "graph":
+        from neta_social_assistant import stream_workflow as stream_graph
+        yield from stream_graph(input_data, since, thread_id)
+        return
+    for event, data in stream_simple(input_data):
+        if event == "end" and since is not None:
+            data = _simple_delta(input_data, data, since)
+        yield event, data
+
+def cache_stats():
+    """Hit/miss counters of the shared caches; the history summarizer only once the graph engine is loaded"""
+    caches = {
+        "discovery": discovery_cache.stats(),
+        "analysis": analysis_cache.stats()
+    }
+    workflow = sys.modules.get("neta_social_assistant")
+    if workflow is not None:
+        caches["history"] = workflow.history_summarizer.stats()
+    return caches
+
+class RunQueueFull(RuntimeError):
+    """Every worker is busy and the run queue is full"""
+
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+class RunPool:
+    """Bounded worker pool for workflow runs.
+
+    Connections are served on their own threads, so ``/health`` and other
+    cheap requests never wait behind a slow run; the runs themselves share
+    ``workers`` threads and at most ``queue_depth`` more may wait for one.
+    A run that times out keeps its slot until it actually finishes, so a
+    stuck upstream shows up as backpressure instead of piling up threads.
+    Time spent waiting for a worker and running is recorded for ``stats``
+    and for the Retry-After estimate given to rejected clients.
+    """
+
+    def __init__(self, workers: int = WORKERS, queue_depth: int = QUEUE_DEPTH):
+        self.workers = workers
+        self.queue_depth = queue_depth
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="neta-run")
+        self._slots = threading.BoundedSemaphore(workers + queue_depth)
+        self._lock = threading.Lock()
+        self.queued = 0
+        self.running = 0
+        self.rejected = 0
+        self.queue_wait = WaitStats()
+        self.run_time = WaitStats()
+
+    def submit(self, fn, *args, **kwargs) -> Future:
+        """Schedule ``fn``; raises ``RunQueueFull`` instead of queueing without bound"""
+        if not self._slots.acquire(blocking=False):
+            self.rejected += 1
+            raise RunQueueFull(f"all {self.workers} workers busy and {self.queue_depth} runs queued",
+                               self.retry_after())
+        submitted = time.monotonic()
+        
+        def timed():
+            started = time.monotonic()
+            self.queue_wait.record(started - submitted)
+            with self._lock:
+                self.queued -= 1
+                self.running += 1
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self.run_time.record(time.monotonic() - started)
+                with self._lock:
+                    self.running -= 1
+        
+        with self._lock:
+            self.queued += 1
+        try:
+            future = self._executor.submit(timed)
+        except BaseException:
+            with self._lock:
+                self.queued -= 1
+            self._slots.release()
+            raise
+        future.add_done_callback(self._finished)
+        return future
+
+    def _finished(self, future: Future):
+        if future.cancelled():
+            with self._lock:
+                self.queued -= 1
+        self._slots.release()
+
+    def retry_after(self) -> float:
+        """Seconds until the queue has likely drained enough to take another run"""
+        return self.run_time.mean() * (self.queued + 1) / self.workers
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "queue_depth": self.queue_depth,
+            "running": self.running,
+            "queued": self.queued,
+            "rejected": self.rejected,
+            "queue_wait": self.queue_wait.snapshot(),
+            "run_time": self.run_time.snapshot()
+        }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+def batch_request(request_data):
+    """``(runs, stream)`` from a /runs/batch body; runs is None when the body is not a batch"""
+    if isinstance(request_data, list):
+        return request_data, False
+    if isinstance(request_data, dict) and isinstance(request_data.get('runs'), list):
+        return request_data['runs'], bool(request_data.get('stream'))
+    return None, False
+
+def run_batch(runs: RunPool, items, concurrency: int, timeout: float):
+    """Run every item of a batch on ``runs``, yielding ``(index, result)`` as each one finishes.
+
+    At most ``concurrency`` items are in flight at once. When the pool is
+    full the batch waits for one of its own runs instead of failing, unless
+    it has none in flight. Items still unfinished after ``timeout`` seconds
+    get a timeout error.
+    """
+    deadline = time.monotonic() + timeout
+    pending = deque(enumerate(items))
+    in_flight = {}
+    while pending or in_flight:
+        while pending and len(in_flight) < concurrency:
+            index, item = pending[0]
+            if not isinstance(item, dict):
+                pending.popleft()
+                yield index, {"status": "error", "error": "Batch items must be objects with an input"}
+                continue
+            try:
+                future = runs.submit(run_workflow, item.get('input', {}), item.get('since'), item.get('thread_id'))
+            except RunQueueFull:
+                if in_flight:
+                    break
+                pending.popleft()
+                yield index, {"status": "error", "error": "Server busy, retry later"}
+                continue
+            pending.popleft()
+            in_flight[future] = index
+        if not in_flight:
+            continue
+        
+        done, _ = wait(in_flight, timeout=max(deadline - time.monotonic(), 0), return_when=FIRST_COMPLETED)
+        if not done:
+            error = {"status": "error", "error": f"Run did not finish within {timeout}s"}
+            for index in list(in_flight.values()) + [index for index, _ in pending]:
+                yield index, error
+            return
+        for future in done:
+            index = in_flight.pop(future)
+            try:
+                yield index, {"status": "completed", "output": future.result()}
+            except Exception as e:
+                yield index, {"status": "error", "error": str(e)}
+
+class NetaServer(ThreadingHTTPServer):
+    """Threaded HTTP server that hands workflow runs to a ``RunPool``"""
+
+    daemon_threads = True
+    request_queue_size = 128
+
+    def __init__(self, server_address, handler_class, workers: int = WORKERS,
+                 queue_depth: int = QUEUE_DEPTH, request_timeout: float = REQUEST_TIMEOUT):
+        super().__init__(server_address, handler_class)
+        self.runs = RunPool(workers, queue_depth)
+        self.limiter = RateLimiter()
+        self.request_timeout = request_timeout
+
+    def server_close(self):
+        super().server_close()
+        self.runs.shutdown()
 
 class NetaHandler(BaseHTTPRequestHandler):
+    # Keep connections open between requests; every response carries a Content-Length
+    protocol_version = 'HTTP/1.1'
+    # Socket timeout, so an idle keep-alive client does not hold its thread forever
+    timeout = KEEPALIVE_TIMEOUT
+    
+    def send_json(self, status: int, body, cors: bool = True, headers: Optional[Dict[str, str]] = None) -> int:
+        """Send ``body`` as JSON, compressed when the client accepts it; returns the bytes sent"""
+        payload = encode_json(body)
+        coding = choose_encoding(self.headers.get('Accept-Encoding')) if len(payload) >= COMPRESS_MIN_BYTES else None
+        if coding:
+            payload = compress(payload, coding)
+        
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        if coding:
+            self.send_header('Content-Encoding', coding)
+            self.send_header('Vary', 'Accept-Encoding')
+        if cors:
+            for name, value in CORS_HEADERS.items():
+                self.send_header(name, value)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+        return len(payload)
+    
+    def send_busy(self, retry_after: float, detail: str):
+        """429 with a Retry-After hint"""
+        self.send_json(429, {"detail": detail, "retry_after": float(retry_after_header(retry_after))},
+                       headers={'Retry-After': retry_after_header(retry_after)})
+    
+    def admit(self, path: str, inputs: List[Any]) -> bool:
+        """Charge one run per input to its tenant's token bucket; sends 429 (or 413 for more
+        runs than a tenant's burst) and returns False when over the limit"""
+        costs = Counter(tenant_key(self.headers, input_data, self.client_address[0]) for input_data in inputs)
+        tenant, wait = self.server.limiter.check_all(costs)
+        if wait == math.inf:
+            log.warning("🚦 Batch over the rate-limit burst", route=path, tenant=tenant_label(tenant), runs=costs[tenant])
+            self.send_json(413, {"detail": f"At most {self.server.limiter.burst:g} runs per tenant in one request"})
+            return False
+        if wait:
+            log.warning("🚦 Rate limited", route=path, tenant=tenant_label(tenant), retry_after_s=round(wait, 2))
+            self.send_busy(wait, "Rate limit exceeded, retry later")
+            return False
+        return True
+    
     def do_POST(self):
         """Handle POST requests to execute workflow"""
         try:
             # Parse the request path
             path = urllib.parse.urlparse(self.path).path
             
-            if path == '/threads/test/runs' or path == '/runs':
-                # Read request body
-                content_length = int(self.headers['Content-Length'])
-                post_data = self.rfile.read(content_length)
-                request_data = json.loads(post_data.decode('utf-8'))
+            # Read the body even for unknown paths so the connection can be reused
+            content_length = int(self.headers.get('Content-Length') or 0)
+            post_data = self.rfile.read(content_length)
+            
+            if path == BATCH_PATH:
+                items, stream = batch_request(decode_json(post_data))
+                # Reject malformed and oversized batches before they are charged to the tenant
+                if items is None:
+                    self.send_json(400, {"detail": "Expected a list of runs, or {\"runs\": [...]}"})
+                    return
+                if len(items) > BATCH_MAX_ITEMS:
+                    self.send_json(413, {"detail": f"At most {BATCH_MAX_ITEMS} runs per batch"})
+                    return
+                # Each run is charged to its own tenant, e.g. its business when there is no API key
+                if self.admit(path, [item.get('input') if isinstance(item, dict) else None for item in items]):
+                    self.batch_runs(items, stream)
+                
+            elif path in RUN_PATHS or path in STREAM_PATHS:
+                request_data = decode_json(post_data)
                 
                 # Extract input
                 input_data = request_data.get('input', {})
                 assistant_id = request_data.get('assistant_id', '')
+                since = request_data.get('since')  # Cursor from the previous response, if any
+                thread_id = request_data.get('thread_id')  # Checkpointed thread (graph engine)
+                
+                log.info("🚀 Received request", route=path, assistant_id=assistant_id, input=input_data)
+                if not self.admit(path, [input_data]):
+                    return
                 
-                print(f"🚀 Received request for assistant: {assistant_id}")
-                print(f"📤 Input: {input_data}")
+                if path in STREAM_PATHS:
+                    self.stream_run(input_data, since, thread_id)
+                    return
                 
-                # Execute the workflow
-                result = invoke_workflow(input_data)
+                # Execute the workflow on the run pool
+                try:
+                    result = self.server.runs.submit(run_workflow, input_data, since, thread_id).result(timeout=self.server.request_timeout)
+                except RunQueueFull as e:
+                    log.warning("⏳ Run rejected", route=path, reason=str(e))
+                    self.send_busy(e.retry_after, "Server busy, retry later")
+                    return
+                except RunTimeout:
+                    log.warning("⏱️ Run timed out", route=path, timeout_s=self.server.request_timeout)
+                    self.send_json(504, {"detail": f"Run did not finish within {self.server.request_timeout}s"})
+                    return
                 
                 # Return the result
                 response = {
                     "status": "completed",
                     "output": result
                 }
+                sent = self.send_json(200, response)
                 
-                self.send_response(200)
-                self.send_header('Content-Type', 'application/json')
-                self.send_header('Access-Control-Allow-Origin', '*')
-                self.send_header('Access-Control-Allow-Methods', 'POST, OPTIONS')
-                self.send_header('Access-Control-Allow-Headers', 'Content-Type, Authorization, X-Api-Key')
-                self.end_headers()
-                
-                self.wfile.write(json.dumps(response).encode('utf-8'))
-                
-                print(f"✅ Response sent: {len(str(response))} characters")
+                log.info("✅ Response sent", route=path, bytes=sent)
                 
             else:
                 # Return 404 for unknown paths
-                self.send_response(404)
-                self.send_header('Content-Type', 'application/json')
-                self.end_headers()
-                self.wfile.write(json.dumps({"detail": "Not Found"}).encode('utf-8'))
+                self.send_json(404, {"detail": "Not Found"}, cors=False)
                 
         except Exception as e:
-            print(f"❌ Error processing request: {e}")
-            traceback.print_exc()
-            
-            self.send_response(500)
-            self.send_header('Content-Type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
+            log.exception("❌ Error processing request", route=self.path, error=str(e))
             
+            # The request may be half read or a response half written - don't reuse the connection
+            self.close_connection = True
             error_response = {
                 "error": str(e),
                 "traceback": traceback.format_exc()
             }
-            self.wfile.write(json.dumps(error_response).encode('utf-8'))
+            self.send_json(500, error_response)
+    
+    def stream_run(self, input_data, since, thread_id):
+        """Run on the pool and relay its events to the client as Server-Sent Events"""
+        events = queue.Queue()
+        
+        def produce():
+            try:
+                for event in stream_workflow(input_data, since, thread_id):
+                    events.put(event)
+            except Exception as e:
+                log.exception("❌ Error streaming run", route=self.path, error=str(e))
+                events.put(("error", {"error": str(e)}))
+            finally:
+                events.put(None)
+        
+        try:
+            self.server.runs.submit(produce)
+        except RunQueueFull as e:
+            log.warning("⏳ Run rejected", route=self.path, reason=str(e))
+            self.send_busy(e.retry_after, "Server busy, retry later")
+            return
+        
+        self.start_event_stream()
+        deadline = time.monotonic() + self.server.request_timeout
+        sent = 0
+        while True:
+            try:
+                item = events.get(timeout=max(deadline - time.monotonic(), 0))
+            except queue.Empty:
+                log.warning("⏱️ Stream timed out", route=self.path, timeout_s=self.server.request_timeout)
+                item = ("error", {"error": f"Run did not finish within {self.server.request_timeout}s"})
+            if item is None:
+                break
+            event, data = item
+            try:
+                self.send_event(event, data)
+            except (BrokenPipeError, ConnectionResetError):
+                # Client went away; the run finishes on the pool regardless
+                log.info("🔌 Stream client disconnected", route=self.path, events=sent)
+                return
+            sent += 1
+            if event == "error":
+                break
+        
+        log.info("✅ Stream sent", route=self.path, events=sent)
+    
+    def batch_runs(self, items, stream=False):
+        """Run many inputs in one request; results in input order, or streamed as they finish"""
+        log.info("📦 Received batch", route=BATCH_PATH, runs=len(items), stream=stream)
+        started = time.monotonic()
+        finished = run_batch(self.server.runs, items, BATCH_CONCURRENCY, self.server.request_timeout)
+        failed = 0
+        
+        if stream:
+            self.start_event_stream()
+            for index, result in finished:
+                failed += result["status"] != "completed"
+                try:
+                    self.send_event("result", {"index": index, **result})
+                except (BrokenPipeError, ConnectionResetError):
+                    # Client went away; runs already on the pool finish regardless
+                    log.info("🔌 Batch client disconnected", route=BATCH_PATH)
+                    finished.close()
+                    return
+            self.send_event("end", {"runs": len(items), "failed": failed})
+        else:
+            results = [None] * len(items)
+            for index, result in finished:
+                failed += result["status"] != "completed"
+                results[index] = {"index": index, **result}
+            self.send_json(200, {"status": "completed", "results": results})
+        
+        log.info("✅ Batch finished", route=BATCH_PATH, runs=len(items), failed=failed,
+                 ms=round((time.monotonic() - started) * 1000))
+    
+    def start_event_stream(self):
+        """Send the headers of a Server-Sent Events response"""
+        # The stream has no length up front, so it ends by closing the connection
+        self.close_connection = True
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Connection', 'close')
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.end_headers()
+    
+    def send_event(self, event: str, data):
+        self.wfile.write(b"event: " + event.encode('utf-8') + b"\ndata: " + encode_json(data) + b"\n\n")
+        self.wfile.flush()
+    
+    def log_message(self, format, *args):
+        """Access log lines go through the structured logger instead of stderr"""
+        log.debug(format % args, route=self.route(), client=self.address_string())
+    
+    def log_error(self, format, *args):
+        """Malformed requests and timeouts are worth seeing at the default level"""
+        log.warning(format % args, route=self.route(), client=self.address_string())
+    
+    def route(self) -> str:
+        # path is only set once the request line has been parsed
+        return urllib.parse.urlparse(getattr(self, 'path', '')).path
     
     def do_OPTIONS(self):
         """Handle preflight requests"""
         self.send_response(200)
-        self.send_header('Access-Control-Allow-Origin', '*')
-        self.send_header('Access-Control-Allow-Methods', 'POST, OPTIONS')
-        self.send_header('Access-Control-Allow-Headers', 'Content-Type, Authorization, X-Api-Key')
+        for name, value in CORS_HEADERS.items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', '0')
         self.end_headers()
     
     def do_GET(self):
         """Handle GET requests - health check"""
         if self.path == '/health':
-            self.send_response(200)
-            self.send_header('Content-Type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            
             health_response = {
                 "status": "healthy",
                 "service": "Neta Social Assistant",
                 "version": "1.0.0",
                 "assistant_id": "neta-social-assistant"
             }
-            self.wfile.write(json.dumps(health_response).encode('utf-8'))
+            self.send_json(200, health_response)
+        elif self.path == '/metrics':
+            metrics_response = {
+                "runs": self.server.runs.stats(),
+                "rate_limits": self.server.limiter.stats(),
+                "caches": cache_stats(),
+                "singleflight": singleflight_stats(),
+                "breakers": breaker_stats(),
+                "logging": log_stats()
+            }
+            self.send_json(200, metrics_response)
         else:
             self.send_response(404)
+            self.send_header('Content-Length', '0')
             self.end_headers()
 
-def start_server(port=2024):
+def warmup_clients():
+    """Create the LangGraph workflow's LLM/Tavily clients when it is the engine being served"""
+    if ENGINE != "graph":
+        return
+    try:
+        from neta_social_assistant import warmup
+    except ImportError:
+        return
+    log.info("🔥 Warmed up workflow clients", clients=warmup())
+
+def make_server(port=2024, workers=WORKERS, queue_depth=QUEUE_DEPTH, timeout=REQUEST_TIMEOUT):
+    """Bound, not yet serving, server; port 0 picks a free port"""
+    return NetaServer(('', port), NetaHandler, workers=workers, queue_depth=queue_depth, request_timeout=timeout)
+
+def start_server(port=2024, workers=WORKERS, queue_depth=QUEUE_DEPTH, timeout=REQUEST_TIMEOUT):
     """Start the simple HTTP server"""
-    server_address = ('', port)
-    httpd = HTTPServer(server_address, NetaHandler)
+    httpd = make_server(port, workers, queue_depth, timeout)
+    
+    # Pay client start-up cost once, after bind and before the first request
+    warmup_clients()
     
     print(f"🌟 Neta LangGraph Server starting on http://localhost:{port}")
     print(f"📋 Assistant ID: neta-social-assistant")
     print(f"🧪 Health check: http://localhost:{port}/health")
     print(f"📤 API endpoint: http://localhost:{port}/runs")
+    print(f"📡 Streaming endpoint: http://localhost:{port}/runs/stream")
+    print(f"📦 Batch endpoint: http://localhost:{port}/runs/batch")
+    print(f"⚙️ Engine: {ENGINE}")
+    print(f"👷 Workers: {workers}, queue depth: {queue_depth}, timeout: {timeout}s")
+    print(f"📈 Metrics: http://localhost:{port}/metrics")
     print("🔄 Press Ctrl+C to stop the server")
     print("=" * 60)
     
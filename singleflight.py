@@ -0,0 +1,146 @@
+"""
+Single-flight request coalescing for the Neta workflow
+Concurrent callers doing identical work share one upstream call instead of each making their own
+"""
+
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+import asyncio
+import threading
+
+class SingleFlightAborted(Exception):
+    """Raised to callers that were waiting on a call whose owner was cancelled"""
+
+class SingleFlight:
+    """Coalesces concurrent calls that share a key.
+
+    The first caller for a key runs the work; callers that arrive while it is in
+    flight wait for and share its result (or exception). Sync and async callers
+    can share the same in-flight call. Both ``do`` and ``ado`` return
+    ``(result, shared)`` where ``shared`` is True for coalesced callers.
+
+    Async work runs in its own task, so each waiter can bound its wait (e.g.
+    with ``asyncio.wait_for``) without cutting the call short for the others;
+    the task is only cancelled once every waiter has given up on it.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._calls: Dict[str, Future] = {}
+        self._waiters: Dict[str, int] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._lock = threading.Lock()
+        self.executed = 0
+        self.coalesced = 0
+        self.abandoned = 0
+
+    def _join(self, key: str) -> Tuple[Future, bool]:
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                self.coalesced += 1
+                self._waiters[key] += 1
+                return call, False
+            call = Future()
+            self._calls[key] = call
+            self._waiters[key] = 1
+            self.executed += 1
+            return call, True
+
+    def _leave(self, key: str, call: Future) -> Optional[asyncio.Task]:
+        """Drop one waiter of ``call``; returns its task when that was the last waiter"""
+        with self._lock:
+            if self._calls.get(key) is not call:
+                return None
+            self._waiters[key] -= 1
+            if self._waiters[key] > 0:
+                return None
+            self.abandoned += 1
+            return self._tasks.get(key)
+
+    def _finish(self, key: str):
+        with self._lock:
+            self._calls.pop(key, None)
+            self._waiters.pop(key, None)
+            self._tasks.pop(key, None)
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """Run ``fn`` unless an identical call is already in flight"""
+        call, leader = self._join(key)
+        if not leader:
+            try:
+                return call.result(), True
+            finally:
+                self._leave(key, call)
+        try:
+            result = fn()
+        except BaseException as e:
+            call.set_exception(e)
+            raise
+        finally:
+            self._finish(key)
+        call.set_result(result)
+        return result, False
+
+    async def ado(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """Async counterpart of ``do``; ``fn`` returns an awaitable.
+
+        Cancelling a caller (its own timeout, a client going away) only stops
+        that caller waiting; the shared call is cancelled when no caller is left.
+        """
+        call, leader = self._join(key)
+        if leader:
+            task = asyncio.ensure_future(self._run_shared(key, call, fn))
+            with self._lock:
+                if self._calls.get(key) is call:
+                    self._tasks[key] = task
+        try:
+            # Shield so a cancelled waiter does not cancel the shared call
+            return await asyncio.shield(asyncio.wrap_future(call)), not leader
+        except asyncio.CancelledError:
+            task = self._leave(key, call)
+            if task is not None:
+                task.get_loop().call_soon_threadsafe(task.cancel)
+            raise
+
+    async def _run_shared(self, key: str, call: Future, fn: Callable[[], Awaitable[Any]]):
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            self._finish(key)
+            call.set_exception(SingleFlightAborted(f"{self.name} call was cancelled"))
+            raise
+        except BaseException as e:
+            # Delivered to the waiters through ``call``
+            self._finish(key)
+            call.set_exception(e)
+            return
+        self._finish(key)
+        call.set_result(result)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "name": self.name,
+                "executed": self.executed,
+                "coalesced": self.coalesced,
+                "abandoned": self.abandoned,
+                "in_flight": len(self._calls)
+            }
+
+_flights: Dict[str, SingleFlight] = {}
+_flights_lock = threading.Lock()
+
+def get_flight(name: str) -> SingleFlight:
+    """Shared single-flight group for a kind of work"""
+    with _flights_lock:
+        flight = _flights.get(name)
+        if flight is None:
+            flight = _flights[name] = SingleFlight(name)
+        return flight
+
+def singleflight_stats() -> Dict[str, Dict[str, Any]]:
+    """How many calls every group executed and coalesced"""
+    with _flights_lock:
+        flights = list(_flights.values())
+    return {flight.name: flight.stats() for flight in flights}
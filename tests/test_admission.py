@@ -0,0 +1,10 @@
+from admission import tenant_key, tenant_label
+
+def test_api_keys_are_not_logged():
+    tenant = tenant_key({"Authorization": "Bearer sk-secret-token"}, None, "10.0.0.1")
+    label = tenant_label(tenant)
+    assert "sk-secret-token" not in label
+    assert label == tenant_label(tenant) and label.startswith("key:")
+
+def test_other_tenants_are_logged_as_is():
+    assert tenant_label(tenant_key({}, {"business_name": "Mike's Pizza"}, "10.0.0.1")) == "business:mike's pizza"
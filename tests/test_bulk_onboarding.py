@@ -0,0 +1,71 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+
+neta_social_assistant = pytest.importorskip("neta_social_assistant")
+import bulk_onboarding
+import discovery
+from circuit_breaker import CircuitBreaker
+
+class FakeSearch:
+    def invoke(self, query):
+        if "Instagram" in query:
+            return [{"url": "https://instagram.com/realbakery", "title": "@realbakery", "content": ""}]
+        return []
+
+class FakeLLM:
+    def stream(self, prompt, config=None):
+        yield SimpleNamespace(content="Post more bread.")
+
+class BrokenLLM:
+    def stream(self, prompt, config=None):
+        raise ConnectionError("OpenAI is down")
+
+def onboard(tmp_path, business_name):
+    source = tmp_path / "businesses.jsonl"
+    source.write_text(json.dumps({"id": "b1", "business_name": business_name}) + "\n")
+    output = tmp_path / "onboarded.jsonl"
+    bulk_onboarding.run_bulk_onboarding(str(source), str(output), progress_every=0)
+    checkpoint = (tmp_path / "onboarded.jsonl.checkpoint").read_text().split()
+    return json.loads(output.read_text().splitlines()[-1]), checkpoint
+
+class FailingSearch:
+    def invoke(self, query):
+        raise ConnectionError("Tavily is down")
+
+@pytest.fixture(autouse=True)
+def fresh_discovery(monkeypatch):
+    discovery.discovery_cache.clear()
+    # A breaker that stays closed, as it would after plenty of earlier successes
+    monkeypatch.setattr(discovery, "tavily_breaker", CircuitBreaker("tavily-bulk-test", minimum_calls=1000, negative_ttl=0.001))
+
+def test_real_results_are_checkpointed(tmp_path, monkeypatch):
+    monkeypatch.setattr(neta_social_assistant, "get_tavily_search", lambda: FakeSearch())
+    monkeypatch.setattr(neta_social_assistant, "_llm", FakeLLM())
+    result, checkpoint = onboard(tmp_path, "Real Bakery")
+    assert "error" not in result
+    assert checkpoint == ["b1"]
+
+def test_fallback_discovery_is_retried(tmp_path, monkeypatch):
+    monkeypatch.setattr(neta_social_assistant, "get_tavily_search", lambda: None)
+    monkeypatch.setattr(neta_social_assistant, "_llm", FakeLLM())
+    result, checkpoint = onboard(tmp_path, "Offline Bakery")
+    assert result["degraded"] == ["social_discovery"]
+    assert checkpoint == []
+
+def test_failed_searches_are_retried_while_the_breaker_is_closed(tmp_path, monkeypatch):
+    monkeypatch.setattr(neta_social_assistant, "get_tavily_search", lambda: FailingSearch())
+    monkeypatch.setattr(neta_social_assistant, "_llm", FakeLLM())
+    result, checkpoint = onboard(tmp_path, "Flaky Bakery")
+    assert discovery.tavily_breaker.state == "closed"
+    assert result["degraded"] == ["social_discovery"]
+    assert len(result["state"]["user_data"]["discovery_failed"]) == len(discovery.enabled_platforms())
+    assert checkpoint == []
+
+def test_fallback_analysis_is_retried(tmp_path, monkeypatch):
+    monkeypatch.setattr(neta_social_assistant, "get_tavily_search", lambda: FakeSearch())
+    monkeypatch.setattr(neta_social_assistant, "_llm", BrokenLLM())
+    result, checkpoint = onboard(tmp_path, "Quiet Bakery")
+    assert result["degraded"] == ["content_analysis"]
+    assert checkpoint == []
@@ -0,0 +1,116 @@
+import operator
+import time
+from typing import List
+
+import pytest
+
+pytest.importorskip("langgraph")
+from langgraph.graph import END, START, StateGraph
+from langgraph.types import Command, interrupt
+from typing_extensions import Annotated, TypedDict
+
+from checkpointers import BoundedMemorySaver, SQLiteSaver
+
+class CounterState(TypedDict):
+    count: int
+    log: Annotated[List[str], operator.add]
+
+def step(state: CounterState):
+    return {"count": state.get("count", 0) + 1, "log": [f"step {state.get('count', 0)}"]}
+
+def ask(state: CounterState):
+    answer = interrupt("continue?")
+    return {"log": [f"answer {answer}"]}
+
+def compile_graph(saver):
+    """step -> ask, where ask pauses for an answer"""
+    builder = StateGraph(CounterState)
+    builder.add_node("step", step)
+    builder.add_node("ask", ask)
+    builder.add_edge(START, "step")
+    builder.add_edge("step", "ask")
+    builder.add_edge("ask", END)
+    return builder.compile(checkpointer=saver)
+
+def turn(graph, thread_id: str, answer: str):
+    config = {"configurable": {"thread_id": thread_id}}
+    graph.invoke({"log": []}, config)
+    return graph.invoke(Command(resume=answer), config)
+
+def rows(saver, table: str, thread_id: str) -> int:
+    return saver._conn.execute(f"SELECT COUNT(*) FROM {table} WHERE thread_id = ?", (thread_id,)).fetchone()[0]
+
+def test_sqlite_pruning_keeps_threads_resumable(tmp_path):
+    saver = SQLiteSaver(str(tmp_path / "checkpoints.db"), keep_checkpoints=3, compact_every=1, thread_ttl=0)
+    graph = compile_graph(saver)
+    for index in range(6):
+        result = turn(graph, "pruned", str(index))
+
+    # Every turn survived the pruning of the checkpoints before it
+    assert result["count"] == 6
+    assert result["log"][-2:] == ["step 5", "answer 5"]
+    assert len([entry for entry in result["log"] if entry.startswith("answer")]) == 6
+    assert rows(saver, "checkpoints", "pruned") <= 3
+    assert saver.stats()["checkpoints_pruned"] > 0
+
+    # Writes and blobs of pruned checkpoints are gone too
+    oldest = saver._conn.execute("SELECT MIN(checkpoint_id) FROM checkpoints WHERE thread_id = 'pruned'").fetchone()[0]
+    assert saver._conn.execute(
+        "SELECT COUNT(*) FROM checkpoint_writes WHERE thread_id = 'pruned' AND checkpoint_id < ?", (oldest,)
+    ).fetchone()[0] == 0
+    channels = saver._conn.execute("SELECT COUNT(DISTINCT channel) FROM checkpoint_blobs WHERE thread_id = 'pruned'").fetchone()[0]
+    assert rows(saver, "checkpoint_blobs", "pruned") <= 3 * channels
+
+    # A paused thread resumes after its older checkpoints were pruned
+    config = {"configurable": {"thread_id": "pruned"}}
+    graph.invoke({"log": []}, config)
+    assert graph.get_state(config).tasks[0].interrupts
+    assert graph.invoke(Command(resume="late"), config)["log"][-1] == "answer late"
+
+def test_sqlite_expires_idle_threads(tmp_path):
+    saver = SQLiteSaver(str(tmp_path / "checkpoints.db"), thread_ttl=0.2, compact_every=1)
+    graph = compile_graph(saver)
+    turn(graph, "idle", "a")
+    time.sleep(0.3)
+    turn(graph, "active", "b")
+
+    assert graph.get_state({"configurable": {"thread_id": "idle"}}).values == {}
+    assert graph.get_state({"configurable": {"thread_id": "active"}}).values["count"] == 1
+    assert saver.stats()["threads_expired"] >= 1
+
+def test_sqlite_flushes_buffered_writes_before_reading(tmp_path):
+    saver = SQLiteSaver(str(tmp_path / "checkpoints.db"), flush_interval=60)
+    graph = compile_graph(saver)
+    graph.invoke({"log": []}, {"configurable": {"thread_id": "buffered"}})
+    latest = saver.get_tuple({"configurable": {"thread_id": "buffered"}}).config
+
+    saver.put_writes(latest, [("log", ["buffered write"])], "task-1")
+    assert saver.stats()["pending_writes"] == 1
+    found = saver.get_tuple(latest)
+    assert ("task-1", "log", ["buffered write"]) in found.pending_writes
+    assert saver.stats()["pending_writes"] == 0
+
+def test_bounded_memory_reloads_spilled_threads(tmp_path):
+    saver = BoundedMemorySaver(max_threads=1, keep_checkpoints=3, spill_path=str(tmp_path / "spill.db"))
+    graph = compile_graph(saver)
+    first = {"configurable": {"thread_id": "first"}}
+    graph.invoke({"log": []}, first)
+    turn(graph, "second", "b")
+
+    stats = saver.stats()
+    assert stats["threads_in_memory"] == 1
+    assert stats["threads_spilled"] == 1
+    assert stats["evictions"] >= 1
+
+    # The spilled thread is still paused at its question and resumes from the spill file
+    assert graph.invoke(Command(resume="a"), first)["log"] == ["step 0", "answer a"]
+    assert saver.stats()["reloads"] >= 1
+
+def test_bounded_memory_prunes_checkpoints(tmp_path):
+    saver = BoundedMemorySaver(keep_checkpoints=3, spill_path=str(tmp_path / "spill.db"))
+    graph = compile_graph(saver)
+    for index in range(5):
+        result = turn(graph, "pruned", str(index))
+    assert result["count"] == 5
+    assert len(saver.storage["pruned"][""]) <= 3
+    assert saver.stats()["checkpoints_pruned"] > 0
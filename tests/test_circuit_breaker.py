@@ -0,0 +1,35 @@
+import asyncio
+
+import pytest
+
+from circuit_breaker import CircuitBreaker, CircuitOpenError
+
+async def hang():
+    await asyncio.sleep(10)
+
+def test_async_timeout_counts_as_failure():
+    breaker = CircuitBreaker("test-timeout", minimum_calls=2)
+
+    async def run():
+        for _ in range(2):
+            with pytest.raises(asyncio.TimeoutError):
+                await breaker.acall(hang, timeout=0.01)
+
+    asyncio.run(run())
+    assert breaker.state == breaker.OPEN
+    with pytest.raises(CircuitOpenError):
+        asyncio.run(breaker.acall(hang))
+
+def test_outside_cancellation_is_not_a_failure():
+    breaker = CircuitBreaker("test-cancel", minimum_calls=1)
+
+    async def run():
+        task = asyncio.ensure_future(breaker.acall(hang))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(run())
+    assert breaker.state == breaker.CLOSED
+    assert breaker.stats()["recent_failures"] == 0
@@ -0,0 +1,24 @@
+from deltas import delta_response, resolve_cursor, run_output
+
+def message(content):
+    return {"role": "assistant", "content": content, "timestamp": "2024-01-01T00:00:00Z", "metadata": {}}
+
+def test_string_cursor_round_trips():
+    first = run_output({}, {"messages": [message("hi"), message("which accounts?")], "current_step": "social_discovery"})
+    since = str(first["cursor"])
+
+    unchanged = delta_response(first, {**first, "messages": [message("hi"), message("which accounts?")]}, since)
+    assert unchanged["messages"] == []
+
+    current = {"messages": [message("hi"), message("which accounts?"), message("found 2")], "history_offset": 0}
+    delta = delta_response(first, current, since)
+    assert [m["content"] for m in delta["messages"]] == ["found 2"]
+    assert delta["cursor"] == 3
+
+def test_cursor_accounts_for_trimmed_history():
+    messages = [message("kept 1"), message("kept 2")]
+    assert resolve_cursor(messages, "11", offset=10) == 1
+    assert resolve_cursor(messages, 12, offset=10) == 2
+
+def test_unknown_cursor_resends_everything():
+    assert resolve_cursor([message("a"), message("b")], "not-a-cursor") == 0
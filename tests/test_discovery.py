@@ -0,0 +1,81 @@
+import asyncio
+import threading
+import time
+
+import discovery
+from circuit_breaker import CircuitBreaker
+
+async def fake_search(query):
+    """TikTok answers after 0.3s, every other platform straight away"""
+    if "TikTok" in query:
+        await asyncio.sleep(0.3)
+        return [{"url": "https://tiktok.com/@slowbakery", "title": "@slowbakery", "content": ""}]
+    return []
+
+def test_shared_search_outlives_the_shortest_deadline():
+    discovery.discovery_cache.clear()
+    tiktok = [discovery.PLATFORM_REGISTRY["tiktok"]]
+
+    async def both():
+        return await asyncio.gather(
+            discovery.asearch_platforms("Slow Bakery", fake_search, tiktok, deadline=0.1),
+            discovery.asearch_platforms("Slow Bakery", fake_search, tiktok, deadline=1.0)
+        )
+
+    short, long = asyncio.run(both())
+    assert short["tiktok"] == []
+    assert long["tiktok"][0]["url"] == "https://tiktok.com/@slowbakery"
+    # Searched once, shared by both callers, and cached for the next one
+    assert discovery.discovery_cache.get(discovery._cache_key("Slow Bakery", tiktok[0])) == long["tiktok"]
+
+def test_shared_search_is_cancelled_once_every_caller_gave_up():
+    discovery.discovery_cache.clear()
+    tiktok = [discovery.PLATFORM_REGISTRY["tiktok"]]
+
+    async def both():
+        await asyncio.gather(
+            discovery.asearch_platforms("Gone Bakery", fake_search, tiktok, deadline=0.05),
+            discovery.asearch_platforms("Gone Bakery", fake_search, tiktok, deadline=0.1)
+        )
+        await asyncio.sleep(0.4)
+
+    asyncio.run(both())
+    assert discovery.discovery_cache.get(discovery._cache_key("Gone Bakery", tiktok[0])) is None
+
+def test_persistent_cache_is_written_off_the_event_loop(tmp_path, monkeypatch):
+    cache = discovery.TTLCache(namespace="discovery-test", path=str(tmp_path / "cache.sqlite"))
+    monkeypatch.setattr(discovery, "discovery_cache", cache)
+    writers = []
+    original_set = cache.set
+    monkeypatch.setattr(cache, "set", lambda *args: writers.append(threading.current_thread().name) or original_set(*args))
+    tiktok = [discovery.PLATFORM_REGISTRY["tiktok"]]
+
+    found = asyncio.run(discovery.asearch_platforms("Disk Bakery", fake_search, tiktok, deadline=1.0))
+    assert writers and writers[0].startswith("neta-discovery")
+    assert cache.get(discovery._cache_key("Disk Bakery", tiktok[0])) == found["tiktok"]
+
+def test_queued_search_past_its_deadline_is_dropped():
+    discovery.discovery_cache.clear()
+    calls = []
+    facebook = discovery.PLATFORM_REGISTRY["facebook"]
+    results = discovery._search_platform(calls.append, "Late Bakery", facebook, facebook.query("Late Bakery"),
+                                         expires_at=time.monotonic() - 1)
+    assert results is None
+    assert calls == []
+
+def test_sync_search_missing_the_deadline_counts_against_the_breaker(monkeypatch):
+    discovery.discovery_cache.clear()
+    breaker = CircuitBreaker("tavily-test", minimum_calls=2)
+    monkeypatch.setattr(discovery, "tavily_breaker", breaker)
+    release = threading.Event()
+
+    def hang(query):
+        release.wait(2)
+        return []
+
+    platforms = [discovery.PLATFORM_REGISTRY["facebook"], discovery.PLATFORM_REGISTRY["instagram"]]
+    try:
+        assert discovery.search_platforms("Hung Bakery", hang, platforms, deadline=0.05) == {"facebook": [], "instagram": []}
+        assert breaker.state == breaker.OPEN
+    finally:
+        release.set()
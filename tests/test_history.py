@@ -0,0 +1,36 @@
+from history import HistorySummarizer, history_update
+from reducers import HistoryTrim, append_messages, apply_update
+
+def message(index):
+    return {"role": "user", "content": f"message {index}", "timestamp": "2024-01-01T00:00:00Z", "metadata": {}}
+
+class InstantSummarizer(HistorySummarizer):
+    """Summarizes inline so the next run sees the result"""
+
+    def __init__(self):
+        super().__init__(lambda summary, dropped: f"{summary}+{len(dropped)}".strip("+"))
+
+    def submit(self, thread_id, summary, dropped):
+        self._summaries.set(thread_id, self.summarize(self._summaries.get(thread_id, summary), dropped))
+
+def test_history_offset_is_absolute_and_replaces_echoed_values():
+    summarizer = InstantSummarizer()
+    state = {"messages": [message(i) for i in range(5)], "history_offset": 0}
+    state = apply_update(state, history_update(state, "thread-1", summarizer, window=3))
+    assert state["history_offset"] == 2
+    assert [m["content"] for m in state["messages"]] == ["message 2", "message 3", "message 4"]
+
+    # A client echoing the offset it was sent must not be added on top of it
+    state = apply_update(state, {"history_offset": 2, "messages": [message(5), message(6)]})
+    state = apply_update(state, history_update(state, "thread-1", summarizer, window=3))
+    assert state["history_offset"] == 4
+    # The summary of the first trim lands on the next run; the second is folded in behind it
+    assert state["history_summary"] == "2"
+    assert summarizer.latest("thread-1") == "2+2"
+
+def test_trim_and_append_leave_the_previous_history_untouched():
+    history = [message(i) for i in range(4)]
+    merged = append_messages(history, [HistoryTrim(3), message(4)])
+    assert [m["content"] for m in merged] == ["message 3", "message 4"]
+    assert len(history) == 4
+    assert append_messages(history, []) is history
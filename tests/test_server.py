@@ -0,0 +1,102 @@
+import json
+import socket
+import sys
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+import simple_server
+from admission import RateLimiter
+
+@pytest.fixture
+def server():
+    httpd = simple_server.make_server(0, workers=2, queue_depth=4, timeout=30)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+def post(httpd, path, body):
+    request = urllib.request.Request(f"http://127.0.0.1:{httpd.server_address[1]}{path}",
+                                     data=json.dumps(body).encode("utf-8"),
+                                     headers={"Content-Type": "application/json"})
+    try:
+        with urllib.request.urlopen(request) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+@pytest.mark.parametrize("body", ["runs", 5, None, {"runs": "not a list"}, {}])
+def test_batch_rejects_malformed_bodies(server, body):
+    status, response = post(server, "/runs/batch", body)
+    assert status == 400
+    assert "runs" in response["detail"]
+
+def test_batch_rejects_oversized_batches_before_admission(server, monkeypatch):
+    monkeypatch.setattr(simple_server, "BATCH_MAX_ITEMS", 2)
+    server.limiter = RateLimiter(rate=1, burst=10)
+    status, _ = post(server, "/runs/batch", [{"input": {}}] * 3)
+    assert status == 413
+    assert server.limiter.admitted == 0
+
+def test_batch_runs_in_input_order(server):
+    status, response = post(server, "/runs/batch", {"runs": [
+        {"input": {"business_name": "First Cafe"}},
+        {"input": {"business_name": "Second Cafe"}}
+    ]})
+    assert status == 200
+    assert [result["index"] for result in response["results"]] == [0, 1]
+
+def test_simple_engine_skips_graph_warmup(monkeypatch):
+    monkeypatch.setattr(simple_server, "ENGINE", "simple")
+    monkeypatch.delitem(sys.modules, "neta_social_assistant", raising=False)
+    simple_server.warmup_clients()
+    assert "neta_social_assistant" not in sys.modules
+
+def test_malformed_request_line_gets_a_400(server):
+    with socket.create_connection(("127.0.0.1", server.server_address[1]), timeout=5) as connection:
+        connection.sendall(b"GET /health FOO/1.1\r\n\r\n")
+        reply = connection.recv(1024)
+    # An unparseable version is answered HTTP/0.9 style: the error page without a status line
+    assert b"400" in reply
+
+def test_batch_is_charged_per_run(server):
+    server.limiter = RateLimiter(rate=0.01, burst=3)
+    runs = [{"input": {"business_name": "Bucket Cafe"}}] * 3
+    assert post(server, "/runs/batch", runs)[0] == 200
+    # The three runs used the whole burst, so even one more is limited
+    assert post(server, "/runs/batch", runs[:1])[0] == 429
+
+def test_batch_over_the_burst_is_rejected(server):
+    server.limiter = RateLimiter(rate=1, burst=3)
+    status, _ = post(server, "/runs/batch", [{"input": {"business_name": "Bucket Cafe"}}] * 4)
+    assert status == 413
+    # Nothing was charged, so a batch that fits still goes through
+    assert post(server, "/runs/batch", [{"input": {"business_name": "Other Cafe"}}, {"input": {"business_name": "Bucket Cafe"}}])[0] == 200
+
+def test_rate_limiter_refunds_partial_charges():
+    limiter = RateLimiter(rate=0.01, burst=2)
+    assert limiter.check("a", 2) == 0
+    tenant, wait = limiter.check_all({"b": 2, "a": 1})
+    assert tenant == "a" and wait > 0
+    assert limiter.check("b", 2) == 0
+
+def test_idle_keepalive_connection_is_closed(server, monkeypatch):
+    monkeypatch.setattr(simple_server.NetaHandler, "timeout", 0.2)
+    with socket.create_connection(("127.0.0.1", server.server_address[1]), timeout=5) as connection:
+        connection.sendall(b"GET /health HTTP/1.1\r\nHost: localhost\r\n\r\n")
+        assert connection.recv(1024).startswith(b"HTTP/1.1 200")
+        # The server hangs up once the connection has been idle for the timeout
+        connection.settimeout(3)
+        while connection.recv(1024):
+            pass
+
+def test_metrics_report_caches_singleflight_and_breakers(server):
+    with urllib.request.urlopen(f"http://127.0.0.1:{server.server_address[1]}/metrics") as response:
+        metrics = json.loads(response.read())
+    assert {"hits", "misses"} <= set(metrics["caches"]["discovery"])
+    assert "exact_hits" in metrics["caches"]["analysis"]
+    assert "executed" in metrics["singleflight"]["discovery"]
+    assert "state" in metrics["breakers"]["tavily"]
@@ -0,0 +1,49 @@
+import json
+import threading
+import urllib.request
+from types import SimpleNamespace
+
+import pytest
+
+neta_social_assistant = pytest.importorskip("neta_social_assistant")
+import simple_server
+
+class FakeLLM:
+    """Streams a fixed analysis one word at a time"""
+
+    def stream(self, prompt, config=None):
+        for word in ("Great ", "photos, ", "post ", "more."):
+            yield SimpleNamespace(content=word)
+
+@pytest.fixture
+def graph_server(monkeypatch):
+    monkeypatch.setattr(simple_server, "ENGINE", "graph")
+    monkeypatch.setattr(neta_social_assistant, "_llm", FakeLLM())
+    httpd = simple_server.make_server(0, workers=1, queue_depth=1, timeout=30)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+def read_events(response):
+    events = []
+    for block in response.read().decode("utf-8").split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.splitlines() if ": " in line)
+        if "event" in fields:
+            events.append((fields["event"], json.loads(fields["data"])))
+    return events
+
+def test_runs_stream_sends_analysis_tokens(graph_server):
+    body = json.dumps({"input": {
+        "business_name": "Delta Bakery",
+        "current_step": "content_analysis",
+        "social_accounts": [{"platform": "Instagram", "name": "@deltabakery", "url": "https://instagram.com/deltabakery"}],
+        "user_data": {"regenerate_analysis": True}
+    }}).encode("utf-8")
+    request = urllib.request.Request(f"{graph_server}/runs/stream", data=body, headers={"Content-Type": "application/json"})
+    with urllib.request.urlopen(request) as response:
+        events = read_events(response)
+
+    deltas = [data["delta"] for event, data in events if event == "message_delta"]
+    assert "".join(deltas) == "Great photos, post more."
+    assert events[-1][0] == "end"
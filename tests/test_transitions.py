@@ -0,0 +1,11 @@
+from milestones import ANALYSIS_DONE
+from transitions import END, next_node
+
+def test_done_analysis_is_not_rerun():
+    state = {"current_step": "content_analysis", "milestones": {ANALYSIS_DONE: True}}
+    assert next_node(state) == END
+
+def test_regenerate_flag_reruns_a_done_analysis():
+    state = {"current_step": "content_analysis", "milestones": {ANALYSIS_DONE: True},
+             "user_data": {"regenerate_analysis": True}}
+    assert next_node(state) == "content_analysis"
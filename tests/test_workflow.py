@@ -0,0 +1,67 @@
+from types import SimpleNamespace
+
+import pytest
+
+neta_social_assistant = pytest.importorskip("neta_social_assistant")
+from langgraph.checkpoint.memory import MemorySaver
+
+def test_stateless_runs_return_their_session_id():
+    first = neta_social_assistant.invoke_workflow({"current_step": "completed"})
+    assert first["session_id"]
+
+    again = neta_social_assistant.invoke_workflow({"current_step": "completed", "session_id": first["session_id"]})
+    assert again["session_id"] == first["session_id"]
+
+def test_checkpointed_thread_ignores_client_history_offset(monkeypatch):
+    monkeypatch.setattr(neta_social_assistant, "app", neta_social_assistant.builder.compile(checkpointer=MemorySaver()))
+    turn = {"current_step": "completed", "history_offset": 7}
+
+    for _ in range(2):
+        output = neta_social_assistant.invoke_workflow(turn, thread_id="offset-thread")
+        assert output["history_offset"] == 0
+    assert output["session_id"] == "offset-thread"
+
+class FakeLLM:
+    def stream(self, prompt, config=None):
+        yield SimpleNamespace(content="Post more bread.")
+
+def two_turns(user_message):
+    first = neta_social_assistant.invoke_workflow({"business_name": "Echo Bakery", "current_step": "greeting"})
+    second_input = {**first, "messages": first["messages"] + [user_message]}
+    return neta_social_assistant.invoke_workflow(second_input)
+
+def test_stateless_runs_match_with_a_checkpointer(monkeypatch):
+    monkeypatch.setattr(neta_social_assistant, "get_tavily_search", lambda: None)
+    monkeypatch.setattr(neta_social_assistant, "_llm", FakeLLM())
+    user_message = {"role": "user", "content": "yes", "timestamp": "2024-01-01T00:00:00Z"}
+    monkeypatch.setattr(neta_social_assistant, "app", neta_social_assistant.builder.compile())
+    without = two_turns(user_message)
+    monkeypatch.setattr(neta_social_assistant, "app", neta_social_assistant.builder.compile(checkpointer=MemorySaver()))
+    with_checkpointer = two_turns(user_message)
+    assert len(with_checkpointer["messages"]) == len(without["messages"])
+
+def test_session_id_of_a_checkpointed_thread_continues_it(monkeypatch):
+    monkeypatch.setattr(neta_social_assistant, "get_tavily_search", lambda: None)
+    monkeypatch.setattr(neta_social_assistant, "app", neta_social_assistant.builder.compile(checkpointer=MemorySaver()))
+    first = neta_social_assistant.invoke_workflow({"business_name": "Thread Bakery", "current_step": "greeting"}, thread_id="bakery-thread")
+    assert first["session_id"] == "bakery-thread"
+
+    user_message = {"role": "user", "content": "those are mine", "timestamp": "2024-01-01T00:00:00Z"}
+    second = neta_social_assistant.invoke_workflow({**first, "messages": first["messages"] + [user_message], "action": "confirm_all"})
+    contents = [message["content"] for message in second["messages"]]
+    assert contents[:len(first["messages"])] == [message["content"] for message in first["messages"]]
+    assert contents.count("those are mine") == 1
+    assert contents.count(first["messages"][0]["content"]) == 1
+
+def test_regenerate_analysis_runs_a_done_analysis_again(monkeypatch):
+    monkeypatch.setattr(neta_social_assistant, "_llm", FakeLLM())
+    state = {
+        "business_name": "Again Bakery",
+        "current_step": "content_analysis",
+        "milestones": {"analysis_done": True},
+        "social_accounts": [{"platform": "Instagram", "name": "@againbakery", "url": "https://instagram.com/againbakery"}],
+        "user_data": {"regenerate_analysis": True}
+    }
+    output = neta_social_assistant.invoke_workflow(state)
+    assert "Post more bread." in [message["content"] for message in output["messages"]]
+    assert output["user_data"]["regenerate_analysis"] is False
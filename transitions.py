@@ -0,0 +1,126 @@
+"""
+Step transitions for the Neta workflow
+One table drives the LangGraph router and edges and the dependency-free simple_neta engine
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from milestones import ANALYSIS_DONE, CREATION_DONE, DISCOVERY_DONE
+
+# Same value as langgraph.graph.END, so the table needs no LangGraph import
+END = "__end__"
+
+class TransitionError(ValueError):
+    """The transition table cannot be turned into a graph"""
+
+@dataclass(frozen=True)
+class Transition:
+    """Where a run that starts at ``step`` goes.
+
+    The run goes to ``node`` when the ``requires`` state field is set and the
+    ``unless`` milestone has not been reached yet (or the ``rerun`` user_data
+    flag asks for the step again); otherwise it ends and waits for the user.
+    """
+
+    step: str
+    node: str
+    requires: Optional[str] = None
+    unless: Optional[str] = None
+    rerun: Optional[str] = None
+
+    def route(self, state: Mapping[str, Any]) -> str:
+        if self.requires and not state.get(self.requires):
+            return END
+        if self.unless and (state.get("milestones") or {}).get(self.unless) and not self.rerun_requested(state):
+            return END
+        return self.node
+
+    def rerun_requested(self, state: Mapping[str, Any]) -> bool:
+        return bool(self.rerun and (state.get("user_data") or {}).get(self.rerun))
+
+# Nodes after the entry router, in order; each node's successor is the next one
+PIPELINE = (
+    "social_discovery",
+    "confirm_accounts",
+    "content_analysis",
+    "strategy_approval",
+    "content_creation",
+    "content_approval",
+    "completion"
+)
+
+# Steps that pause for the user's answer before moving on
+DECISIONS = ("confirm_accounts", "strategy_approval", "content_approval")
+
+# Entry routes by current_step - steps not listed (e.g. "completed") end the run
+TRANSITIONS = (
+    Transition("greeting", "social_discovery", requires="business_name"),
+    Transition("social_discovery", "social_discovery", unless=DISCOVERY_DONE),
+    Transition("confirm_accounts", "content_analysis"),
+    Transition("content_analysis", "content_analysis", unless=ANALYSIS_DONE, rerun="regenerate_analysis"),
+    Transition("strategy_approval", "content_creation"),
+    Transition("content_creation", "content_creation", unless=CREATION_DONE),
+    Transition("content_approval", "completion")
+)
+
+def successors(pipeline: Iterable[str] = PIPELINE) -> Dict[str, str]:
+    """Each pipeline node mapped to the node after it (END for the last one)"""
+    nodes = list(pipeline)
+    return dict(zip(nodes, nodes[1:] + [END]))
+
+def validate(transitions: Iterable[Transition] = TRANSITIONS, pipeline: Iterable[str] = PIPELINE) -> Dict[str, Transition]:
+    """Check the table and return it keyed by step.
+
+    Raises ``TransitionError`` for duplicate steps, targets that are not
+    pipeline nodes, pipeline nodes no entry route reaches and routes that
+    re-run their own step without a milestone guard (those would loop).
+    """
+    nodes = list(pipeline)
+    if len(set(nodes)) != len(nodes):
+        raise TransitionError(f"pipeline visits a node twice: {nodes}")
+
+    table = {}
+    for transition in transitions:
+        if transition.step in table:
+            raise TransitionError(f"duplicate transition for step {transition.step!r}")
+        if transition.node not in nodes:
+            raise TransitionError(f"step {transition.step!r} routes to unknown node {transition.node!r}")
+        if transition.node == transition.step and not transition.unless:
+            raise TransitionError(f"step {transition.step!r} re-runs itself without a milestone guard")
+        table[transition.step] = transition
+
+    # Everything downstream of an entry target runs through the static pipeline edges
+    first = min((nodes.index(transition.node) for transition in table.values()), default=len(nodes))
+    unreachable = nodes[:first]
+    if unreachable:
+        raise TransitionError(f"unreachable steps: {unreachable}")
+    return table
+
+ROUTES = validate()
+NEXT_NODE = successors()
+
+def next_node(state: Mapping[str, Any]) -> str:
+    """Node a run starting from ``state`` goes to, or END to wait for the user"""
+    transition = ROUTES.get(state.get("current_step", "greeting"))
+    return transition.route(state) if transition else END
+
+def rerun_requested(step: str, state: Mapping[str, Any]) -> bool:
+    """Whether ``state`` asks to run ``step`` again although its milestone is reached"""
+    transition = ROUTES.get(step)
+    return transition.rerun_requested(state) if transition else False
+
+def step_after(node: str) -> str:
+    """``current_step`` once ``node`` has run: the next decision point, or "completed" """
+    following = NEXT_NODE.get(node, END)
+    return "completed" if following == END else following
+
+def edges(pipeline: Iterable[str] = PIPELINE) -> List[Tuple[str, str]]:
+    """Static (source, target) edges along the pipeline"""
+    return list(successors(pipeline).items())
+
+def route_targets(transitions: Iterable[Transition] = TRANSITIONS) -> Dict[str, str]:
+    """Path map for ``add_conditional_edges``: every node the router can pick, plus END"""
+    targets = {transition.node: transition.node for transition in transitions}
+    targets[END] = END
+    return targets
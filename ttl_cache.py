@@ -0,0 +1,169 @@
+"""
+TTL/LRU cache with an optional SQLite backend
+Shared by the Neta workflow to avoid repeating expensive upstream calls
+"""
+
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+import json
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+
+def normalize_business_name(name: str) -> str:
+    """Normalize a business name so "Mike's  Pizza" and "mikes pizza" share a key"""
+    name = unicodedata.normalize("NFKC", name or "").casefold()
+    name = re.sub(r"[^\w\s]", "", name)
+    return " ".join(name.split())
+
+def make_key(*parts: Any) -> str:
+    """Build a cache key from its parts"""
+    return "\x1f".join(str(part) for part in parts)
+
+class _SQLiteStore:
+    """On-disk entries shared between processes through a WAL-mode SQLite file"""
+
+    PRUNE_EVERY = 100
+
+    def __init__(self, path: str, namespace: str):
+        self.namespace = namespace
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._conn = sqlite3.connect(path, timeout=5.0, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache_entries ("
+            " namespace TEXT NOT NULL,"
+            " key TEXT NOT NULL,"
+            " value TEXT NOT NULL,"
+            " expires_at REAL NOT NULL,"
+            " PRIMARY KEY (namespace, key))"
+        )
+
+    def get(self, key: str) -> Optional[tuple]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM cache_entries WHERE namespace = ? AND key = ?",
+                (self.namespace, key)
+            ).fetchone()
+        if row is None:
+            return None
+        return json.loads(row[0]), row[1]
+
+    def set(self, key: str, value: Any, expires_at: float):
+        payload = json.dumps(value)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache_entries (namespace, key, value, expires_at) VALUES (?, ?, ?, ?)",
+                (self.namespace, key, payload, expires_at)
+            )
+            self._writes += 1
+            if self._writes % self.PRUNE_EVERY == 0:
+                self._conn.execute(
+                    "DELETE FROM cache_entries WHERE namespace = ? AND expires_at <= ?",
+                    (self.namespace, time.time())
+                )
+
+    def delete(self, key: str):
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM cache_entries WHERE namespace = ? AND key = ?",
+                (self.namespace, key)
+            )
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM cache_entries WHERE namespace = ?", (self.namespace,))
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries expire after ``ttl`` seconds.
+
+    When ``path`` is given, entries are also written to a SQLite file so they
+    survive restarts and are visible to other worker processes. Values must be
+    JSON-serializable in that case.
+    """
+
+    def __init__(self, namespace: str, max_entries: int = 1024, ttl: float = 3600.0, path: Optional[str] = None):
+        self.namespace = namespace
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._store = _SQLiteStore(path, namespace) if path else None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @property
+    def persistent(self) -> bool:
+        """Whether lookups may touch the on-disk backend"""
+        return self._store is not None
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return the cached value for ``key``, or ``default`` on a miss"""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]
+                del self._entries[key]
+                self.expirations += 1
+
+        if self._store is not None:
+            stored = self._store.get(key)
+            if stored is not None:
+                value, expires_at = stored
+                if expires_at > now:
+                    with self._lock:
+                        self._put(key, value, expires_at)
+                        self.hits += 1
+                    return value
+                self._store.delete(key)
+                with self._lock:
+                    self.expirations += 1
+
+        with self._lock:
+            self.misses += 1
+        return default
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        """Store ``value`` under ``key`` for ``ttl`` seconds (defaults to the cache TTL)"""
+        expires_at = time.time() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._put(key, value, expires_at)
+        if self._store is not None:
+            self._store.set(key, value, expires_at)
+
+    def _put(self, key: str, value: Any, expires_at: float):
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        """Drop every entry from memory and disk"""
+        with self._lock:
+            self._entries.clear()
+        if self._store is not None:
+            self._store.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit, miss and eviction counters"""
+        with self._lock:
+            return {
+                "namespace": self.namespace,
+                "size": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "persistent": self.persistent
+            }